@@ -26,6 +26,8 @@ def shape(B, C, H, W):
 
 
 def pytest_generate_tests(metafunc):
+    if "B" not in metafunc.fixturenames:
+        return
     B = [1, 5]
     C = [1, 3]
     H = W = [128]  # , 237, 512]
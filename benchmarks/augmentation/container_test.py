@@ -0,0 +1,55 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+import torch
+
+from kornia.augmentation import (
+    AugmentationSequential,
+    ColorJiggle,
+    RandomAffine,
+    RandomGaussianBlur,
+    RandomHorizontalFlip,
+    RandomPerspective,
+)
+
+
+@pytest.mark.parametrize("fuse_geometric", [False, True])
+def test_aug_sequential_data_keys(benchmark, device, dtype, image_shape, fuse_geometric):
+    B, _, H, W = image_shape
+    num_boxes = num_points = 16
+    image = torch.rand(*image_shape, device=device, dtype=dtype)
+    mask = (torch.rand(B, 1, H, W, device=device) > 0.5).to(dtype)
+    xy = torch.rand(B, num_boxes, 2, 2, device=device, dtype=dtype) * torch.tensor([W, H], device=device, dtype=dtype)
+    boxes = torch.cat([xy.min(2).values, xy.max(2).values], -1)
+    keypoints = torch.rand(B, num_points, 2, device=device, dtype=dtype) * torch.tensor([W, H], device=device)
+    aug = AugmentationSequential(
+        ColorJiggle(0.2, 0.2, 0.2, p=0.8),
+        RandomAffine(degrees=30, translate=0.1, scale=(0.8, 1.2), p=0.8),
+        RandomHorizontalFlip(),
+        RandomPerspective(0.2, p=0.5),
+        RandomGaussianBlur((5, 5), (0.1, 2.0), p=0.5),
+        data_keys=["input", "mask", "bbox_xyxy", "keypoints"],
+        fuse_geometric=fuse_geometric,
+    )
+
+    actual = benchmark(aug, image, mask, boxes, keypoints)
+
+    assert actual[0].shape == image_shape
+    assert actual[1].shape == mask.shape
+    assert actual[2].shape == boxes.shape
+    assert actual[3].shape == keypoints.shape
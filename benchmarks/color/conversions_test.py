@@ -0,0 +1,69 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+import torch
+
+from kornia.color import (
+    hls_to_rgb,
+    hsv_to_rgb,
+    lab_to_rgb,
+    luv_to_rgb,
+    rgb_to_grayscale,
+    rgb_to_hls,
+    rgb_to_hsv,
+    rgb_to_lab,
+    rgb_to_luv,
+    rgb_to_xyz,
+    rgb_to_ycbcr,
+    rgb_to_yuv,
+    xyz_to_rgb,
+    ycbcr_to_rgb,
+    yuv_to_rgb,
+)
+
+_FROM_RGB = [rgb_to_grayscale, rgb_to_hls, rgb_to_hsv, rgb_to_lab, rgb_to_luv, rgb_to_xyz, rgb_to_ycbcr, rgb_to_yuv]
+# the inverse conversions, benchmarked on valid inputs of their color space
+_TO_RGB = [
+    (rgb_to_hls, hls_to_rgb),
+    (rgb_to_hsv, hsv_to_rgb),
+    (rgb_to_lab, lab_to_rgb),
+    (rgb_to_luv, luv_to_rgb),
+    (rgb_to_xyz, xyz_to_rgb),
+    (rgb_to_ycbcr, ycbcr_to_rgb),
+    (rgb_to_yuv, yuv_to_rgb),
+]
+
+
+@pytest.mark.parametrize("fn", _FROM_RGB, ids=lambda fn: fn.__name__)
+def test_from_rgb(benchmark, device, dtype, torch_optimizer, image_shape, fn):
+    data = torch.rand(*image_shape, device=device, dtype=dtype)
+    op = torch_optimizer(fn)
+
+    actual = benchmark(op, data)
+
+    assert actual.shape[-2:] == image_shape[-2:]
+
+
+@pytest.mark.parametrize("from_rgb, fn", _TO_RGB, ids=lambda fn: fn.__name__)
+def test_to_rgb(benchmark, device, dtype, torch_optimizer, image_shape, from_rgb, fn):
+    data = from_rgb(torch.rand(*image_shape, device=device, dtype=dtype))
+    op = torch_optimizer(fn)
+
+    actual = benchmark(op, data)
+
+    assert actual.shape == image_shape
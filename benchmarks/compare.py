@@ -0,0 +1,125 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Compare two pytest-benchmark JSON reports and flag the regressions.
+
+Usage:
+
+    pytest benchmarks/ --benchmark-json=baseline.json
+    # ... apply the changes ...
+    pytest benchmarks/ --benchmark-json=current.json
+    python benchmarks/compare.py baseline.json current.json --threshold 0.1
+
+The benchmarks are matched by their full name, which includes the parametrization (sizes, dtype, device and
+optimizer backend). The script exits with a non-zero status when any benchmark is slower than the baseline by
+more than the threshold, so it can gate a CI job.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any
+
+STATS = ("min", "median", "mean")
+
+
+def load_report(path: str, stat: str = "median") -> dict[str, float]:
+    """Return the timing ``stat`` of every benchmark of a pytest-benchmark JSON report, keyed by full name."""
+    with open(path) as f:
+        report = json.load(f)
+    return {bench["fullname"]: float(bench["stats"][stat]) for bench in report["benchmarks"]}
+
+
+def compare(baseline: dict[str, float], current: dict[str, float], threshold: float) -> list[dict[str, Any]]:
+    """Compare the timings of the benchmarks found in both reports.
+
+    Returns one row per benchmark with its status: ``regression`` when it is slower than the baseline by more
+    than ``threshold`` (as a fraction), ``improvement`` when it is faster by more than ``threshold``, ``ok``
+    otherwise, and ``new`` or ``missing`` when it appears in one report only.
+    """
+    rows = []
+    for name in sorted(baseline.keys() | current.keys()):
+        before, after = baseline.get(name), current.get(name)
+        if before is None or after is None:
+            rows.append({"name": name, "baseline": before, "current": after, "ratio": None})
+            rows[-1]["status"] = "new" if before is None else "missing"
+            continue
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": before, "current": after, "ratio": ratio, "status": status})
+    return rows
+
+
+def _format_time(value: float | None) -> str:
+    if value is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.3f}{unit}"
+    return f"{value / 1e-9:.1f}ns"
+
+
+def format_table(rows: list[dict[str, Any]], show_all: bool = False) -> str:
+    """Render the rows of :func:`compare` as a plain text table, by default only the ones that changed."""
+    if not show_all:
+        rows = [row for row in rows if row["status"] != "ok"]
+    header = ("status", "baseline", "current", "ratio", "benchmark")
+    lines = [
+        (
+            row["status"],
+            _format_time(row["baseline"]),
+            _format_time(row["current"]),
+            "-" if row["ratio"] is None else f"{row['ratio']:.2f}x",
+            row["name"],
+        )
+        for row in rows
+    ]
+    widths = [max(len(line[i]) for line in [header, *lines]) for i in range(len(header) - 1)]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(line[:-1], widths)) + "  " + line[-1]
+        for line in [header, *lines]
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("baseline", help="the pytest-benchmark JSON report of the reference run")
+    parser.add_argument("current", help="the pytest-benchmark JSON report to check")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="the relative slowdown flagged as a regression (default: 0.1)"
+    )
+    parser.add_argument("--stat", choices=STATS, default="median", help="the timing compared (default: median)")
+    parser.add_argument("--all", action="store_true", help="also list the benchmarks within the threshold")
+    parser.add_argument("--fail-on-missing", action="store_true", help="fail when a baseline benchmark is missing")
+    args = parser.parse_args(argv)
+
+    rows = compare(load_report(args.baseline, args.stat), load_report(args.current, args.stat), args.threshold)
+    print(format_table(rows, show_all=args.all))
+    counts = {status: sum(row["status"] == status for row in rows) for status in ("regression", "missing")}
+    print(f"\n{len(rows)} benchmarks, {counts['regression']} regressions above {args.threshold:.0%}")
+    failed = counts["regression"] > 0 or (args.fail_on_missing and counts["missing"] > 0)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
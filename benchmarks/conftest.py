@@ -0,0 +1,65 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+# (B, H, W) of the images used by the benchmarks taking an ``image_size`` argument. The "small" tier keeps a run
+# short enough for a laptop, the "realistic" one covers the resolutions and batch sizes seen in training and
+# inference pipelines, from 512x512 up to 4K.
+IMAGE_SIZES = {
+    "small": [(1, 128, 128), (8, 128, 128), (1, 512, 512)],
+    "realistic": [
+        (1, 512, 512),
+        (16, 512, 512),
+        (64, 512, 512),
+        (1, 1080, 1920),
+        (8, 1080, 1920),
+        (1, 2160, 3840),
+    ],
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--image-sizes",
+        action="store",
+        default="small",
+        choices=sorted(IMAGE_SIZES),
+        help="the tier of image sizes used by the benchmarks",
+    )
+
+
+def _size_id(size):
+    B, H, W = size
+    return f"{B}x{H}x{W}"
+
+
+def pytest_generate_tests(metafunc):
+    tier = metafunc.config.getoption("--image-sizes", default="small")
+    sizes = IMAGE_SIZES[tier]
+    if "image_size" in metafunc.fixturenames:
+        metafunc.parametrize("image_size", sizes, ids=_size_id)
+    elif "single_image_size" in metafunc.fixturenames:
+        # for the pipelines working on one image at a time, such as the local feature detectors
+        single = list(dict.fromkeys((1, H, W) for _, H, W in sizes))
+        metafunc.parametrize("single_image_size", single, ids=_size_id)
+
+
+@pytest.fixture
+def image_shape(image_size):
+    B, H, W = image_size
+    return (B, 3, H, W)
@@ -0,0 +1,61 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+import torch
+
+from kornia.feature import LAFDescriptor, ScaleSpaceDetector, SIFTDescriptor, laf_from_center_scale_ori, match_snn
+
+
+@pytest.mark.parametrize("num_desc", [1000, 8000])
+def test_match_snn(benchmark, device, dtype, torch_optimizer, num_desc):
+    desc1 = torch.rand(num_desc, 128, device=device, dtype=dtype)
+    desc2 = torch.rand(num_desc, 128, device=device, dtype=dtype)
+    op = torch_optimizer(match_snn)
+
+    dists, idxs = benchmark(op, desc1=desc1, desc2=desc2, th=0.9)
+
+    assert idxs.shape[1] == 2
+    assert dists.shape[0] == idxs.shape[0]
+
+
+def test_scale_space_detector(benchmark, device, dtype, single_image_size):
+    if device.type == "cpu" and dtype == torch.float16:
+        pytest.skip("the scale space pyramid uses avg_pool3d, which has no float16 CPU kernel")
+    B, H, W = single_image_size
+    data = torch.rand(B, 1, H, W, device=device, dtype=dtype)
+    detector = ScaleSpaceDetector(num_features=1000).to(device, dtype)
+
+    lafs, responses = benchmark(detector, data)
+
+    assert lafs.shape == (B, 1000, 2, 3)
+    assert responses.shape == (B, 1000)
+
+
+@pytest.mark.parametrize("num_features", [512, 2048])
+def test_laf_descriptor(benchmark, device, dtype, single_image_size, num_features):
+    B, H, W = single_image_size
+    data = torch.rand(B, 1, H, W, device=device, dtype=dtype)
+    centers = torch.rand(B, num_features, 2, device=device, dtype=dtype) * torch.tensor([W, H], device=device)
+    scale = torch.full((B, num_features, 1, 1), 8.0, device=device, dtype=dtype)
+    ori = torch.rand(B, num_features, 1, device=device, dtype=dtype) * 360
+    lafs = laf_from_center_scale_ori(centers, scale, ori)
+    descriptor = LAFDescriptor(SIFTDescriptor(32), patch_size=32).to(device, dtype)
+
+    actual = benchmark(descriptor, data, lafs)
+
+    assert actual.shape == (B, num_features, 128)
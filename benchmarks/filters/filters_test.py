@@ -0,0 +1,52 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+import torch
+
+from kornia.filters import gaussian_blur2d, median_blur
+
+
+@pytest.mark.parametrize("kernel_size", [5, 11])
+def test_gaussian_blur2d(benchmark, device, dtype, torch_optimizer, image_shape, kernel_size):
+    data = torch.rand(*image_shape, device=device, dtype=dtype)
+    op = torch_optimizer(gaussian_blur2d)
+
+    actual = benchmark(op, input=data, kernel_size=kernel_size, sigma=(1.5, 1.5))
+
+    assert actual.shape == image_shape
+
+
+@pytest.mark.parametrize("kernel_size", [3, 5])
+def test_median_blur(benchmark, device, dtype, torch_optimizer, image_shape, kernel_size):
+    data = torch.rand(*image_shape, device=device, dtype=dtype)
+    op = torch_optimizer(median_blur)
+
+    actual = benchmark(op, input=data, kernel_size=kernel_size)
+
+    assert actual.shape == image_shape
+
+
+@pytest.mark.parametrize("kernel_size", [5, 9, 21])
+@pytest.mark.parametrize("engine", ["sorting_network", "histogram"])
+def test_median_blur_uint8(benchmark, device, torch_optimizer, image_shape, kernel_size, engine):
+    data = torch.randint(0, 256, image_shape, device=device, dtype=torch.uint8)
+    op = torch_optimizer(median_blur)
+
+    actual = benchmark(op, input=data, kernel_size=kernel_size, engine=engine)
+
+    assert actual.shape == image_shape
@@ -0,0 +1,54 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import torch
+
+from kornia.geometry.ransac import RANSAC
+from kornia.geometry.transform import get_perspective_transform, warp_perspective
+
+
+def test_warp_perspective(benchmark, device, dtype, torch_optimizer, image_shape):
+    B, _, H, W = image_shape
+    data = torch.rand(*image_shape, device=device, dtype=dtype)
+    points_src = torch.tensor([[[0.0, 0.0], [W - 1.0, 0.0], [W - 1.0, H - 1.0], [0.0, H - 1.0]]], device=device)
+    points_dst = points_src + torch.rand(B, 4, 2, device=device) * 0.1 * min(H, W)
+    M = get_perspective_transform(points_src.expand(B, -1, -1), points_dst).to(dtype)
+    op = torch_optimizer(warp_perspective)
+
+    actual = benchmark(op, src=data, M=M, dsize=(H, W))
+
+    assert actual.shape == image_shape
+
+
+def _noisy_correspondences(num_points, inlier_ratio, device):
+    H = torch.tensor([[1.1, 0.05, 10.0], [-0.03, 0.95, -5.0], [1e-4, 2e-4, 1.0]], device=device)
+    kp1 = torch.rand(num_points, 2, device=device) * 640
+    kp2 = torch.cat([kp1, torch.ones_like(kp1[:, :1])], -1) @ H.T
+    kp2 = kp2[:, :2] / kp2[:, 2:]
+    num_outliers = int(num_points * (1 - inlier_ratio))
+    kp2[:num_outliers] = torch.rand(num_outliers, 2, device=device) * 640
+    return kp1, kp2 + torch.randn_like(kp2) * 0.5
+
+
+def test_ransac_homography(benchmark, device):
+    kp1, kp2 = _noisy_correspondences(2000, 0.5, device)
+    ransac = RANSAC("homography", max_iter=10, batch_size=2048)
+
+    model, inliers = benchmark(ransac, kp1=kp1, kp2=kp2)
+
+    assert model.shape == (3, 3)
+    assert inliers.shape == (2000,)
@@ -0,0 +1,32 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+import torch
+
+from kornia.morphology import closing, dilation, erosion, gradient, opening
+
+
+@pytest.mark.parametrize("fn", [dilation, erosion, opening, closing, gradient], ids=lambda fn: fn.__name__)
+def test_morphology(benchmark, device, dtype, torch_optimizer, image_shape, fn):
+    data = torch.rand(*image_shape, device=device, dtype=dtype)
+    kernel = torch.ones(5, 5, device=device, dtype=dtype)
+    op = torch_optimizer(fn)
+
+    actual = benchmark(op, tensor=data, kernel=kernel)
+
+    assert actual.shape == image_shape
@@ -15,34 +15,17 @@
 # limitations under the License.
 #
 
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 # NOTE: kornia filters and geometry must go first since are the core of the library
 # and by changing the import order you might get into a circular dependencies issue.
 from . import filters
 from . import geometry
 from . import grad_estimator
 
-# import the other modules for convenience
-from . import (
-    augmentation,
-    color,
-    contrib,
-    core,
-    config,
-    enhance,
-    feature,
-    io,
-    losses,
-    metrics,
-    models,
-    morphology,
-    onnx,
-    tracking,
-    utils,
-    x,
-)
-
-# Multi-framework support using ivy
-from .transpiler import to_jax, to_numpy, to_tensorflow
+# the lightweight modules the core already depends on
+from . import color, config, core, io, utils
 
 # NOTE: we are going to expose to top level very few things
 from kornia.constants import pi
@@ -55,5 +38,58 @@ from kornia.utils import (
     xla_is_available,
 )
 
+# NOTE: the other subpackages are imported on first access (PEP 562) so that `import kornia` does not pay for the
+#       models, the ONNX helpers or the transpiler when they are not used. `kornia.xxx` behaves as before.
+_LAZY_SUBMODULES = (
+    "augmentation",
+    "contrib",
+    "enhance",
+    "feature",
+    "losses",
+    "metrics",
+    "models",
+    "morphology",
+    "onnx",
+    "tracking",
+    "transpiler",
+    "x",
+)
+
+# Multi-framework support using ivy
+_LAZY_ATTRIBUTES = {"to_jax": "transpiler", "to_numpy": "transpiler", "to_tensorflow": "transpiler"}
+
+if TYPE_CHECKING:
+    from . import (
+        augmentation,
+        contrib,
+        enhance,
+        feature,
+        losses,
+        metrics,
+        models,
+        morphology,
+        onnx,
+        tracking,
+        transpiler,
+        x,
+    )
+    from .transpiler import to_jax, to_numpy, to_tensorflow
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        # importing the submodule also binds it as an attribute of the package
+        return importlib.import_module(f".{name}", __name__)
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_LAZY_SUBMODULES, *_LAZY_ATTRIBUTES})
+
+
 # Version variable
 __version__ = "0.8.0"
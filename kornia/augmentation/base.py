@@ -275,6 +275,27 @@ class _AugmentationBase(_BasicAugmentationBase):
 
     """
 
+    # Whether the tensor handed to ``transform_inputs`` may be overwritten. Set by the containers with
+    # ``reuse_buffer=True`` for the intermediate results they own, never for the user inputs.
+    _inplace: bool = False
+
+    def _put_applied(
+        self, input: Tensor, output: Tensor, applied: Tensor, to_apply: Tensor, inplace: bool = False
+    ) -> Tensor:
+        """Write the transformed rows ``applied`` into the rows of ``output`` selected by ``to_apply``.
+
+        The rows that are not selected pass through untouched. The rows are scattered in place whenever
+        ``output`` is a fresh tensor, or when it is the input and ``inplace`` allows to overwrite it, so that
+        partially applied augmentations avoid a copy of the whole batch.
+        """
+        aliases_input = output is input or output._base is not None or output.data_ptr() == input.data_ptr()
+        if aliases_input and not inplace:
+            return output.index_put((to_apply,), applied)
+        if output.requires_grad and torch.is_grad_enabled():
+            # autograd may still need the overwritten values
+            return output.index_put((to_apply,), applied)
+        return output.index_put_((to_apply,), applied)
+
     def apply_transform(
         self,
         input: Tensor,
@@ -330,7 +351,7 @@ class _AugmentationBase(_BasicAugmentationBase):
             if is_autocast_enabled():
                 output = output.type(input.dtype)
                 applied = applied.type(input.dtype)
-            output = output.index_put((to_apply,), applied)
+            output = self._put_applied(in_tensor, output, applied, to_apply, inplace=self._inplace)
 
         output = _transform_output_shape(output, ori_shape) if self.keepdim else output
 
@@ -370,7 +391,7 @@ class _AugmentationBase(_BasicAugmentationBase):
                 flags,
                 transform=transform if transform is None else transform[to_apply],
             )
-            output = output.index_put((to_apply,), applied)
+            output = self._put_applied(in_tensor, output, applied, to_apply)
         output = _transform_output_shape(output, ori_shape, reference_shape=shape) if self.keepdim else output
         return output
 
@@ -20,4 +20,5 @@ from kornia.augmentation.container.base import ImageSequentialBase
 from kornia.augmentation.container.dispatcher import ManyToManyAugmentationDispather, ManyToOneAugmentationDispather
 from kornia.augmentation.container.image import ImageSequential
 from kornia.augmentation.container.patch import PatchSequential
+from kornia.augmentation.container.prefetch import ParameterPrefetcher
 from kornia.augmentation.container.video import VideoSequential
@@ -29,7 +29,7 @@ from kornia.geometry.boxes import Boxes, VideoBoxes
 from kornia.geometry.keypoints import Keypoints, VideoKeypoints
 from kornia.utils import eye_like, is_autocast_enabled
 
-from .base import TransformMatrixMinIn
+from .base import TransformMatrixMinIn, _maybe_inplace, _shares_base
 from .image import ImageSequential
 from .ops import AugmentationSequentialOps, DataType
 from .params import ParamItem
@@ -82,6 +82,14 @@ class AugmentationSequential(TransformMatrixMinIn, ImageSequential):
         extra_args: to control the behaviour for each datakeys. By default, masks are handled by nearest interpolation
                     strategies.
 
+        fuse_geometric: if ``True``, consecutive warp-based geometric augmentations are composed into a single
+                        homography per sample and the images are resampled once. Masks, boxes and keypoints are
+                        still transformed operation by operation. See :class:`ImageSequential` for details.
+
+        reuse_buffer: if ``True``, the augmentations applied to a part of the batch write the transformed images
+                      into the intermediate result of the previous operation instead of into a copy of it. The
+                      inputs are never overwritten. See :class:`ImageSequential` for details.
+
     .. note::
         Mix augmentations (e.g. RandomMixUp, RandomCutMix) can only be working with "input"/"image" data key.
         It is not clear how to deal with the conversions of masks, bounding boxes and keypoints.
@@ -233,6 +241,8 @@ class AugmentationSequential(TransformMatrixMinIn, ImageSequential):
         random_apply_weights: Optional[List[float]] = None,
         transformation_matrix_mode: str = "silent",
         extra_args: Optional[Dict[DataKey, Dict[str, Any]]] = None,
+        fuse_geometric: bool = False,
+        reuse_buffer: bool = False,
     ) -> None:
         self._transform_matrix: Optional[Tensor]
         self._transform_matrices: List[Optional[Tensor]] = []
@@ -243,6 +253,8 @@ class AugmentationSequential(TransformMatrixMinIn, ImageSequential):
             keepdim=keepdim,
             random_apply=random_apply,
             random_apply_weights=random_apply_weights,
+            fuse_geometric=fuse_geometric,
+            reuse_buffer=reuse_buffer,
         )
 
         self._parse_transformation_matrix_mode(transformation_matrix_mode)
@@ -460,15 +472,47 @@ class AugmentationSequential(TransformMatrixMinIn, ImageSequential):
                 raise ValueError("`params` must be provided whilst INPUT is not in data_keys.")
 
         outputs: Union[Tensor, List[DataType]] = in_args
-        for param in params:
-            module = self.get_submodule(param.name)
-            outputs = self.transform_op.transform(  # type: ignore
-                *outputs, module=module, param=param, extra_args=self.extra_args
-            )
-            if not isinstance(outputs, (list, tuple)):
-                # Make sure we are unpacking a list whilst post-proc
-                outputs = [outputs]
-            self._update_transform_matrix_by_module(module)
+        data_keys = self.transform_op.data_keys
+        for run in self.split_fused_runs(params, self.extra_args.get(DataKey.INPUT)):
+            fused = len(run) > 1 and DataKey.INPUT in data_keys
+            if fused:
+                # The images of the run are warped at once, the other data keys follow operation by operation.
+                outputs = list(outputs)
+                idx = data_keys.index(DataKey.INPUT)
+                outputs[idx] = self.fused_transform_inputs(
+                    outputs[idx],  # type: ignore[arg-type]
+                    run,
+                    extra_args=self.extra_args.get(DataKey.INPUT),
+                )
+                other_indices = [i for i, dcate in enumerate(data_keys) if dcate != DataKey.INPUT]
+            for param in run:
+                module = self.get_submodule(param.name)
+                if not fused:
+                    # only the intermediate images owned by the sequence may be overwritten
+                    inplace = self.reuse_buffer and DataKey.INPUT in data_keys
+                    if inplace:
+                        idx = data_keys.index(DataKey.INPUT)
+                        inplace = not _shares_base(outputs[idx], in_args[idx])  # type: ignore
+                    with _maybe_inplace(module, inplace):
+                        outputs = self.transform_op.transform(  # type: ignore
+                            *outputs, module=module, param=param, extra_args=self.extra_args
+                        )
+                elif len(other_indices) != 0:
+                    others = self.transform_op.transform(
+                        *[outputs[i] for i in other_indices],
+                        module=module,
+                        param=param,
+                        extra_args=self.extra_args,
+                        data_keys=[data_keys[i] for i in other_indices],
+                    )
+                    if len(other_indices) == 1:
+                        others = [others]  # type: ignore[list-item]
+                    for i, out in zip(other_indices, others):
+                        outputs[i] = out  # type: ignore[index]
+                if not isinstance(outputs, (list, tuple)):
+                    # Make sure we are unpacking a list whilst post-proc
+                    outputs = [outputs]
+                self._update_transform_matrix_by_module(module)
 
         outputs = self._arguments_postproc(args, outputs, data_keys=self.transform_op.data_keys)  # type: ignore
         # Restore it back
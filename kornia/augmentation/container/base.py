@@ -16,6 +16,7 @@
 #
 
 from collections import OrderedDict
+from contextlib import contextmanager
 from itertools import zip_longest
 from typing import Any, Dict, Iterator, List, Optional, Tuple
 
@@ -34,6 +35,26 @@ from .params import ParamItem
 __all__ = ["BasicSequentialBase", "ImageSequentialBase", "SequentialBase"]
 
 
+def _shares_base(tensor: Tensor, other: Tensor) -> bool:
+    """Return whether ``tensor`` and ``other`` are views of the same tensor."""
+    base = tensor if tensor._base is None else tensor._base
+    other_base = other if other._base is None else other._base
+    return base is other_base
+
+
+@contextmanager
+def _maybe_inplace(module: Module, enabled: bool) -> Iterator[None]:
+    """Allow ``module`` to overwrite the images it transforms while in the context."""
+    if not enabled or not isinstance(module, _AugmentationBase):
+        yield
+        return
+    module._inplace = True
+    try:
+        yield
+    finally:
+        module._inplace = False
+
+
 class BasicSequentialBase(nn.Sequential):
     r"""BasicSequential for creating kornia modulized processing pipeline.
 
@@ -15,20 +15,36 @@
 # limitations under the License.
 #
 
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union, cast
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union, cast
 
 import torch
 
 import kornia.augmentation as K
+from kornia.augmentation._2d.geometric import (
+    RandomAffine,
+    RandomHorizontalFlip,
+    RandomPerspective,
+    RandomResizedCrop,
+    RandomRotation,
+    RandomShear,
+    RandomTranslate,
+    RandomVerticalFlip,
+)
 from kornia.augmentation.base import _AugmentationBase
 from kornia.augmentation.utils import override_parameters
+from kornia.constants import SamplePadding
 from kornia.core import ImageModule, Module, Tensor, as_tensor
 from kornia.core.module import ImageModuleMixIn
+from kornia.geometry.transform import warp_perspective
 from kornia.utils import eye_like
 
-from .base import ImageSequentialBase
+from .base import ImageSequentialBase, _maybe_inplace, _shares_base
+from .ops import InputSequentialOps
 from .params import ParamItem
 
+if TYPE_CHECKING:
+    from .prefetch import ParameterPrefetcher
+
 __all__ = ["ImageSequential"]
 
 
@@ -67,11 +83,24 @@ class ImageSequential(ImageSequentialBase, ImageModuleForSequentialMixIn):
             If False, the whole list of args will be processed as a sequence in original order.
         random_apply_weights: a list of selection weights for each operation. The length shall be as
             same as the number of operations. By default, operations are sampled uniformly.
+        fuse_geometric: if ``True``, consecutive warp-based geometric augmentations (``RandomAffine``,
+            ``RandomRotation``, ``RandomShear``, ``RandomTranslate``, ``RandomPerspective``, ``RandomResizedCrop``
+            and the flips) sharing the same interpolation and padding settings are composed into a single
+            homography per sample and the image is resampled once.
+        reuse_buffer: if ``True``, the augmentations applied to a part of the batch write the transformed samples
+            into the intermediate result of the previous operation instead of into a copy of it. The input
+            tensor itself is never overwritten. Has no effect on tensors that require gradients.
 
     .. note::
         Transformation matrix returned only considers the transformation applied in ``kornia.augmentation`` module.
         Those transformations in ``kornia.geometry`` will not be taken into account.
 
+    .. note::
+        With ``fuse_geometric=True`` the image is interpolated once instead of once per operation, which is faster
+        and avoids accumulating blur. Pixels that an intermediate warp would have moved outside of the canvas are
+        sampled from the source image instead of being padded, so the borders may differ from the unfused result.
+        The per-operation transformation matrices, masks, boxes, keypoints and ``inverse`` are unaffected.
+
     Examples:
         >>> _ = torch.manual_seed(77)
         >>> import kornia
@@ -123,6 +152,8 @@ class ImageSequential(ImageSequentialBase, ImageModuleForSequentialMixIn):
         if_unsupported_ops: str = "raise",
         disable_item_features: bool = True,
         disable_sequential_features: bool = False,
+        fuse_geometric: bool = False,
+        reuse_buffer: bool = False,
     ) -> None:
         if disable_item_features:
             self.disable_item_features(*args)
@@ -138,6 +169,9 @@ class ImageSequential(ImageSequentialBase, ImageModuleForSequentialMixIn):
             )
         self.random_apply_weights = as_tensor(random_apply_weights or torch.ones((len(self),)))
         self.if_unsupported_ops = if_unsupported_ops
+        self.fuse_geometric = fuse_geometric
+        self.reuse_buffer = reuse_buffer
+        self._prefetcher: Optional[ParameterPrefetcher] = None
 
     def _read_random_apply(
         self, random_apply: Union[int, bool, Tuple[int, int]], max_length: int
@@ -233,6 +267,40 @@ class ImageSequential(ImageSequentialBase, ImageModuleForSequentialMixIn):
         return self.get_children_by_params(params)
 
     def forward_parameters(self, batch_shape: torch.Size) -> List[ParamItem]:
+        if self._prefetcher is not None and self._prefetcher.batch_shape == batch_shape:
+            return self._prefetcher.pop()
+        return self._draw_parameters(batch_shape)
+
+    def prefetch_parameters(
+        self,
+        batch_shape: Union[Tuple[int, ...], torch.Size],
+        num_batches: int = 8,
+        device: Optional[torch.device] = None,
+        background: bool = False,
+    ) -> "ParameterPrefetcher":
+        """Sample the parameters of the upcoming batches ahead of time.
+
+        Once called, ``forward`` takes the parameters of every batch of shape ``batch_shape`` from a buffer of
+        pre-sampled parameters instead of sampling them. See :class:`ParameterPrefetcher` for the arguments.
+
+        Returns:
+            the prefetcher filling the buffer, which is stopped by :meth:`stop_prefetching`.
+        """
+        from .prefetch import ParameterPrefetcher  # noqa: PLC0415
+
+        if type(self).forward_parameters is not ImageSequential.forward_parameters:
+            raise NotImplementedError(f"Parameter prefetching is not supported by {self.__class__.__name__}.")
+        self.stop_prefetching()
+        self._prefetcher = ParameterPrefetcher(self, batch_shape, num_batches, device=device, background=background)
+        return self._prefetcher
+
+    def stop_prefetching(self) -> None:
+        """Stop the parameter prefetching started by :meth:`prefetch_parameters`."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+
+    def _draw_parameters(self, batch_shape: torch.Size) -> List[ParamItem]:
         named_modules: Iterator[Tuple[str, Module]] = self.get_forward_sequence()
 
         params: List[ParamItem] = []
@@ -247,6 +315,95 @@ class ImageSequential(ImageSequentialBase, ImageModuleForSequentialMixIn):
             params.append(param)
         return params
 
+    def split_fused_runs(
+        self, params: List[ParamItem], extra_args: Optional[Dict[str, Any]] = None
+    ) -> List[List[ParamItem]]:
+        """Group the params into runs of operations that can be resampled with a single warp.
+
+        Every run holding more than one item only contains operations listed in ``_FUSED_WARP_OPS`` that share
+        the same interpolation and padding modes, and at least one of them resamples the image: the flips alone
+        are exact and faster than a warp. Without ``fuse_geometric`` every operation is its own run.
+        """
+        runs: List[List[ParamItem]] = []
+        # modes of every run, the last one is ``None`` when it cannot be extended
+        runs_modes: List[Optional[Tuple[str, str]]] = []
+        for param in params:
+            modes = None
+            if self.fuse_geometric:
+                modes = _fused_warp_modes(self.get_submodule(param.name), param, extra_args)
+            run_modes = runs_modes[-1] if runs_modes else None
+            if modes is not None and run_modes is not None and _NO_RESAMPLING in (modes, run_modes):
+                runs[-1].append(param)
+                runs_modes[-1] = run_modes if modes == _NO_RESAMPLING else modes
+            elif modes is not None and modes == run_modes:
+                runs[-1].append(param)
+            else:
+                runs.append([param])
+                runs_modes.append(modes)
+        # the runs made of flips only are not fused
+        split_runs: List[List[ParamItem]] = []
+        for run, run_modes in zip(runs, runs_modes):
+            split_runs.extend([[param] for param in run] if run_modes == _NO_RESAMPLING else [run])
+        return split_runs
+
+    def transform_inputs(
+        self, input: Tensor, params: List[ParamItem], extra_args: Optional[Dict[str, Any]] = None
+    ) -> Tensor:
+        if not (self.fuse_geometric or self.reuse_buffer):
+            return super().transform_inputs(input, params, extra_args=extra_args)
+        user_input = input
+        for run in self.split_fused_runs(params, extra_args):
+            if len(run) > 1:
+                input = self.fused_transform_inputs(input, run, extra_args=extra_args)
+                continue
+            module = self.get_submodule(run[0].name)
+            # only the intermediate results owned by the sequence may be overwritten
+            with _maybe_inplace(module, self.reuse_buffer and not _shares_base(input, user_input)):
+                input = InputSequentialOps.transform(input, module=module, param=run[0], extra_args=extra_args)
+        return input
+
+    def fused_transform_inputs(
+        self, input: Tensor, params: List[ParamItem], extra_args: Optional[Dict[str, Any]] = None
+    ) -> Tensor:
+        """Apply a run of geometric operations, as grouped by ``split_fused_runs``, with a single warp.
+
+        The transformation matrix and parameters of every operation are recorded as if it ran on its own, so
+        the other data keys and the inverse pass can be processed operation by operation afterwards.
+        """
+        if extra_args is None:
+            extra_args = {}
+        ori_shape = input.shape
+        modules = [self.get_submodule(param.name) for param in params]
+        in_tensor = modules[0].transform_tensor(input)
+        modules[0].validate_tensor(in_tensor)
+        batch_size = in_tensor.shape[0]
+        size = (in_tensor.shape[-2], in_tensor.shape[-1])
+
+        fused: Optional[Tensor] = None
+        modes = ("bilinear", "zeros")
+        for module, param in zip(modules, params):
+            module_params, flags = module._process_kwargs_to_params_and_flags(param.data, module.flags, **extra_args)
+            out_size = tuple(flags["size"]) if isinstance(module, K.RandomResizedCrop) else size
+            # Only the shape, device and dtype of the image are read to build the matrices.
+            placeholder = in_tensor.new_zeros(()).expand(batch_size, 1, *size)
+            mat = module.generate_transformation_matrix(placeholder, module_params, flags)
+            module._transform_matrix = mat
+
+            pixel_mat = _sampled_transformation_matrix(module, mat, flags, size, out_size)
+            to_apply = module_params["batch_prob"] > 0.5
+            if not to_apply.all():
+                pixel_mat = torch.where(to_apply[:, None, None], pixel_mat, mat)
+            fused = pixel_mat if fused is None else pixel_mat @ fused
+            run_modes = _fused_warp_modes(module, param, extra_args)
+            if run_modes is not None and run_modes != _NO_RESAMPLING:
+                modes = run_modes
+            size = out_size
+
+        if fused is None:
+            raise RuntimeError("Expected at least one operation to fuse.")
+        output = warp_perspective(in_tensor, fused, size, mode=modes[0], padding_mode=modes[1], align_corners=True)
+        return modules[-1].transform_output_tensor(output, ori_shape) if modules[-1].keepdim else output
+
     def identity_matrix(self, input: Tensor) -> Tensor:
         """Return identity matrix."""
         return eye_like(3, input)
@@ -388,3 +545,76 @@ def _get_new_batch_shape(param: ParamItem, batch_shape: torch.Size) -> torch.Siz
         new_batch_shape[-2:] = param.data["output_size"][0]
         batch_shape = torch.Size(new_batch_shape)
     return batch_shape
+
+
+def _fused_warp_modes(
+    module: Module, param: ParamItem, extra_args: Optional[Dict[str, Any]]
+) -> Optional[Tuple[str, str]]:
+    """Return the ``(mode, padding_mode)`` a fusable operation resamples with, or ``None`` if it cannot be fused.
+
+    Flips resample nothing and report empty modes, so that they can join any run.
+    """
+    if not isinstance(module, _FUSED_WARP_OPS) or not isinstance(param.data, dict):
+        return None
+    if isinstance(module, (K.RandomHorizontalFlip, K.RandomVerticalFlip)):
+        return _NO_RESAMPLING
+    flags = override_parameters(module.flags, extra_args or {}, in_place=False)
+    if isinstance(module, K.RandomResizedCrop) and (
+        flags["cropping_mode"] != "resample" or not (param.data["batch_prob"] > 0.5).all()
+    ):
+        # Only a crop applied to the whole batch yields a single output size.
+        return None
+    padding_mode = flags.get("padding_mode", SamplePadding.ZEROS)
+    return (flags["resample"].name.lower(), SamplePadding.get(padding_mode).name.lower())
+
+
+def _align_corners_matrix(size: Tuple[int, int], like: Tensor, inverse: bool = False) -> Tensor:
+    """Return the pixel mapping from ``align_corners=True`` to ``align_corners=False`` sampling coordinates.
+
+    The mapping is a scale followed by a translation, so its ``inverse`` is written in closed form.
+    """
+    height, width = size
+    eps: float = 1e-14
+    scale_x = width / (width - 1 if width > 1 else eps)
+    scale_y = height / (height - 1 if height > 1 else eps)
+    mat = eye_like(3, like[:1], shared_memory=False)[0]
+    if inverse:
+        mat[0, 0], mat[1, 1] = 1 / scale_x, 1 / scale_y
+        mat[0, 2], mat[1, 2] = 0.5 / scale_x, 0.5 / scale_y
+    else:
+        mat[0, 0], mat[1, 1] = scale_x, scale_y
+        mat[:2, 2] = -0.5
+    return mat
+
+
+def _sampled_transformation_matrix(
+    module: Module, mat: Tensor, flags: Dict[str, Any], size: Tuple[int, int], out_size: Tuple[int, int]
+) -> Tensor:
+    """Return the matrix an operation effectively resamples its input with, in ``align_corners=True`` pixels.
+
+    ``warp_affine`` and ``warp_perspective`` normalise the homography with pixel centres at the borders and
+    then sample with ``grid_sample``; with ``align_corners=False`` the sampled grid is therefore stretched by
+    half a pixel, which has to be folded into the matrix for the composition to match the sequential result.
+    """
+    if isinstance(module, (K.RandomHorizontalFlip, K.RandomVerticalFlip)) or flags["align_corners"]:
+        return mat
+    mat = mat @ _align_corners_matrix(size, mat, inverse=True)
+    if isinstance(module, K.RandomPerspective):
+        # warp_perspective samples a normalized meshgrid, only the source side is stretched.
+        return mat
+    return _align_corners_matrix(out_size, mat) @ mat
+
+
+# modes reported by the flips, which move pixels without interpolating them
+_NO_RESAMPLING = ("", "")
+
+_FUSED_WARP_OPS = (
+    RandomAffine,
+    RandomRotation,
+    RandomShear,
+    RandomTranslate,
+    RandomPerspective,
+    RandomResizedCrop,
+    RandomHorizontalFlip,
+    RandomVerticalFlip,
+)
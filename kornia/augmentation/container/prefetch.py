@@ -0,0 +1,210 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import torch
+
+import kornia.augmentation as K
+from kornia.augmentation.base import _AugmentationBase
+from kornia.core import Tensor, tensor
+
+from .base import ImageSequentialBase
+from .image import ImageSequential, _get_new_batch_shape
+from .params import ParamItem
+
+__all__ = ["ParameterPrefetcher"]
+
+
+class ParameterPrefetcher:
+    r"""Pre-sample the random parameters of an augmentation sequence for the upcoming batches.
+
+    The parameters of ``num_batches`` batches are drawn at once: every augmentation samples the parameters of all
+    the batches in a single call to its random generator, which are then split per batch and kept in a bounded
+    buffer. Augmentations whose parameters cannot be split per batch (``same_on_batch``, ``p_batch`` in (0, 1),
+    shared parameters such as the order of ``ColorJiggle``, mix augmentations or nested sequences) and sequences
+    with ``random_apply`` are sampled batch by batch instead, still ahead of time.
+
+    Created by :meth:`ImageSequential.prefetch_parameters`, which makes ``forward`` consume the buffer whenever
+    it is called without ``params`` on a batch of shape ``batch_shape``.
+
+    Args:
+        module: the sequence to sample the parameters for.
+        batch_shape: the shape of the batches, e.g. :math:`(B, C, H, W)`.
+        num_batches: the number of batches sampled at once, which is also the capacity of the buffer.
+        device: the device to move the parameters to. By default, they are kept where they are sampled.
+        background: if ``True``, the buffer is refilled on a daemon thread so that the sampling overlaps with
+            the forward passes. The random generators of the augmentations, and the global ``torch`` generator,
+            are then shared between the two threads, so the results are not reproducible with a seed.
+
+    Example:
+        >>> import kornia.augmentation as K
+        >>> aug = K.AugmentationSequential(K.RandomAffine(15.0, p=0.5), K.ColorJiggle(0.1, 0.1, p=0.5))
+        >>> prefetcher = aug.prefetch_parameters((4, 3, 8, 8), num_batches=16)
+        >>> out = aug(torch.rand(4, 3, 8, 8))
+        >>> len(prefetcher)
+        15
+        >>> aug.stop_prefetching()
+
+    """
+
+    def __init__(
+        self,
+        module: ImageSequential,
+        batch_shape: Union[Tuple[int, ...], torch.Size],
+        num_batches: int = 8,
+        device: Optional[torch.device] = None,
+        background: bool = False,
+    ) -> None:
+        if num_batches < 1:
+            raise ValueError(f"`num_batches` must be positive. Got {num_batches}.")
+        self.module = module
+        self.batch_shape = torch.Size(batch_shape)
+        self.num_batches = num_batches
+        self.device = device
+        self.background = background
+        self._buffer: queue.Queue[List[ParamItem]] = queue.Queue(maxsize=num_batches)
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        # whether each operation can be sampled for all the batches at once, probed on the first round
+        self._batched: Dict[str, bool] = {}
+        if background:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def __len__(self) -> int:
+        return self._buffer.qsize()
+
+    def __iter__(self) -> "ParameterPrefetcher":
+        return self
+
+    def __next__(self) -> List[ParamItem]:
+        return self.pop()
+
+    def pop(self) -> List[ParamItem]:
+        """Return the parameters of the next batch, sampling a new round of batches if the buffer is empty."""
+        if not self.background:
+            if self._buffer.empty():
+                for params in self.sample():
+                    self._buffer.put_nowait(params)
+            return self._buffer.get_nowait()
+        while True:
+            if self._error is not None:
+                raise RuntimeError("The parameter prefetching thread failed.") from self._error
+            try:
+                return self._buffer.get(timeout=0.1)
+            except queue.Empty:
+                if self._thread is None or not self._thread.is_alive():
+                    raise RuntimeError("The parameter prefetching thread is not running.") from self._error
+
+    def close(self) -> None:
+        """Stop the background thread, if any, and drop the buffered parameters."""
+        self._stop.set()
+        if self._thread is not None:
+            while self._thread.is_alive():
+                # unblock the producer waiting for a free slot
+                try:
+                    self._buffer.get_nowait()
+                except queue.Empty:
+                    pass
+                self._thread.join(timeout=0.1)
+            self._thread = None
+        while not self._buffer.empty():
+            self._buffer.get_nowait()
+
+    def sample(self) -> List[List[ParamItem]]:
+        """Sample the parameters of ``num_batches`` batches."""
+        module = self.module
+        if module.random_apply:
+            # every batch draws its own sequence of operations
+            batches = [module._draw_parameters(self.batch_shape) for _ in range(self.num_batches)]
+        else:
+            batches = [[] for _ in range(self.num_batches)]
+            batch_shapes = [self.batch_shape] * self.num_batches
+            for name, op in module.named_children():
+                if name not in self._batched:
+                    self._batched[name] = _can_sample_batched(op, batch_shapes[0])
+                if self._batched[name] and batch_shapes.count(batch_shapes[0]) == len(batch_shapes):
+                    op_params = _sample_batched(op, batch_shapes[0], self.num_batches)
+                elif isinstance(op, (_AugmentationBase, K.MixAugmentationBaseV2, ImageSequentialBase)):
+                    op_params = [op.forward_parameters(shape) for shape in batch_shapes]
+                else:
+                    op_params = [None] * self.num_batches
+                for idx, data in enumerate(op_params):
+                    param = ParamItem(name, data)
+                    batches[idx].append(param)
+                    batch_shapes[idx] = _get_new_batch_shape(param, batch_shapes[idx])
+        if self.device is not None:
+            batches = [[_to_device(param, self.device) for param in params] for params in batches]
+        return batches
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                for params in self.sample():
+                    while not self._stop.is_set():
+                        try:
+                            self._buffer.put(params, timeout=0.1)
+                            break
+                        except queue.Full:
+                            pass
+        except BaseException as e:  # noqa: BLE001
+            self._error = e
+
+
+def _can_sample_batched(module: Any, batch_shape: torch.Size) -> bool:
+    """Return whether the parameters of several batches can be sampled in one draw and split afterwards."""
+    if not isinstance(module, _AugmentationBase) or module.same_on_batch or module.p_batch not in (0.0, 1.0):
+        return False
+    # the parameters of every sample must be stacked along the first dimension, integer parameters are skipped
+    # since they may hold indices into the batch
+    small, large = (module.generate_parameters(torch.Size((n, *batch_shape[1:]))) or {} for n in (2, 3))
+    for key, value in small.items():
+        if not isinstance(value, Tensor) or value.dim() == 0 or value.shape[0] != 2 or large[key].shape[0] != 3:
+            return False
+        if not (value.is_floating_point() or value.dtype == torch.bool):
+            return False
+    return True
+
+
+def _sample_batched(module: _AugmentationBase, batch_shape: torch.Size, num_batches: int) -> List[Dict[str, Tensor]]:
+    """Sample the parameters of ``num_batches`` batches in one draw and split them per batch."""
+    batch_size = batch_shape[0]
+    stacked_shape = torch.Size((batch_size * num_batches, *batch_shape[1:]))
+    batch_prob = module.__batch_prob_generator__(stacked_shape, module.p, module.p_batch, module.same_on_batch)
+    counts = (batch_prob > 0.5).view(num_batches, batch_size).sum(1).tolist()
+    stacked = module.generate_parameters(torch.Size((sum(counts), *batch_shape[1:]))) or {}
+    chunks = {key: value.split(counts) for key, value in stacked.items()}
+    input_size = tensor(batch_shape, dtype=torch.long)
+    out: List[Dict[str, Tensor]] = []
+    for idx, probs in enumerate(batch_prob.split(batch_size)):
+        params = {key: value[idx] for key, value in chunks.items()}
+        params["batch_prob"] = probs
+        params["forward_input_shape"] = input_size
+        out.append(params)
+    return out
+
+
+def _to_device(param: ParamItem, device: torch.device) -> ParamItem:
+    if isinstance(param.data, dict):
+        return ParamItem(param.name, {key: value.to(device) for key, value in param.data.items()})
+    if isinstance(param.data, list):
+        return ParamItem(param.name, [_to_device(p, device) for p in param.data])
+    return param
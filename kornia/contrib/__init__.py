@@ -16,9 +16,9 @@
 #
 
 from .classification import ClassificationHead
-from .connected_components import connected_components
+from .connected_components import ConnectedComponents, connected_components, label_connected_components
 from .diamond_square import diamond_square
-from .distance_transform import DistanceTransform, distance_transform
+from .distance_transform import DistanceTransform, distance_transform, exact_distance_transform
 from .edge_detection import EdgeDetector
 from .extract_patches import (
     CombineTensorPatches,
@@ -40,6 +40,7 @@ from .vit_mobile import MobileViT
 __all__ = [
     "ClassificationHead",
     "CombineTensorPatches",
+    "ConnectedComponents",
     "DistanceTransform",
     "EdgeDetector",
     "ExtractTensorPatches",
@@ -55,7 +56,9 @@ __all__ = [
     "connected_components",
     "diamond_square",
     "distance_transform",
+    "exact_distance_transform",
     "extract_tensor_patches",
     "histogram_matching",
     "interp",
+    "label_connected_components",
 ]
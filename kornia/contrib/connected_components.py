@@ -15,10 +15,16 @@
 # limitations under the License.
 #
 
+from dataclasses import dataclass
+from typing import Optional
+
 import torch
 import torch.nn.functional as F
 
 from kornia.core import Tensor
+from kornia.core.check import KORNIA_CHECK
+from kornia.utils._compat import torch_version_ge
+from kornia.utils.helpers import _compact_labels, _propagate_min_labels
 
 
 def connected_components(image: Tensor, num_iterations: int = 100) -> Tensor:
@@ -74,3 +80,110 @@ def connected_components(image: Tensor, num_iterations: int = 100) -> Tensor:
         out = torch.mul(out, mask)  # mask using element-wise multiplication
 
     return out.view_as(image)
+
+
+@dataclass
+class ConnectedComponents:
+    """Result of :func:`label_connected_components`.
+
+    Args:
+        labels: the labels image with shape :math:`(*, 1, H, W)`. The background is ``0`` and the components of
+          each image are labelled with consecutive integers starting at ``1``, in raster scan order.
+        num_components: number of components per image with shape :math:`(B,)`.
+        areas: number of pixels of each component with shape :math:`(B, K)`, where :math:`K` is the maximum
+          number of components in the batch. Entry :math:`k` refers to the label :math:`k + 1` and it is zero
+          for the padded entries.
+        boxes: bounding boxes of the components in :math:`(x_{min}, y_{min}, x_{max}, y_{max})` format, with
+          inclusive pixel coordinates and shape :math:`(B, K, 4)`.
+        centroids: centroid :math:`(x, y)` of each component with shape :math:`(B, K, 2)`.
+
+    """
+
+    labels: Tensor
+    num_components: Tensor
+    areas: Tensor
+    boxes: Tensor
+    centroids: Tensor
+
+
+def label_connected_components(
+    image: Tensor, connectivity: int = 8, check_every: int = 4, max_iterations: Optional[int] = None
+) -> ConnectedComponents:
+    r"""Compute the exact Connected-component labelling (CCL) and the components statistics.
+
+    Unlike :func:`connected_components`, the labelling does not depend on a fixed number of iterations: the
+    label equivalences are resolved by hooking and pointer jumping, which converges in a number of iterations
+    logarithmic in the components diameter, and the convergence is detected automatically.
+
+    .. note::
+        Requires torch >= 1.12 (:meth:`torch.Tensor.scatter_reduce`).
+
+    Args:
+        image: the binarized input image with shape :math:`(*, 1, H, W)`. Non-zero pixels are foreground.
+        connectivity: pixel connectivity, either 4 or 8.
+        check_every: number of iterations between the convergence checks. Each check synchronizes with the host.
+        max_iterations: optional upper bound of the number of iterations.
+
+    Return:
+        the compact labels image and the area, bounding box and centroid of each component.
+        See :class:`ConnectedComponents`.
+
+    Example:
+        >>> img = torch.tensor([[[[1., 1., 0., 1.],
+        ...                       [0., 0., 0., 1.],
+        ...                       [1., 0., 1., 1.]]]])
+        >>> out = label_connected_components(img, connectivity=4)
+        >>> out.labels
+        tensor([[[[1, 1, 0, 2],
+                  [0, 0, 0, 2],
+                  [3, 0, 2, 2]]]])
+        >>> out.areas
+        tensor([[2, 4, 1]])
+
+    """
+    if not isinstance(image, Tensor):
+        raise TypeError(f"Input imagetype is not a Tensor. Got: {type(image)}")
+
+    if len(image.shape) < 3 or image.shape[-3] != 1:
+        raise ValueError(f"Input image shape must be (*,1,H,W). Got: {image.shape}")
+
+    KORNIA_CHECK(torch_version_ge(1, 12), "label_connected_components requires torch >= 1.12.")
+    KORNIA_CHECK(connectivity in (4, 8), f"connectivity must be either 4 or 8. Got: {connectivity}")
+    KORNIA_CHECK(check_every >= 1, f"check_every must be a positive integer. Got: {check_every}")
+
+    H, W = image.shape[-2:]
+    mask = image.reshape(-1, H, W) != 0
+    B = mask.shape[0]
+    HW = H * W
+    roots = _propagate_min_labels(mask, connectivity, check_every, max_iterations).view(B, HW)
+
+    labels, num_components = _compact_labels(mask.view(B, HW), roots)
+    K = int(num_components.max()) if B > 0 else 0
+
+    # statistics, label 0 (background) is accumulated in the extra first bin and dropped
+    ys, xs = torch.meshgrid(torch.arange(H, device=mask.device), torch.arange(W, device=mask.device), indexing="ij")
+    xs = xs.reshape(1, HW).expand(B, HW)
+    ys = ys.reshape(1, HW).expand(B, HW)
+    areas = torch.zeros(B, K + 1, device=mask.device, dtype=torch.long).scatter_add_(1, labels, torch.ones_like(labels))
+    stats = []
+    for coords, reduce, init in ((xs, "amin", W), (ys, "amin", H), (xs, "amax", -1), (ys, "amax", -1)):
+        buf = torch.full((B, K + 1), init, device=mask.device, dtype=torch.long)
+        stats.append(buf.scatter_reduce(1, labels, coords, reduce=reduce))
+    boxes = torch.stack(stats, -1)[:, 1:]
+    sums = [
+        torch.zeros(B, K + 1, device=mask.device, dtype=torch.float64).scatter_add_(1, labels, c.double())
+        for c in (xs, ys)
+    ]
+    areas = areas[:, 1:]
+    centroids = torch.stack(sums, -1)[:, 1:] / areas.clamp(min=1)[..., None]
+    valid = areas > 0
+    boxes = torch.where(valid[..., None], boxes, torch.zeros_like(boxes))
+
+    dtype = image.dtype if image.is_floating_point() else torch.float32
+    return ConnectedComponents(
+        labels=labels.view(image.shape),
+        num_components=num_components,
+        areas=areas,
+        boxes=boxes,
+        centroids=centroids.to(dtype),
+    )
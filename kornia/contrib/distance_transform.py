@@ -16,12 +16,15 @@
 #
 
 import math
+from typing import Union
 
 import torch
 from torch import nn
 
+from kornia.core.check import KORNIA_CHECK
 from kornia.filters import filter2d
 from kornia.utils import create_meshgrid
+from kornia.utils._compat import torch_version_ge
 
 
 def distance_transform(image: torch.Tensor, kernel_size: int = 3, h: float = 0.35) -> torch.Tensor:
@@ -89,21 +92,225 @@ def distance_transform(image: torch.Tensor, kernel_size: int = 3, h: float = 0.3
     return out
 
 
+def _column_distance(features: torch.Tensor, big: int) -> tuple[torch.Tensor, torch.Tensor]:
+    """Compute the distance to the nearest feature along the last but one dimension.
+
+    Args:
+        features: boolean tensor with shape :math:`(R, H, W)`.
+        big: value used when a column has no feature.
+
+    Returns:
+        the distances and the row index of the nearest feature, both with shape :math:`(R, H, W)`.
+
+    """
+    H = features.shape[-2]
+    pos = torch.arange(H, device=features.device).view(1, H, 1).expand_as(features)
+    # last feature at or above each pixel
+    above = torch.where(features, pos, torch.full_like(pos, -1)).cummax(dim=-2)[0]
+    # first feature at or below each pixel
+    below = torch.where(features, pos, torch.full_like(pos, H)).flip(-2).cummin(dim=-2)[0].flip(-2)
+    dist_above = torch.where(above >= 0, pos - above, torch.full_like(pos, big))
+    dist_below = torch.where(below < H, below - pos, torch.full_like(pos, big))
+    use_above = dist_above <= dist_below
+    dist = torch.where(use_above, dist_above, dist_below)
+    idx = torch.where(use_above, above, below).clamp(0, H - 1)
+    return dist, idx
+
+
+def _row_min_l1(f: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+    r"""Compute :math:`d(x) = \min_{x'} |x - x'| + f(x')` and its argmin along the last dimension."""
+    W = f.shape[-1]
+    pos = torch.arange(W, device=f.device)
+    fwd, fwd_idx = (f - pos).cummin(dim=-1)
+    bwd, bwd_idx = (f + pos).flip(-1).cummin(dim=-1)
+    bwd = bwd.flip(-1)
+    bwd_idx = W - 1 - bwd_idx.flip(-1)
+    fwd = fwd + pos
+    bwd = bwd - pos
+    use_fwd = fwd <= bwd
+    return torch.where(use_fwd, fwd, bwd), torch.where(use_fwd, fwd_idx, bwd_idx)
+
+
+def _row_min_l2(f: torch.Tensor, big: int) -> tuple[torch.Tensor, torch.Tensor]:
+    r"""Compute :math:`d(x) = \min_{x'} (x - x')^2 + f(x')` and its argmin along the last dimension.
+
+    The cost matrix is Monge, so the leftmost argmin is monotone in :math:`x`. The argmins are found level by level
+    with the divide and conquer algorithm for monotone matrices: the queries of each level only scan the candidates
+    between the argmins of their already solved neighbours. All the queries of a level are solved at once, which
+    needs :math:`O(\log W)` vectorized steps and :math:`O(W \log W)` work per row.
+    """
+    R, W = f.shape
+    K = max(1, math.ceil(math.log2(W + 1)))
+    M = 2**K - 1
+    # pad to 2^K - 1 columns with a value larger than any real cost
+    f = torch.cat([f, torch.full((R, M - W), 2 * big, device=f.device, dtype=f.dtype)], dim=-1)
+    # argmins at positions p = x + 1, with sentinels at p = 0 and p = M + 1
+    argmin = torch.zeros(R, M + 2, device=f.device, dtype=torch.long)
+    argmin[:, -1] = M - 1
+    dist = torch.zeros(R, M, device=f.device, dtype=f.dtype)
+    max_key = torch.iinfo(torch.long).max
+    for level in range(K):
+        step = 2 ** (K - 1 - level)
+        ps = torch.arange(step, M + 1, 2 * step, device=f.device)
+        Q = ps.shape[0]
+        lo = argmin[:, ps - step]
+        hi = argmin[:, ps + step]
+        lengths = hi - lo + 1
+        ends = lengths.cumsum(dim=-1)
+        # flatten all the (query, candidate) pairs of the level, there are at most M + Q of them per row
+        t = torch.arange(M + Q, device=f.device).expand(R, M + Q).contiguous()
+        qi = torch.searchsorted(ends, t, right=True)
+        valid = qi < Q
+        qi = qi.clamp(max=Q - 1)
+        cand = (lo.gather(1, qi) + t - (ends - lengths).gather(1, qi)).clamp(0, M - 1)
+        x = ps[qi] - 1
+        cost = (x - cand) ** 2 + f.gather(1, cand)
+        # ties are broken towards the leftmost candidate
+        key = torch.where(valid, cost * (M + 1) + cand, torch.full_like(cost, max_key))
+        best = torch.full((R, Q), max_key, device=f.device, dtype=key.dtype).scatter_reduce(1, qi, key, reduce="amin")
+        argmin[:, ps] = best % (M + 1)
+        dist[:, ps - 1] = best // (M + 1)
+    return dist[:, :W], argmin[:, 1 : W + 1]
+
+
+def _exact_dt_l1_l2(features: torch.Tensor, metric: str) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Separable exact distance transform for a :math:`(R, H, W)` boolean tensor.
+
+    Returns the distance (squared for L2) and the nearest feature coordinates. The distance is not smaller than
+    ``big`` where there is no feature at all.
+    """
+    _, H, W = features.shape
+    big = (H + W + 1) ** 2 if metric == "l2" else 2 * (H + W + 1)
+    col_dist, col_idx = _column_distance(features, big)
+    if metric == "l2":
+        f = torch.where(col_dist < big, col_dist**2, torch.full_like(col_dist, big))
+        dist, x_idx = _row_min_l2(f.flatten(0, 1), big)
+    else:
+        dist, x_idx = _row_min_l1(col_dist.flatten(0, 1))
+    dist = dist.view_as(features)
+    x_idx = x_idx.view_as(features)
+    y_idx = col_idx.gather(-1, x_idx)
+    return dist, torch.stack([x_idx, y_idx], -1), dist >= big
+
+
+def _exact_dt_chessboard(features: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    r"""Exact chessboard distance transform, as the L1 transform on the lattice rotated by 45 degrees.
+
+    With :math:`u = x + y` and :math:`v = x - y`, :math:`\max(|dx|, |dy|) = (|du| + |dv|) / 2`.
+    """
+    R, H, W = features.shape
+    S = H + W - 1
+    ys, xs = torch.meshgrid(
+        torch.arange(H, device=features.device), torch.arange(W, device=features.device), indexing="ij"
+    )
+    us = xs + ys
+    vs = xs - ys + H - 1
+    rotated = torch.zeros(R, S, S, device=features.device, dtype=torch.bool)
+    rotated[:, us, vs] = features
+    dist, idx, missing = _exact_dt_l1_l2(rotated, "l1")
+    dist = dist[:, us, vs] // 2
+    idx = idx[:, us, vs]
+    u, v = idx[..., 1], idx[..., 0] - (H - 1)
+    return dist, torch.stack([(u + v) // 2, (u - v) // 2], -1), missing[:, us, vs]
+
+
+def exact_distance_transform(
+    image: torch.Tensor, metric: str = "l2", return_indices: bool = False
+) -> Union[torch.Tensor, tuple[torch.Tensor, torch.Tensor]]:
+    r"""Compute the exact distance transform of images.
+
+    The value at each pixel in the output represents the distance to the nearest non-zero pixel in the image.
+    The transform is separable: the distance to the nearest feature is first computed along the columns with
+    cumulative scans, then combined along the rows. For the euclidean metric the row pass finds the lower envelope
+    of the parabolas :math:`(x - x')^2 + g(x')^2` with a divide and conquer algorithm on monotone argmins, which is
+    vectorized over all the rows, channels and batch elements and needs :math:`O(\log W)` steps.
+    The transformation is applied independently across the channel dimension of the images. It is not
+    differentiable w.r.t. the input, see :func:`distance_transform` for a differentiable approximation.
+
+    Args:
+        image: Image with shape :math:`(B,C,H,W)`.
+        metric: distance metric, one of ``"l2"`` (euclidean), ``"l1"`` (city block) or ``"chessboard"``.
+            The euclidean metric requires torch >= 1.12 (:meth:`torch.Tensor.scatter_reduce`).
+        return_indices: if True, also return the :math:`(x, y)` coordinates of the nearest non-zero pixel.
+
+    Returns:
+        tensor with shape :math:`(B,C,H,W)` and, if ``return_indices`` is True, the nearest non-zero pixel
+        coordinates with shape :math:`(B,C,H,W,2)`. Images without any non-zero pixel have an infinite
+        distance and indices set to -1.
+
+    Example:
+        >>> tensor = torch.zeros(1, 1, 3, 4)
+        >>> tensor[:, :, 0, 0] = 1
+        >>> exact_distance_transform(tensor)
+        tensor([[[[0.0000, 1.0000, 2.0000, 3.0000],
+                  [1.0000, 1.4142, 2.2361, 3.1623],
+                  [2.0000, 2.2361, 2.8284, 3.6056]]]])
+
+    """
+    out, idx = _exact_distance_transform(image, metric)
+    if not return_indices:
+        return out
+    return out, idx
+
+
+def _exact_distance_transform(image: torch.Tensor, metric: str) -> tuple[torch.Tensor, torch.Tensor]:
+    if not isinstance(image, torch.Tensor):
+        raise TypeError(f"image type is not a torch.Tensor. Got {type(image)}")
+
+    if not len(image.shape) == 4:
+        raise ValueError(f"Invalid image shape, we expect BxCxHxW. Got: {image.shape}")
+
+    if metric not in ("l1", "l2", "chessboard"):
+        raise ValueError(f"metric must be one of 'l1', 'l2' or 'chessboard'. Got: {metric}")
+
+    KORNIA_CHECK(
+        metric != "l2" or torch_version_ge(1, 12), "the euclidean exact distance transform requires torch >= 1.12."
+    )
+
+    B, C, H, W = image.shape
+    features = (image != 0).view(B * C, H, W)
+    if metric == "chessboard":
+        dist, idx, missing = _exact_dt_chessboard(features)
+    else:
+        dist, idx, missing = _exact_dt_l1_l2(features, metric)
+
+    dtype = image.dtype if image.is_floating_point() else torch.float32
+    out = dist.to(dtype)
+    if metric == "l2":
+        out = out.sqrt()
+    out = out.masked_fill(missing, float("inf")).view(B, C, H, W)
+    idx = idx.masked_fill(missing[..., None], -1).view(B, C, H, W, 2)
+    return out, idx
+
+
 class DistanceTransform(nn.Module):
-    r"""Module that approximates the Manhattan (city block) distance transform of images using convolutions.
+    r"""Module that computes the distance transform of images.
+
+    By default, it approximates the Manhattan (city block) distance transform of images using convolutions, see
+    :func:`distance_transform`. With ``method="exact"`` it computes the exact transform for the given metric,
+    see :func:`exact_distance_transform`.
 
     Args:
-        kernel_size: size of the convolution kernel.
-        h: value that influence the approximation of the min function.
+        kernel_size: size of the convolution kernel. Only used by the ``"conv"`` method.
+        h: value that influence the approximation of the min function. Only used by the ``"conv"`` method.
+        method: either ``"conv"`` (differentiable approximation) or ``"exact"``.
+        metric: distance metric of the ``"exact"`` method: ``"l2"``, ``"l1"`` or ``"chessboard"``.
 
     """
 
-    def __init__(self, kernel_size: int = 3, h: float = 0.35) -> None:
+    def __init__(self, kernel_size: int = 3, h: float = 0.35, method: str = "conv", metric: str = "l2") -> None:
         super().__init__()
+        if method not in ("conv", "exact"):
+            raise ValueError(f"method must be either 'conv' or 'exact'. Got: {method}")
         self.kernel_size = kernel_size
         self.h = h
+        self.method = method
+        self.metric = metric
 
     def forward(self, image: torch.Tensor) -> torch.Tensor:
+        if self.method == "exact":
+            return _exact_distance_transform(image, self.metric)[0]
+
         # If images have multiple channels, view the channels in the batch dimension to match kernel shape.
         if image.shape[1] > 1:
             image_in = image.view(-1, 1, image.shape[-2], image.shape[-1])
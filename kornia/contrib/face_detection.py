@@ -24,7 +24,7 @@ import torch
 import torch.nn.functional as F
 from torch import nn
 
-from kornia.geometry.bbox import nms as nms_kornia
+from kornia.geometry.bbox import batched_nms
 
 __all__ = ["FaceDetector", "FaceDetectorResult", "FaceKeypoint"]
 
@@ -185,7 +185,7 @@ class FaceDetector(nn.Module):
         self.variance = [0.1, 0.2]
         self.clip = False
         self.model = YuFaceDetectNet("test", pretrained=True)
-        self.nms = nms_kornia
+        self.nms = batched_nms
 
     def preprocess(self, image: torch.Tensor) -> torch.Tensor:
         return image
@@ -202,33 +202,24 @@ class FaceDetector(nn.Module):
         priors = _PriorBox(self.min_sizes, self.steps, self.clip, image_size=(height, width))
         priors = priors.to(loc.device, loc.dtype)
 
-        batched_dets: List[torch.Tensor] = []
-        for batch_elem in range(loc.shape[0]):
-            boxes = _decode(loc[batch_elem], priors(), self.variance)  # Nx14
-            boxes = boxes * scale
-
-            # clamp here for the compatibility for ONNX
-            cls_scores, iou_scores = conf[batch_elem, :, 1], iou[batch_elem, :, 0]
-            scores = (cls_scores * iou_scores.clamp(0.0, 1.0)).sqrt()
-
-            # ignore low scores
-            inds = scores > self.confidence_threshold
-            boxes, scores = boxes[inds], scores[inds]
-
-            # keep top-K before NMS
-            order = scores.sort(descending=True)[1][: self.top_k]
-            boxes, scores = boxes[order], scores[order]
-
-            # performd NMS
-            # NOTE: nms need to be revise since does not export well to onnx
-            dets = torch.cat((boxes, scores[:, None]), dim=-1)  # Nx15
-            keep = self.nms(boxes[:, :4], scores, self.nms_threshold)
-            if len(keep) > 0:
-                dets = dets[keep, :]
-
-            # keep top-K faster NMS
-            batched_dets.append(dets[: self.keep_top_k])
-        return batched_dets
+        boxes = torch.stack([_decode(loc_elem, priors(), self.variance) for loc_elem in loc]) * scale  # BxNx14
+
+        # clamp here for the compatibility for ONNX
+        cls_scores, iou_scores = conf[..., 1], iou[..., 0]
+        scores = (cls_scores * iou_scores.clamp(0.0, 1.0)).sqrt()
+
+        # ignore low scores
+        scores = torch.where(scores > self.confidence_threshold, scores, torch.full_like(scores, -float("inf")))
+
+        # keep top-K before NMS
+        scores, order = scores.sort(dim=-1, descending=True)
+        scores, order = scores[:, : self.top_k], order[:, : self.top_k]
+        boxes = boxes.gather(1, order[..., None].expand(-1, -1, boxes.shape[-1]))
+
+        # perform NMS on all the images at once, and keep top-K after NMS
+        dets = torch.cat((boxes, scores[..., None]), dim=-1)  # BxNx15
+        keep, _ = self.nms(boxes[..., :4], scores, self.nms_threshold, top_k=self.keep_top_k)
+        return [dets_elem[keep_elem[keep_elem >= 0]] for dets_elem, keep_elem in zip(dets, keep)]
 
     def forward(self, image: torch.Tensor) -> List[torch.Tensor]:
         r"""Detect faces in a given batch of images.
@@ -29,12 +29,22 @@ from kornia.geometry.linalg import euclidean_distance
 class KMeans:
     """Implements the kmeans clustering algorithm with euclidean distance as similarity measure.
 
+    The distances to the cluster centers are computed in chunks of points whose size is bounded by
+    ``memory_budget``, and the cluster centers are updated with scatter-adds, so that large datasets such as the
+    pixels of an image can be clustered. Several restarts can be run at once, keeping the one with the lowest
+    inertia, and :meth:`partial_fit` implements the mini-batch kmeans for streamed data.
+
     Args:
         num_clusters: number of clusters the data has to be assigned to
         cluster_centers: tensor of starting cluster centres can be passed instead of num_clusters
         tolerance: float value. the algorithm terminates if the shift in centers is less than tolerance
         max_iterations: number of iterations to run the algorithm for
         seed: number to set torch manual seed for reproducibility
+        init: how to choose the starting cluster centres when they are not given, either ``"random"`` points of
+            the data or ``"k-means++"``
+        num_restarts: number of runs with different starting cluster centres, computed as a batch. Must be 1 when
+            ``cluster_centers`` is given.
+        memory_budget: approximate maximum size in bytes of the chunks of the distance matrix
 
     Example:
         >>> kmeans = kornia.contrib.KMeans(3, None, 10e-4, 100, 0)
@@ -50,20 +60,30 @@ class KMeans:
         tolerance: float = 10e-4,
         max_iterations: int = 0,
         seed: int | None = None,
+        init: str = "random",
+        num_restarts: int = 1,
+        memory_budget: int = 2**28,
     ) -> None:
         KORNIA_CHECK(num_clusters != 0, "num_clusters can't be 0")
+        KORNIA_CHECK(init in ("random", "k-means++"), f"init must be 'random' or 'k-means++'. Got: {init}")
+        KORNIA_CHECK(num_restarts > 0, "num_restarts must be positive")
 
         # cluster_centers should have only 2 dimensions
         if cluster_centers is not None:
             KORNIA_CHECK_SHAPE(cluster_centers, ["C", "D"])
+            KORNIA_CHECK(num_restarts == 1, "num_restarts must be 1 when the starting cluster_centers are given")
 
         self.num_clusters = num_clusters
         self._cluster_centers = cluster_centers
         self.tolerance = tolerance
         self.max_iterations = max_iterations
+        self.init = init
+        self.num_restarts = num_restarts
+        self.memory_budget = memory_budget
 
         self._final_cluster_assignments: None | Tensor = None
         self._final_cluster_centers: None | Tensor = None
+        self._cluster_counts: Tensor | None = None
 
         if seed is not None:
             torch.manual_seed(seed)
@@ -101,6 +121,35 @@ class KMeans:
         initial_state = X[idx]
         return initial_state
 
+    def _initialise_cluster_centers_kmeans_plusplus(self, X: Tensor, num_clusters: int, num_restarts: int) -> Tensor:
+        """Chooses num_cluster points from X for every restart with the k-means++ seeding.
+
+        Every new center is sampled with a probability proportional to the squared distance of the points to their
+        closest already chosen center.
+
+        Args:
+            X: 2D input tensor to be clustered
+            num_clusters: number of desired cluster centers
+            num_restarts: number of independent sets of centers
+
+        Returns:
+            3D Tensor of shape num_restarts, num_clusters, D
+
+        """
+        num_samples: int = len(X)
+        idx = torch.randint(num_samples, (num_restarts, 1), device=X.device)
+        centers = [X[idx[:, 0]]]
+        _, min_distance = self._assign(X, centers[0][:, None])
+        for _ in range(1, num_clusters):
+            # inverse transform sampling, which unlike multinomial does not limit the number of points
+            cdf = min_distance.double().cumsum(-1)
+            target = torch.rand(num_restarts, 1, device=X.device, dtype=cdf.dtype) * cdf[:, -1:]
+            idx = torch.searchsorted(cdf, target).clamp(max=num_samples - 1)
+            centers.append(X[idx[:, 0]])
+            _, distance = self._assign(X, centers[-1][:, None])
+            min_distance = torch.minimum(min_distance, distance)
+        return torch.stack(centers, 1)
+
     def _pairwise_euclidean_distance(self, data1: Tensor, data2: Tensor) -> Tensor:
         """Compute pairwise squared distance between 2 sets of vectors.
 
@@ -119,6 +168,55 @@ class KMeans:
         distance = euclidean_distance(A, B)
         return distance
 
+    def _assign(self, X: Tensor, centers: Tensor) -> tuple[Tensor, Tensor]:
+        """Find the closest center of every point, computing the distances in chunks of points.
+
+        Args:
+            X: 2D tensor of shape N, D
+            centers: 3D tensor of shape R, C, D with the centers of every restart
+
+        Returns:
+            the index of the closest center with shape R, N and the squared distance to it with shape R, N
+
+        """
+        num_restarts, num_clusters, _ = centers.shape
+        num_samples: int = len(X)
+        chunk_size = max(1, self.memory_budget // max(1, 2 * num_restarts * num_clusters * X.element_size()))
+        centers_t = centers.transpose(-1, -2)
+        centers_sq = (centers**2).sum(-1)[:, None]  # R*1*C
+
+        assignment = torch.empty(num_restarts, num_samples, dtype=torch.long, device=X.device)
+        min_distance = torch.empty(num_restarts, num_samples, dtype=X.dtype, device=X.device)
+        for start in range(0, num_samples, chunk_size):
+            x = X[start : start + chunk_size]
+            # |x - c|^2 = |x|^2 - 2 x.c + |c|^2
+            distance = (x**2).sum(-1)[None, :, None] - 2 * torch.matmul(x[None], centers_t) + centers_sq
+            values, indices = distance.min(-1)
+            min_distance[:, start : start + chunk_size] = values.clamp(min=0.0)
+            assignment[:, start : start + chunk_size] = indices
+        return assignment, min_distance
+
+    def _cluster_sums(self, X: Tensor, assignment: Tensor, num_clusters: int) -> tuple[Tensor, Tensor]:
+        """Sum the points and count them per cluster with scatter-adds.
+
+        Args:
+            X: 2D tensor of shape N, D
+            assignment: 2D tensor of shape R, N with the cluster of every point for every restart
+            num_clusters: number of clusters
+
+        Returns:
+            the sums with shape R, C, D and the counts with shape R, C
+
+        """
+        num_restarts = assignment.shape[0]
+        num_dims = X.shape[1]
+        sums = torch.zeros(num_restarts, num_clusters, num_dims, dtype=X.dtype, device=X.device)
+        # all the restarts at once, the points are expanded and not copied
+        sums.scatter_add_(1, assignment[..., None].expand(-1, -1, num_dims), X[None].expand(num_restarts, -1, -1))
+        offsets = torch.arange(num_restarts, device=X.device)[:, None] * num_clusters
+        counts = torch.bincount((assignment + offsets).flatten(), minlength=num_restarts * num_clusters)
+        return sums, counts.view(num_restarts, num_clusters)
+
     def fit(self, X: Tensor) -> None:
         """Fit iterative KMeans clustering till a threshold for shift in cluster centers or a maximum no of iterations
         have reached.
@@ -131,7 +229,7 @@ class KMeans:
         KORNIA_CHECK_SHAPE(X, ["N", "D"])
 
         if self._cluster_centers is None:
-            self._cluster_centers = self._initialise_cluster_centers(X, self.num_clusters)
+            current_centers = self._initial_centers(X, self.num_restarts)
         else:
             # X and cluster_centers should have same number of columns
             KORNIA_CHECK(
@@ -139,43 +237,91 @@ class KMeans:
                 f"Dimensions at position 1 of X and cluster_centers do not match. \
                 {X.shape[1]} != {self._cluster_centers.shape[1]}",
             )
+            current_centers = self._cluster_centers[None].to(X.dtype)
 
-        # X = X.to(self.device)
-        current_centers = self._cluster_centers
-
-        previous_centers: Tensor | None = None
+        num_restarts, num_clusters, _ = current_centers.shape
         iteration: int = 0
 
         while True:
-            # find distance between X and current_centers
-            distance: Tensor = self._pairwise_euclidean_distance(X, current_centers)
-
-            cluster_assignment = distance.argmin(-1)
-
-            previous_centers = current_centers.clone()
-
-            for index in range(self.num_clusters):
-                selected = torch.nonzero(cluster_assignment == index).squeeze()
-                selected = torch.index_select(X, 0, selected)
-                # edge case when a certain cluster centre has no points assigned to it
-                # just choose a random point as it's update
-                if selected.shape[0] == 0:
-                    selected = X[torch.randint(len(X), (1,), device=X.device)]
-                current_centers[index] = selected.mean(dim=0)
+            # find the closest center of every point
+            cluster_assignment, _ = self._assign(X, current_centers)
+
+            sums, counts = self._cluster_sums(X, cluster_assignment, num_clusters)
+            # edge case when a certain cluster centre has no points assigned to it
+            # just choose a random point as it's update
+            random_points = X[torch.randint(len(X), (num_restarts, num_clusters), device=X.device)]
+            previous_centers = current_centers
+            current_centers = torch.where(
+                counts[..., None] > 0, sums / counts.clamp(min=1)[..., None].to(X.dtype), random_points
+            )
 
             # sum of distance of how much the newly computed clusters have moved from their previous positions
-            center_shift = torch.sum(torch.sqrt(torch.sum((current_centers - previous_centers) ** 2, dim=1)))
+            center_shift = torch.sum(torch.sqrt(torch.sum((current_centers - previous_centers) ** 2, dim=-1)), dim=-1)
 
             iteration = iteration + 1
 
-            if self.tolerance is not None and center_shift**2 < self.tolerance:
+            if self.tolerance is not None and bool((center_shift**2 < self.tolerance).all()):
                 break
 
             if self.max_iterations != 0 and iteration >= self.max_iterations:
                 break
 
-        self._final_cluster_assignments = cluster_assignment
-        self._final_cluster_centers = current_centers
+        best = 0
+        if num_restarts > 1:
+            # keep the restart with the lowest inertia
+            cluster_assignment, min_distance = self._assign(X, current_centers)
+            best = int(min_distance.sum(-1).argmin())
+
+        self._final_cluster_assignments = cluster_assignment[best]
+        self._final_cluster_centers = current_centers[best]
+        self._cluster_counts = torch.bincount(cluster_assignment[best], minlength=num_clusters)
+
+    def partial_fit(self, X: Tensor) -> None:
+        """Update the cluster centers with a mini-batch of data, following the mini-batch KMeans.
+
+        Every center moves towards the mean of its assigned points of the batch with a per-center learning rate
+        equal to the inverse of the number of points assigned to it so far. The first call initialises the
+        cluster centers from the batch if they are not given.
+
+        Args:
+            X: 2D input tensor with a batch of the data to be clustered
+
+        """
+        KORNIA_CHECK_SHAPE(X, ["N", "D"])
+
+        if self._final_cluster_centers is not None:
+            centers = self._final_cluster_centers
+        elif self._cluster_centers is not None:
+            centers = self._cluster_centers.to(X.dtype)
+        else:
+            centers = self._initial_centers(X, 1)[0]
+
+        KORNIA_CHECK(
+            X.shape[1] == centers.shape[1],
+            f"Dimensions at position 1 of X and cluster_centers do not match. {X.shape[1]} != {centers.shape[1]}",
+        )
+        num_clusters = centers.shape[0]
+        if self._cluster_counts is None:
+            self._cluster_counts = torch.zeros(num_clusters, dtype=torch.long, device=X.device)
+
+        cluster_assignment, _ = self._assign(X, centers[None])
+        sums, counts = self._cluster_sums(X, cluster_assignment, num_clusters)
+        self._cluster_counts = self._cluster_counts + counts[0]
+        learning_rate = 1.0 / self._cluster_counts.clamp(min=1).to(X.dtype)
+        centers = centers + (sums[0] - counts[0, :, None].to(X.dtype) * centers) * learning_rate[:, None]
+
+        self._final_cluster_assignments = cluster_assignment[0]
+        self._final_cluster_centers = centers
+
+    def _initial_centers(self, X: Tensor, num_restarts: int) -> Tensor:
+        """Choose the starting cluster centers of every restart with the configured method, with shape R, C, D."""
+        KORNIA_CHECK(
+            len(X) >= self.num_clusters,
+            f"The number of points must be at least the number of clusters. {len(X)} < {self.num_clusters}",
+        )
+        if self.init == "k-means++":
+            return self._initialise_cluster_centers_kmeans_plusplus(X, self.num_clusters, num_restarts)
+        return torch.stack([self._initialise_cluster_centers(X, self.num_clusters) for _ in range(num_restarts)])
 
     def predict(self, x: Tensor) -> Tensor:
         """Find the cluster center closest to each point in x.
@@ -194,6 +340,5 @@ class KMeans:
                 {x.shape[1]} != {self.cluster_centers.shape[1]}",
         )
 
-        distance = self._pairwise_euclidean_distance(x, self.cluster_centers)
-        cluster_assignment = distance.argmin(-1)
-        return cluster_assignment
+        cluster_assignment, _ = self._assign(x, self.cluster_centers[None].to(x.dtype))
+        return cluster_assignment[0]
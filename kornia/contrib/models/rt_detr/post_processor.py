@@ -57,6 +57,7 @@ class DETRPostProcessor(Module):
         num_top_queries: int = 300,
         confidence_filtering: bool = True,
         filter_as_zero: bool = False,
+        nms_threshold: Optional[float] = None,
     ) -> None:
         super().__init__()
         self.confidence_threshold = confidence_threshold
@@ -64,7 +65,9 @@ class DETRPostProcessor(Module):
         self.confidence_filtering = confidence_filtering
         self.num_top_queries = num_top_queries
         self.box_filtering = BoxFiltering(
-            tensor(confidence_threshold) if confidence_threshold is not None else None, filter_as_zero=filter_as_zero
+            tensor(confidence_threshold) if confidence_threshold is not None else None,
+            filter_as_zero=filter_as_zero,
+            nms_threshold=nms_threshold,
         )
 
     def forward(self, logits: Tensor, boxes: Tensor, original_sizes: Tensor) -> Union[Tensor, list[Tensor]]:
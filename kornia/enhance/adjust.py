@@ -30,7 +30,7 @@ from kornia.core.check import (
     KORNIA_CHECK_IS_COLOR_OR_GRAY,
     KORNIA_CHECK_IS_TENSOR,
 )
-from kornia.utils.helpers import _torch_histc_cast
+from kornia.utils.helpers import _torch_histc_batched
 from kornia.utils.image import perform_keep_shape_image, perform_keep_shape_video
 
 
@@ -640,6 +640,7 @@ def _solarize(input: Tensor, thresholds: Union[float, Tensor] = 0.5) -> Tensor:
         thresholds: solarize thresholds.
             If int or one element tensor, input will be solarized across the whole batch.
             If 1-d tensor, input will be solarized element-wise, len(thresholds) == len(input).
+            If 2-d tensor, input will be solarized element-channel-wise, thresholds.shape == input.shape[:2].
 
     Returns:
         Solarized images.
@@ -652,15 +653,23 @@ def _solarize(input: Tensor, thresholds: Union[float, Tensor] = 0.5) -> Tensor:
         raise TypeError(f"The factor should be either a float or Tensor. Got {type(thresholds)}")
 
     if isinstance(thresholds, Tensor) and len(thresholds.shape) != 0:
-        if not (input.size(0) == len(thresholds) and len(thresholds.shape) == 1):
+        if not (len(thresholds.shape) <= 2 and thresholds.shape == input.shape[: len(thresholds.shape)]):
             raise AssertionError(f"thresholds must be a 1-d vector of shape ({input.size(0)},). Got {thresholds}")
-        # TODO: I am not happy about this line, but no easy to do batch-wise operation
-        thresholds = thresholds.to(input.device).to(input.dtype)
-        thresholds = torch.stack([x.expand(*input.shape[-3:]) for x in thresholds])
+        thresholds = thresholds.to(input.device, input.dtype if input.is_floating_point() else thresholds.dtype)
+        thresholds = _broadcast_to_image(thresholds, input)
+
+    if input.dtype == torch.uint8:
+        # 255 - x flips all the bits
+        return torch.where(input < thresholds * 255, input, input.bitwise_not())
 
     return torch.where(input < thresholds, input, 1.0 - input)
 
 
+def _broadcast_to_image(param: Tensor, input: Tensor) -> Tensor:
+    """View a per sample :math:`(B,)` or per channel :math:`(B, C)` parameter to broadcast over the images."""
+    return param.view(param.shape + (1,) * (input.dim() - param.dim()))
+
+
 def solarize(
     input: Tensor,
     thresholds: Union[float, Tensor] = 0.5,
@@ -674,14 +683,17 @@ def solarize(
     The value of 'addition' is between -0.5 and 0.5.
 
     Args:
-        input: image tensor with shapes like :math:`(*, C, H, W)` to solarize.
+        input: image tensor with shapes like :math:`(*, C, H, W)` to solarize, either floating point in the range
+            :math:`[0, 1]` or ``torch.uint8``.
         thresholds: solarize thresholds.
             If int or one element tensor, input will be solarized across the whole batch.
             If 1-d tensor, input will be solarized element-wise, len(thresholds) == len(input).
+            If 2-d tensor, input will be solarized element-channel-wise, thresholds.shape == input.shape[:2].
         additions: between -0.5 and 0.5.
             If None, no addition will be performed.
             If int or one element tensor, same addition will be added across the whole batch.
             If 1-d tensor, additions will be added element-wisely, len(additions) == len(input).
+            If 2-d tensor, additions will be added element-channel-wisely, additions.shape == input.shape[:2].
 
     Returns:
         The solarized images with shape :math:`(*, C, H, W)`.
@@ -719,13 +731,15 @@ def solarize(
             raise AssertionError(f"The value of 'addition' is between -0.5 and 0.5. Got {additions}.")
 
         if isinstance(additions, Tensor) and len(additions.shape) != 0:
-            if not (input.size(0) == len(additions) and len(additions.shape) == 1):
+            if not (len(additions.shape) <= 2 and additions.shape == input.shape[: len(additions.shape)]):
                 raise AssertionError(f"additions must be a 1-d vector of shape ({input.size(0)},). Got {additions}")
-            # TODO: I am not happy about this line, but no easy to do batch-wise operation
-            additions = additions.to(input.device).to(input.dtype)
-            additions = torch.stack([x.expand(*input.shape[-3:]) for x in additions])
-        input = input + additions
-        input = input.clamp(0.0, 1.0)
+            additions = additions.to(input.device, input.dtype if input.is_floating_point() else additions.dtype)
+            additions = _broadcast_to_image(additions, input)
+        if input.dtype == torch.uint8:
+            input = (input.to(torch.int16) + (additions * 255).round().to(torch.int16)).clamp(0, 255).to(torch.uint8)
+        else:
+            input = input + additions
+            input = input.clamp(0.0, 1.0)
 
     return _solarize(input, thresholds)
 
@@ -739,7 +753,8 @@ def posterize(input: Tensor, bits: Union[int, Tensor]) -> Tensor:
     Non-differentiable function, ``torch.uint8`` involved.
 
     Args:
-        input: image tensor with shape :math:`(*, C, H, W)` to posterize.
+        input: image tensor with shape :math:`(*, C, H, W)` to posterize, either floating point in the range
+            :math:`[0, 1]` or ``torch.uint8``.
         bits: number of high bits. Must be in range [0, 8].
             If int or one element tensor, input will be posterized by this bits.
             If 1-d tensor, input will be posterized element-wisely, len(bits) == input.shape[-3].
@@ -772,51 +787,31 @@ def posterize(input: Tensor, bits: Union[int, Tensor]) -> Tensor:
     # if not torch.all((bits >= 0) * (bits <= 8)) and bits.dtype == torch.int:
     #     raise ValueError(f"bits must be integers within range [0, 8]. Got {bits}.")
 
-    # TODO: Make a differentiable version
-    # Current version:
-    # Ref: https://github.com/open-mmlab/mmcv/pull/132/files#diff-309c9320c7f71bedffe89a70ccff7f3bR19
-    # Ref: https://github.com/tensorflow/tpu/blob/master/models/official/efficientnet/autoaugment.py#L222
-    # Potential approach: implementing kornia.LUT with floating points
-    # https://github.com/albumentations-team/albumentations/blob/master/albumentations/augmentations/functional.py#L472
-    def _left_shift(input: Tensor, shift: Tensor) -> Tensor:
-        return ((input * 255).to(torch.uint8) * (2**shift)).to(input.dtype) / 255.0
-
-    def _right_shift(input: Tensor, shift: Tensor) -> Tensor:
-        return (input * 255).to(torch.uint8) / (2**shift).to(input.dtype) / 255.0
-
-    def _posterize_one(input: Tensor, bits: Tensor) -> Tensor:
-        # Single bits value condition
-        if bits == 0:
-            return torch.zeros_like(input)
-        if bits == 8:
-            return input.clone()
-        bits = 8 - bits
-        return _left_shift(_right_shift(input, bits), bits)
-
-    if len(bits.shape) == 0 or (len(bits.shape) == 1 and len(bits) == 1):
-        return _posterize_one(input, bits)
-
-    res = []
-    if len(bits.shape) == 1:
-        if bits.shape[0] != input.shape[0]:
-            raise AssertionError(
-                f"Batch size must be equal between bits and input. Got {bits.shape[0]}, {input.shape[0]}."
-            )
-
-        for i in range(input.shape[0]):
-            res.append(_posterize_one(input[i], bits[i]))
-        return torch.stack(res, dim=0)
-
-    if bits.shape != input.shape[: len(bits.shape)]:
+    if len(bits.shape) == 1 and len(bits) == 1:
+        bits = bits[0]
+
+    if len(bits.shape) == 1 and bits.shape[0] != input.shape[0]:
+        raise AssertionError(f"Batch size must be equal between bits and input. Got {bits.shape[0]}, {input.shape[0]}.")
+
+    if len(bits.shape) > 1 and bits.shape != input.shape[: len(bits.shape)]:
         raise AssertionError(
             "Batch and channel must be equal between bits and input. "
             f"Got {bits.shape}, {input.shape[: len(bits.shape)]}."
         )
-    _input = input.view(-1, *input.shape[len(bits.shape) :])
-    _bits = bits.flatten()
-    for i in range(input.shape[0]):
-        res.append(_posterize_one(_input[i], _bits[i]))
-    return torch.stack(res, dim=0).reshape(*input.shape)
+
+    # TODO: Make a differentiable version
+    # Ref: https://github.com/open-mmlab/mmcv/pull/132/files#diff-309c9320c7f71bedffe89a70ccff7f3bR19
+    # Ref: https://github.com/tensorflow/tpu/blob/master/models/official/efficientnet/autoaugment.py#L222
+    # Keeping the high bits is a bitwise and with a mask per sample or channel, broadcasted over the images.
+    bits = _broadcast_to_image(bits.to(input.device, torch.long), input)
+    mask = ((255 << (8 - bits).clamp(0, 8)) & 255).to(torch.uint8)
+
+    if input.dtype == torch.uint8:
+        return input & mask
+
+    output = ((input * 255).to(torch.uint8) & mask).to(input.dtype) / 255.0
+    # 8 bits keep the image untouched
+    return torch.where(bits == 8, input, output)
 
 
 @perform_keep_shape_image
@@ -833,6 +828,7 @@ def sharpness(input: Tensor, factor: Union[float, Tensor]) -> Tensor:
         factor: factor of sharpness strength. Must be above 0.
             If float or one element tensor, input will be sharpened by the same factor across the whole batch.
             If 1-d tensor, input will be sharpened element-wisely, len(factor) == len(input).
+            If 2-d tensor, input will be sharpened element-channel-wisely, factor.shape == input.shape[:2].
 
     Returns:
         Sharpened image or images with shape :math:`(*, C, H, W)`.
@@ -846,7 +842,7 @@ def sharpness(input: Tensor, factor: Union[float, Tensor]) -> Tensor:
     if not isinstance(factor, Tensor):
         factor = torch.as_tensor(factor, device=input.device, dtype=input.dtype)
 
-    if len(factor.size()) != 0 and factor.shape != torch.Size([input.size(0)]):
+    if len(factor.size()) > 2 or (len(factor.size()) != 0 and factor.shape != input.shape[: len(factor.shape)]):
         raise AssertionError(
             "Input batch size shall match with factor size if factor is not a 0-dim tensor. "
             f"Got {input.size(0)} and {factor.shape}"
@@ -870,62 +866,55 @@ def sharpness(input: Tensor, factor: Union[float, Tensor]) -> Tensor:
     padded_degenerate = torch.nn.functional.pad(degenerate, [1, 1, 1, 1])
     result = torch.where(padded_mask == 1, padded_degenerate, input)
 
-    if len(factor.size()) == 0:
-        return _blend_one(result, input, factor)
-    return torch.stack([_blend_one(result[i], input[i], factor[i]) for i in range(len(factor))])
+    return _blend(result, input, _broadcast_to_image(factor.to(input.device, input.dtype), input))
 
 
-def _blend_one(input1: Tensor, input2: Tensor, factor: Tensor) -> Tensor:
-    r"""Blend two images into one.
+def _blend(input1: Tensor, input2: Tensor, factor: Tensor) -> Tensor:
+    r"""Blend two batches of images into one.
 
     Args:
-        input1: image tensor with shapes like :math:`(H, W)` or :math:`(D, H, W)`.
-        input2: image tensor with shapes like :math:`(H, W)` or :math:`(D, H, W)`.
-        factor: factor 0-dim tensor.
+        input1: image tensor with shape :math:`(B, C, H, W)`, returned where the factor is 0.
+        input2: image tensor with shape :math:`(B, C, H, W)`, returned where the factor is 1.
+        factor: blending factors broadcastable to the images, e.g. with shape :math:`(B, 1, 1, 1)`. The blended
+            images are clipped to :math:`[0, 1]` where the factor is outside of this range.
 
     Returns:
-        : image tensor with the batch in the zero position.
+        The blended images with shape :math:`(B, C, H, W)`.
 
     """
-    if not isinstance(input1, Tensor):
-        raise AssertionError(f"`input1` must be a tensor. Got {input1}.")
-    if not isinstance(input2, Tensor):
-        raise AssertionError(f"`input1` must be a tensor. Got {input2}.")
-
-    if isinstance(factor, Tensor) and len(factor.size()) != 0:
-        raise AssertionError(f"Factor shall be a float or single element tensor. Got {factor}.")
-    if factor == 0.0:
-        return input1
-    if factor == 1.0:
-        return input2
-    diff = (input2 - input1) * factor
-    res = input1 + diff
-    if factor > 0.0 and factor < 1.0:
-        return res
-    return torch.clamp(res, 0, 1)
+    res = input1 + (input2 - input1) * factor
+    extrapolated = (factor < 0.0) | (factor > 1.0)
+    if extrapolated.any():
+        res = torch.where(extrapolated, res.clamp(0, 1), res)
+    identity = factor == 1.0
+    if identity.any():
+        res = torch.where(identity, input2, res)
+    return res
 
 
 def _build_lut(histo: Tensor, step: Tensor) -> Tensor:
     # Compute the cumulative sum, shifting by step // 2
     # and then normalization by step.
     step_trunc = torch.div(step, 2, rounding_mode="trunc")
-    lut = torch.div(torch.cumsum(histo, 0) + step_trunc, step, rounding_mode="trunc")
+    lut = torch.div(torch.cumsum(histo, -1) + step_trunc, step, rounding_mode="trunc")
     # Shift lut, prepending with 0.
-    lut = torch.cat([torch.zeros(1, device=lut.device, dtype=lut.dtype), lut[:-1]])
+    lut = torch.cat([torch.zeros_like(lut[..., :1]), lut[..., :-1]], -1)
     # Clip the counts to be in range.  This is done
     # in the C code for image.point.
     return torch.clamp(lut, 0, 255)
 
 
 # Code taken from: https://github.com/pytorch/vision/pull/796
-def _scale_channel(im: Tensor) -> Tensor:
-    r"""Scale the data in the channel to implement equalize.
+def _scale_channels(im: Tensor) -> Tensor:
+    r"""Scale the data in every channel independently to implement equalize.
+
+    The histograms and lookup tables of all the channels are computed at once.
 
     Args:
-        im: image tensor with shapes like :math:`(H, W)` or :math:`(D, H, W)`.
+        im: image tensor with shapes like :math:`(B, C, H, W)` or :math:`(B, C, D, H, W)`.
 
     Returns:
-        image tensor with the batch in the zero position.
+        the equalized image tensor.
 
     """
     min_ = im.min()
@@ -937,27 +926,24 @@ def _scale_channel(im: Tensor) -> Tensor:
     if max_.item() > 1.0 and not torch.isclose(max_, torch.as_tensor(1.0, dtype=max_.dtype)):
         raise ValueError(f"Values in the input tensor must lower or equal to 1.0. Found {max_.item()}.")
 
-    ndims = len(im.shape)
-    if ndims not in (2, 3):
-        raise TypeError(f"Input tensor must have 2 or 3 dimensions. Found {ndims}.")
-
     im = im * 255.0
-    # Compute the histogram of the image channel.
-    histo = _torch_histc_cast(im, bins=256, min=0, max=255)
-    # For the purposes of computing the step, filter out the nonzeros.
-    nonzero_histo = torch.reshape(histo[histo != 0], [-1])
-    step = torch.div(torch.sum(nonzero_histo) - nonzero_histo[-1], 255, rounding_mode="trunc")
-
-    # If step is zero, return the original image.  Otherwise, build
+    pixels = im.flatten(2)
+    # Compute the histogram of every channel.
+    histo = _torch_histc_batched(pixels, bins=256, min=0.0, max=255.0)
+    # For the purposes of computing the step, leave out the last nonzero bin.
+    bin_range = torch.arange(256, device=histo.device)
+    last_nonzero = ((histo != 0) * bin_range).argmax(-1, keepdim=True)
+    step = torch.div(histo.sum(-1, keepdim=True) - histo.gather(-1, last_nonzero), 255, rounding_mode="trunc")
+
+    # If step is zero, keep the original channel.  Otherwise, build
     # lut from the full histogram and step and then index from it.
-    if step == 0:
-        result = im
-    else:
-        # can't index using 2d index. Have to flatten and then reshape
-        result = torch.gather(_build_lut(histo, step), 0, im.flatten().long())
-        result = result.reshape_as(im)
+    is_identity = step == 0
+    lut = _build_lut(histo, torch.where(is_identity, torch.ones_like(step), step))
+    result = torch.gather(lut, -1, pixels.long())
+    if is_identity.any():
+        result = torch.where(is_identity, pixels, result)
 
-    return result / 255.0
+    return result.reshape_as(im) / 255.0
 
 
 @perform_keep_shape_image
@@ -981,13 +967,7 @@ def equalize(input: Tensor) -> Tensor:
         torch.Size([1, 2, 3, 3])
 
     """
-    res = []
-    for image in input:
-        # Assumes RGB for now.  Scales each channel independently
-        # and then stacks the result.
-        scaled_image = torch.stack([_scale_channel(image[i, :, :]) for i in range(len(image))])
-        res.append(scaled_image)
-    return torch.stack(res)
+    return _scale_channels(input)
 
 
 @perform_keep_shape_video
@@ -1004,14 +984,7 @@ def equalize3d(input: Tensor) -> Tensor:
         Equalized volume with shape :math:`(B, C, D, H, W)`.
 
     """
-    res = []
-    for volume in input:
-        # Assumes RGB for now.  Scales each channel independently
-        # and then stacks the result.
-        scaled_input = torch.stack([_scale_channel(volume[i, :, :, :]) for i in range(len(volume))])
-        res.append(scaled_input)
-
-    return torch.stack(res)
+    return _scale_channels(input)
 
 
 def invert(image: Tensor, max_val: Optional[Tensor] = None) -> Tensor:
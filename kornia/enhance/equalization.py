@@ -23,7 +23,7 @@ from typing import Tuple
 import torch
 import torch.nn.functional as F
 
-from kornia.utils.helpers import _torch_histc_cast
+from kornia.utils.helpers import _torch_histc_batched
 from kornia.utils.image import perform_keep_shape_image
 
 from .histogram import histogram
@@ -134,10 +134,6 @@ def _compute_interpolation_tiles(padded_imgs: torch.Tensor, tile_size: Tuple[int
     return interp_tiles
 
 
-def _my_histc(tiles: torch.Tensor, bins: int) -> torch.Tensor:
-    return _torch_histc_cast(tiles, bins=bins, min=0, max=1)
-
-
 def _compute_luts(
     tiles_x_im: torch.Tensor, num_bins: int = 256, clip: float = 40.0, diff: bool = False
 ) -> torch.Tensor:
@@ -162,10 +158,8 @@ def _compute_luts(
     pixels: int = th * tw
     tiles: torch.Tensor = tiles_x_im.view(-1, pixels)  # test with view  # T x (THxTW)
     if not diff:
-        if torch.jit.is_scripting():
-            histos = torch.stack([_torch_histc_cast(tile, bins=num_bins, min=0, max=1) for tile in tiles])
-        else:
-            histos = torch.stack(list(map(_my_histc, tiles, [num_bins] * len(tiles))))
+        # the histograms of all the tiles at once
+        histos = _torch_histc_batched(tiles, bins=num_bins, min=0.0, max=1.0)
     else:
         bins: torch.Tensor = torch.linspace(0, 1, num_bins, device=tiles.device)
         histos = histogram(tiles, bins, torch.tensor(0.001)).squeeze()
@@ -15,11 +15,12 @@
 # limitations under the License.
 #
 
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import torch
 
 from kornia.core import Tensor
+from kornia.utils.helpers import _scatter_histogram
 
 
 def marginal_pdf(values: Tensor, bins: Tensor, sigma: Tensor, epsilon: float = 1e-10) -> Tuple[Tensor, Tensor]:
@@ -230,27 +231,19 @@ def image_histogram2d(
     if bandwidth is None:
         bandwidth = (max - min) / n_bins
 
-    if centers is None:
-        centers = min + bandwidth * (torch.arange(n_bins, device=image.device, dtype=image.dtype) + 0.5)
-    centers = centers.reshape(-1, 1, 1, 1, 1)
-
-    u = torch.abs(image.unsqueeze(0) - centers) / bandwidth
-
-    if kernel == "gaussian":
-        kernel_values = torch.exp(-0.5 * u**2)
-    elif kernel in ("triangular", "uniform", "epanechnikov"):
-        # compute the mask and cast to floating point
-        mask = (u <= 1).to(u.dtype)
-        if kernel == "triangular":
-            kernel_values = (1.0 - u) * mask
-        elif kernel == "uniform":
-            kernel_values = mask
-        else:  # kernel == "epanechnikov"
-            kernel_values = (1.0 - u**2) * mask
-    else:
+    if kernel not in ("triangular", "gaussian", "uniform", "epanechnikov"):
         raise ValueError(f"Kernel must be 'triangular', 'gaussian', 'uniform' or 'epanechnikov'. Got {kernel}.")
 
-    hist = torch.sum(kernel_values, dim=(-2, -1)).permute(1, 2, 0)
+    if centers is None and kernel != "gaussian":
+        # the bins are spaced by the bandwidth, every pixel falls within the support of at most three of them
+        hist = _compact_kernel_histogram(image, min, bandwidth, n_bins, kernel)
+    else:
+        if centers is None:
+            centers = min + bandwidth * (torch.arange(n_bins, device=image.device, dtype=image.dtype) + 0.5)
+        centers = centers.reshape(-1, 1, 1, 1, 1)
+        u = torch.abs(image.unsqueeze(0) - centers) / bandwidth
+        kernel_values = _kernel_values(u, kernel)
+        hist = torch.sum(kernel_values, dim=(-2, -1)).permute(1, 2, 0)
 
     if return_pdf:
         normalization = torch.sum(hist, dim=-1, keepdim=True) + eps
@@ -269,3 +262,40 @@ def image_histogram2d(
         hist = hist.squeeze(0)
 
     return hist, torch.zeros_like(hist)
+
+
+def _kernel_values(u: Tensor, kernel: str) -> Tensor:
+    """Evaluate the density estimation kernel on the distances to the bin centers, in units of bandwidth."""
+    if kernel == "gaussian":
+        return torch.exp(-0.5 * u**2)
+    # compute the mask and cast to floating point
+    mask = (u <= 1).to(u.dtype)
+    if kernel == "triangular":
+        return (1.0 - u) * mask
+    if kernel == "uniform":
+        return mask
+    # kernel == "epanechnikov"
+    return (1.0 - u**2) * mask
+
+
+def _compact_kernel_histogram(image: Tensor, min: float, bandwidth: float, n_bins: int, kernel: str) -> Tensor:
+    """Compute the histograms of :func:`image_histogram2d` with equal width bins and a kernel of compact support.
+
+    Instead of evaluating the kernel of every pixel against every bin, only the bins whose support contains the
+    pixel are evaluated and accumulated with a single scatter over all the images and channels.
+
+    Returns:
+        The histograms with shape :math:`(B, C, n_{bins})`, with :math:`B` and :math:`C` set to 1 when missing.
+
+    """
+    batch_shape: List[int] = [1] * (4 - image.dim()) + list(image.shape[:-2])
+    pixels = image.reshape(batch_shape[0], batch_shape[1], 1, -1)
+    # the bins k with |pixel - center_k| <= bandwidth are within one of the nearest lower center
+    nearest = torch.floor((pixels - min) / bandwidth - 0.5)
+    offsets = torch.tensor([-1.0, 0.0, 1.0], device=image.device, dtype=image.dtype).view(1, 1, 3, 1)
+    bins = nearest + offsets
+    centers = min + bandwidth * (bins + 0.5)
+    kernel_values = _kernel_values(torch.abs(pixels - centers) / bandwidth, kernel)
+    # the bins outside of the histogram are ignored
+    bin_idx = torch.where((bins >= 0) & (bins < n_bins), bins, torch.full_like(bins, -1)).long()
+    return _scatter_histogram(bin_idx.flatten(-2), n_bins, kernel_values.flatten(-2))
@@ -45,7 +45,12 @@ from .siftdesc import SIFTDescriptor
 
 
 def get_laf_descriptors(
-    img: Tensor, lafs: Tensor, patch_descriptor: Module, patch_size: int = 32, grayscale_descriptor: bool = True
+    img: Tensor,
+    lafs: Tensor,
+    patch_descriptor: Module,
+    patch_size: int = 32,
+    grayscale_descriptor: bool = True,
+    extraction_mode: str = "batched",
 ) -> Tensor:
     r"""Get local descriptors, corresponding to LAFs (keypoints).
 
@@ -56,6 +61,8 @@ def get_laf_descriptors(
             or :class:`~kornia.feature.HardNet`.
         patch_size: patch size in pixels, which descriptor expects.
         grayscale_descriptor: True if ``patch_descriptor`` expects single-channel image.
+        extraction_mode: patch extraction mode, ``"batched"`` or ``"loop"``.
+          See :func:`~kornia.feature.extract_patches_from_pyramid`.
 
     Returns:
         Local descriptors of shape :math:`(B,N,D)` where :math:`D` is descriptor size.
@@ -72,7 +79,7 @@ def get_laf_descriptors(
     if grayscale_descriptor and img.size(1) == 3:
         timg = rgb_to_grayscale(img)
 
-    patches: Tensor = extract_patches_from_pyramid(timg, lafs, patch_size)
+    patches: Tensor = extract_patches_from_pyramid(timg, lafs, patch_size, mode=extraction_mode)
     # Descriptor accepts standard tensor [B, CH, H, W], while patches are [B, N, CH, H, W] shape
     # So we need to reshape a bit :)
     B, N, CH, H, W = patches.size()
@@ -89,11 +96,17 @@ class LAFDescriptor(Module):
             or :class:`~kornia.feature.HardNet`. Default: :class:`~kornia.feature.HardNet`.
         patch_size: patch size in pixels, which descriptor expects.
         grayscale_descriptor: ``True`` if patch_descriptor expects single-channel image.
+        extraction_mode: patch extraction mode, ``"batched"`` or ``"loop"``.
+          See :func:`~kornia.feature.extract_patches_from_pyramid`.
 
     """
 
     def __init__(
-        self, patch_descriptor_module: Optional[Module] = None, patch_size: int = 32, grayscale_descriptor: bool = True
+        self,
+        patch_descriptor_module: Optional[Module] = None,
+        patch_size: int = 32,
+        grayscale_descriptor: bool = True,
+        extraction_mode: str = "batched",
     ) -> None:
         super().__init__()
         if patch_descriptor_module is None:
@@ -101,13 +114,15 @@ class LAFDescriptor(Module):
         self.descriptor = patch_descriptor_module
         self.patch_size = patch_size
         self.grayscale_descriptor = grayscale_descriptor
+        self.extraction_mode = extraction_mode
 
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}"
             f"(descriptor={self.descriptor.__repr__()}, "
             f"patch_size={self.patch_size}, "
-            f"grayscale_descriptor='{self.grayscale_descriptor})"
+            f"grayscale_descriptor='{self.grayscale_descriptor}, "
+            f"extraction_mode={self.extraction_mode})"
         )
 
     def forward(self, img: Tensor, lafs: Tensor) -> Tensor:
@@ -124,7 +139,9 @@ class LAFDescriptor(Module):
             Local descriptors of shape :math:`(B,N,D)` where :math:`D` is descriptor size.
 
         """
-        return get_laf_descriptors(img, lafs, self.descriptor, self.patch_size, self.grayscale_descriptor)
+        return get_laf_descriptors(
+            img, lafs, self.descriptor, self.patch_size, self.grayscale_descriptor, self.extraction_mode
+        )
 
 
 class LocalFeature(Module):
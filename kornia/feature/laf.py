@@ -22,7 +22,7 @@ import torch
 import torch.nn.functional as F
 
 from kornia.core import Tensor, concatenate, cos, sin, stack, tensor, zeros
-from kornia.core.check import KORNIA_CHECK_LAF, KORNIA_CHECK_SHAPE
+from kornia.core.check import KORNIA_CHECK, KORNIA_CHECK_LAF, KORNIA_CHECK_SHAPE
 from kornia.geometry.conversions import angle_to_rotation_matrix, convert_points_from_homogeneous, rad2deg
 from kornia.geometry.linalg import transform_points
 from kornia.geometry.transform import pyrdown
@@ -437,8 +437,60 @@ def extract_patches_simple(
     return concatenate(out, dim=0).view(B, N, ch, PS, PS)
 
 
+def _extract_patches_from_pyramid_batched(img: Tensor, nlaf: Tensor, pyr_idx: Tensor, PS: int) -> Tensor:
+    """Sample all patches from all pyramid levels with a single ``grid_sample`` call.
+
+    The pyramid levels are packed side by side into one atlas image. Every LAF grid is built for the size of its
+    own level, clamped to that level borders (which reproduces ``padding_mode="border"`` per level) and shifted into
+    the level region of the atlas, so no host synchronization is needed.
+    """
+    B, N, _, _ = nlaf.size()
+    _, ch, h, _ = img.size()
+    if B * N == 0:
+        return zeros(B, N, ch, PS, PS, device=nlaf.device, dtype=nlaf.dtype)
+    levels = [img]
+    while min(levels[-1].size(2), levels[-1].size(3)) >= PS:
+        levels.append(pyrdown(levels[-1]))
+    heights = [lvl.size(2) for lvl in levels]
+    widths = [lvl.size(3) for lvl in levels]
+    offsets = [0]
+    for w_lvl in widths[:-1]:
+        offsets.append(offsets[-1] + w_lvl)
+    atlas_w = offsets[-1] + widths[-1]
+    atlas = img.new_zeros(B, ch, h, atlas_w)
+    for lvl, x0, h_lvl, w_lvl in zip(levels, offsets, heights, widths):
+        atlas[:, :, :h_lvl, x0 : x0 + w_lvl] = lvl
+
+    # LAFs assigned to a level, which is not built, stay zero, as in the per-level loop.
+    lvl_idx = pyr_idx.view(B, N)
+    valid = lvl_idx < len(levels)
+    lvl_idx = lvl_idx.clamp(max=len(levels) - 1)
+    hs = tensor(heights, device=nlaf.device, dtype=nlaf.dtype)[lvl_idx]
+    ws = tensor(widths, device=nlaf.device, dtype=nlaf.dtype)[lvl_idx]
+    xs = tensor(offsets, device=nlaf.device, dtype=nlaf.dtype)[lvl_idx]
+
+    # per-LAF version of denormalize_laf
+    min_size = torch.minimum(hs - 1.0, ws - 1.0)
+    coef = stack([min_size, min_size, ws - 1.0, min_size, min_size, hs - 1.0], -1).view(B, N, 2, 3)
+    laf_renorm = coef * nlaf
+    grid = F.affine_grid(laf_renorm.view(B * N, 2, 3), [B * N, ch, PS, PS], align_corners=False)
+    grid = grid.view(B, N, PS * PS, 2)
+    hs, ws, xs = hs[..., None], ws[..., None], xs[..., None]
+    # pixel coordinates inside the level, as grid_sample computes them with align_corners=False and border padding
+    px = (2.0 * grid[..., 0] / (ws - 1.0) * ws - 1.0) / 2.0
+    py = (2.0 * grid[..., 1] / (hs - 1.0) * hs - 1.0) / 2.0
+    px = torch.minimum(px.clamp(min=0.0), ws - 1.0) + xs
+    py = torch.minimum(py.clamp(min=0.0), hs - 1.0)
+    atlas_grid = stack([(2.0 * px + 1.0) / atlas_w - 1.0, (2.0 * py + 1.0) / h - 1.0], -1)
+    patches = F.grid_sample(
+        atlas, atlas_grid.view(B, N * PS, PS, 2).to(atlas.dtype), padding_mode="border", align_corners=False
+    )
+    patches = patches.view(B, ch, N, PS, PS).permute(0, 2, 1, 3, 4).to(nlaf.dtype)
+    return patches * valid.view(B, N, 1, 1, 1).to(patches.dtype)
+
+
 def extract_patches_from_pyramid(
-    img: Tensor, laf: Tensor, PS: int = 32, normalize_lafs_before_extraction: bool = True
+    img: Tensor, laf: Tensor, PS: int = 32, normalize_lafs_before_extraction: bool = True, mode: str = "loop"
 ) -> Tensor:
     """Extract patches defined by LAFs from image tensor.
 
@@ -449,12 +501,16 @@ def extract_patches_from_pyramid(
         laf: :math:`(B, N, 2, 3)`.
         PS: patch size.
         normalize_lafs_before_extraction: if True, lafs are normalized to image size.
+        mode: how the patches are sampled. ``"loop"`` iterates over images and pyramid levels.
+          ``"batched"`` builds the pyramid once and samples all the patches of all the images with a single
+          ``grid_sample`` call, without host synchronization. Both modes return the same patches.
 
     Returns:
         patches with shape :math:`(B, N, CH, PS,PS)`.
 
     """
     KORNIA_CHECK_LAF(laf)
+    KORNIA_CHECK(mode in ("loop", "batched"), f"mode must be either 'loop' or 'batched'. Got {mode}")
     if normalize_lafs_before_extraction:
         nlaf = normalize_laf(laf, img)
     else:
@@ -464,6 +520,8 @@ def extract_patches_from_pyramid(
     scale = 2.0 * get_laf_scale(denormalize_laf(nlaf, img)) / float(PS)
     max_level = min(img.size(2), img.size(3)) // PS
     pyr_idx = scale.log2().clamp(min=0.0, max=max(0, max_level - 1)).long()
+    if mode == "batched":
+        return _extract_patches_from_pyramid_batched(img, nlaf, pyr_idx, PS)
     cur_img = img
     cur_pyr_level = 0
     out = torch.zeros(B, N, ch, PS, PS).to(nlaf.dtype).to(nlaf.device)
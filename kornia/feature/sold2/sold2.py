@@ -320,15 +320,28 @@ class WunschLineMatcher(Module):
         gap = 0.1
         nw_scores = scores - gap
         dev = scores.device
-        # Run the dynamic programming algorithm
-        nw_grid = torch.zeros(b, n + 1, m + 1, dtype=torch.float, device=dev)
-        for i in range(n):
-            for j in range(m):
-                nw_grid[:, i + 1, j + 1] = torch.maximum(
-                    torch.maximum(nw_grid[:, i + 1, j], nw_grid[:, i, j + 1]), nw_grid[:, i, j] + nw_scores[:, i, j]
-                )
-
-        return nw_grid[:, -1, -1]
+        if n == 0 or m == 0:
+            return torch.zeros(b, dtype=torch.float, device=dev)
+
+        # Run the dynamic programming algorithm on the anti-diagonals i + j = d of the grid: each one only depends
+        # on the two previous ones. The diagonals are indexed by the row i in [0, n], with the batch as the last
+        # dimension, and the scores are skewed so that skewed[d, i] = nw_scores[:, i - 1, d - i - 1].
+        rows = torch.arange(n + 1, device=dev)
+        cols = torch.arange(n + m + 1, device=dev)[:, None] - rows  # (n + m + 1, n + 1)
+        index = ((rows - 1).clamp(0, n - 1) * m + (cols - 1).clamp(0, m - 1)).flatten()
+        skewed = nw_scores.flatten(1)[:, index].t().reshape(n + m + 1, n + 1, b)
+
+        # the first row and column of the grid are never written and stay 0
+        nw_diags = torch.zeros(n + m + 1, n + 1, b, dtype=torch.float, device=dev)
+        for d in range(2, n + m + 1):
+            lo, hi = max(1, d - m), min(n, d - 1) + 1
+            # max(nw_grid[i, j - 1], nw_grid[i - 1, j], nw_grid[i - 1, j - 1] + nw_scores[i - 1, j - 1])
+            nw_diags[d, lo:hi] = torch.maximum(
+                torch.maximum(nw_diags[d - 1, lo:hi], nw_diags[d - 1, lo - 1 : hi - 1]),
+                nw_diags[d - 2, lo - 1 : hi - 1] + skewed[d, lo:hi],
+            )
+
+        return nw_diags[n + m, n]
 
 
 def keypoints_to_grid(keypoints: Tensor, img_size: Tuple[int, int]) -> Tensor:
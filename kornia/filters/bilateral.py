@@ -19,6 +19,9 @@ from __future__ import annotations
 
 from typing import Optional
 
+import torch
+import torch.nn.functional as F
+
 from kornia.core import ImageModule as Module
 from kornia.core import Tensor, pad
 from kornia.core.check import KORNIA_CHECK, KORNIA_CHECK_IS_TENSOR, KORNIA_CHECK_SHAPE
@@ -26,6 +29,168 @@ from kornia.core.check import KORNIA_CHECK, KORNIA_CHECK_IS_TENSOR, KORNIA_CHECK
 from .kernels import _unpack_2d_ks, get_gaussian_kernel2d
 from .median import _compute_zero_padding
 
+# default memory budget, in bytes, for the window tensors of the ``"auto"`` engine
+_BILATERAL_MEMORY_BUDGET: int = 2**30
+
+_BILATERAL_ENGINES = ("auto", "unfold", "streamed", "grid")
+
+
+def _bilateral_windows(
+    input: Tensor,
+    guidance: Tensor,
+    kernel_size: tuple[int, int] | int,
+    sigma_color: float | Tensor,
+    sigma_space: tuple[float, float] | Tensor,
+    border_type: str,
+    color_distance_type: str,
+    rows_per_chunk: int | None,
+) -> Tensor:
+    """Exact bilateral filter accumulating the weighted sums over chunks of ``rows_per_chunk`` kernel rows.
+
+    Only the windows of the kernel rows being processed are materialized, so ``rows_per_chunk=None`` unfolds the
+    whole kernel at once.
+    """
+    ky, kx = _unpack_2d_ks(kernel_size)
+    pad_y, pad_x = _compute_zero_padding(kernel_size)
+
+    padded_input = pad(input, (pad_x, pad_x, pad_y, pad_y), mode=border_type)
+    windows_input = padded_input.unfold(2, ky, 1).unfold(3, kx, 1)  # (B, C, H, W, Ky, Kx) view
+    if guidance is input:
+        windows_guidance = windows_input
+    else:
+        padded_guidance = pad(guidance, (pad_x, pad_x, pad_y, pad_y), mode=border_type)
+        windows_guidance = padded_guidance.unfold(2, ky, 1).unfold(3, kx, 1)  # (B, C, H, W, Ky, Kx) view
+
+    space_kernel = get_gaussian_kernel2d(kernel_size, sigma_space, device=input.device, dtype=input.dtype)
+    space_kernel = space_kernel.view(-1, 1, 1, 1, ky, kx)
+
+    rows = ky if rows_per_chunk is None else max(1, rows_per_chunk)
+    numerator: Tensor | None = None
+    denominator: Tensor | None = None
+    for r0 in range(0, ky, rows):
+        r1 = min(ky, r0 + rows)
+        unfolded_input = windows_input[..., r0:r1, :].flatten(-2)  # (B, C, H, W, rows x Kx)
+        unfolded_guidance = windows_guidance[..., r0:r1, :].flatten(-2)
+
+        diff = unfolded_guidance - guidance.unsqueeze(-1)
+        if color_distance_type == "l1":
+            color_distance_sq = diff.abs().sum(1, keepdim=True).square()
+        elif color_distance_type == "l2":
+            color_distance_sq = diff.square().sum(1, keepdim=True)
+        else:
+            raise ValueError("color_distance_type only accepts l1 or l2")
+        color_kernel = (-0.5 / sigma_color**2 * color_distance_sq).exp()  # (B, 1, H, W, rows x Kx)
+
+        kernel = space_kernel[..., r0:r1, :].flatten(-2) * color_kernel
+        chunk_numerator = (unfolded_input * kernel).sum(-1)
+        chunk_denominator = kernel.sum(-1)
+        if numerator is None or denominator is None:
+            numerator, denominator = chunk_numerator, chunk_denominator
+        else:
+            numerator = numerator + chunk_numerator
+            denominator = denominator + chunk_denominator
+    return numerator / denominator  # type: ignore[operator]
+
+
+def _bilateral_grid(
+    input: Tensor, guidance: Tensor, sigma_color: float | Tensor, sigma_space: tuple[float, float] | Tensor
+) -> Tensor:
+    """Approximate bilateral filter with a bilateral grid.
+
+    The input is splatted with trilinear weights in a grid whose cells are ``sigma_space`` pixels wide and
+    ``sigma_color`` intensity levels deep, the grid is blurred with a separable :math:`[1, 4, 6, 4, 1] / 16`
+    kernel, close to a Gaussian of one cell, and the result is sliced back at the pixels positions. The cost does
+    not depend on the kernel size, which is not used.
+
+    A multi-channel guidance must have as many channels as the input, and every channel is filtered with a grid
+    guided by the same channel of the guidance, so that the color distance is measured per channel.
+    """
+    B, C, H, W = input.shape
+    KORNIA_CHECK(
+        guidance.shape[1] in (1, C),
+        f"The grid engine expects a guidance with one channel or as many channels as the input. Got: {guidance.shape}",
+    )
+    if isinstance(sigma_color, Tensor):
+        sigma_color = sigma_color.reshape(-1).expand(B)
+
+    if isinstance(sigma_space, Tensor):
+        KORNIA_CHECK_SHAPE(sigma_space, ["B", "2"])
+        KORNIA_CHECK(sigma_space.shape[0] in (1, B), f"sigma_space expected as 1x2 or Bx2. Got: {sigma_space.shape}")
+        sigmas = sigma_space.tolist()
+        if any(sigma != sigmas[0] for sigma in sigmas[1:]):
+            # the grid resolution depends on sigma_space, one grid per image
+            return torch.cat(
+                [
+                    _bilateral_grid(
+                        input[i : i + 1],
+                        guidance[i : i + 1],
+                        sigma_color[i : i + 1] if isinstance(sigma_color, Tensor) else sigma_color,
+                        (sigmas[i][0], sigmas[i][1]),
+                    )
+                    for i in range(B)
+                ]
+            )
+        sigma_space = (sigmas[0][0], sigmas[0][1])
+
+    if guidance.shape[1] > 1:
+        if isinstance(sigma_color, Tensor):
+            sigma_color = sigma_color.repeat_interleave(C)
+        out = _bilateral_grid(input.reshape(B * C, 1, H, W), guidance.reshape(B * C, 1, H, W), sigma_color, sigma_space)
+        return out.view(B, C, H, W)
+
+    device, dtype = input.device, input.dtype
+    sigma_y, sigma_x = float(sigma_space[0]), float(sigma_space[1])
+
+    # normalized grid coordinates, with a margin of 2 cells for the blur
+    margin = 2
+    sigma_color = sigma_color.view(-1, 1, 1, 1) if isinstance(sigma_color, Tensor) else sigma_color
+    z = guidance / sigma_color
+    z = z - z.flatten(1).amin(1).view(-1, 1, 1, 1) + margin
+    y = torch.arange(H, device=device, dtype=dtype).view(1, 1, H, 1) / sigma_y + margin
+    x = torch.arange(W, device=device, dtype=dtype).view(1, 1, 1, W) / sigma_x + margin
+    y, x = y.expand_as(z), x.expand_as(z)
+    sizes = (
+        int(z.detach().max().ceil()) + margin + 1,
+        int((H - 1) / sigma_y) + 2 * margin + 2,
+        int((W - 1) / sigma_x) + 2 * margin + 2,
+    )
+    D, Hg, Wg = sizes
+
+    # splat the homogeneous values with trilinear weights
+    values = torch.cat([input, torch.ones_like(input[:, :1])], 1).flatten(2)  # (B, C + 1, H x W)
+    grid = torch.zeros(B, C + 1, D * Hg * Wg, device=device, dtype=dtype)
+    coords = [c.flatten(1) for c in (z, y, x)]
+    floors = [c.floor() for c in coords]
+    fracs = [c - f for c, f in zip(coords, floors)]
+    for dz in (0, 1):
+        for dy in (0, 1):
+            for dx in (0, 1):
+                weight = (
+                    (fracs[0] if dz else 1 - fracs[0])
+                    * (fracs[1] if dy else 1 - fracs[1])
+                    * (fracs[2] if dx else 1 - fracs[2])
+                )
+                index = ((floors[0] + dz) * Hg + floors[1] + dy) * Wg + floors[2] + dx
+                index = index.long().unsqueeze(1).expand(-1, C + 1, -1)
+                grid = grid.scatter_add(2, index, values * weight.unsqueeze(1))
+
+    # separable blur along the three grid axes
+    grid = grid.view(B * (C + 1), 1, D, Hg, Wg)
+    taps = torch.tensor([1.0, 4.0, 6.0, 4.0, 1.0], device=device, dtype=dtype) / 16
+    for axis in range(3):
+        shape = [1, 1, 1, 1, 1]
+        shape[2 + axis] = 5
+        padding = [0, 0, 0]
+        padding[axis] = 2
+        grid = F.conv3d(grid, taps.view(shape), padding=padding)
+
+    # slice the grid with trilinear interpolation
+    sample = torch.stack([c.flatten(1) / (size - 1) * 2 - 1 for c, size in ((x, Wg), (y, Hg), (z, D))], -1)
+    out = F.grid_sample(
+        grid.view(B, C + 1, D, Hg, Wg), sample.view(B, 1, 1, H * W, 3), mode="bilinear", align_corners=True
+    ).view(B, C + 1, H, W)
+    return out[:, :C] / out[:, C:]
+
 
 def _bilateral_blur(
     input: Tensor,
@@ -35,6 +200,8 @@ def _bilateral_blur(
     sigma_space: tuple[float, float] | Tensor,
     border_type: str = "reflect",
     color_distance_type: str = "l1",
+    engine: str = "auto",
+    memory_budget: int | None = None,
 ) -> Tensor:
     """Single implementation for both Bilateral Filter and Joint Bilateral Filter."""
     KORNIA_CHECK_IS_TENSOR(input)
@@ -47,39 +214,34 @@ def _bilateral_blur(
             (guidance.shape[0] == input.shape[0]) and (guidance.shape[-2:] == input.shape[-2:]),
             "guidance and input should have the same batch size and spatial dimensions",
         )
+    KORNIA_CHECK(engine in _BILATERAL_ENGINES, f"engine must be one of {_BILATERAL_ENGINES}. Got: {engine}")
 
     if isinstance(sigma_color, Tensor):
         KORNIA_CHECK_SHAPE(sigma_color, ["B"])
         sigma_color = sigma_color.to(device=input.device, dtype=input.dtype).view(-1, 1, 1, 1, 1)
 
-    ky, kx = _unpack_2d_ks(kernel_size)
-    pad_y, pad_x = _compute_zero_padding(kernel_size)
-
-    padded_input = pad(input, (pad_x, pad_x, pad_y, pad_y), mode=border_type)
-    unfolded_input = padded_input.unfold(2, ky, 1).unfold(3, kx, 1).flatten(-2)  # (B, C, H, W, Ky x Kx)
-
     if guidance is None:
         guidance = input
-        unfolded_guidance = unfolded_input
-    else:
-        padded_guidance = pad(guidance, (pad_x, pad_x, pad_y, pad_y), mode=border_type)
-        unfolded_guidance = padded_guidance.unfold(2, ky, 1).unfold(3, kx, 1).flatten(-2)  # (B, C, H, W, Ky x Kx)
 
-    diff = unfolded_guidance - guidance.unsqueeze(-1)
-    if color_distance_type == "l1":
-        color_distance_sq = diff.abs().sum(1, keepdim=True).square()
-    elif color_distance_type == "l2":
-        color_distance_sq = diff.square().sum(1, keepdim=True)
-    else:
-        raise ValueError("color_distance_type only accepts l1 or l2")
-    color_kernel = (-0.5 / sigma_color**2 * color_distance_sq).exp()  # (B, 1, H, W, Ky x Kx)
-
-    space_kernel = get_gaussian_kernel2d(kernel_size, sigma_space, device=input.device, dtype=input.dtype)
-    space_kernel = space_kernel.view(-1, 1, 1, 1, kx * ky)
-
-    kernel = space_kernel * color_kernel
-    out = (unfolded_input * kernel).sum(-1) / kernel.sum(-1)
-    return out
+    if engine == "grid":
+        if color_distance_type not in ("l1", "l2"):
+            raise ValueError("color_distance_type only accepts l1 or l2")
+        return _bilateral_grid(input, guidance, sigma_color, sigma_space)
+
+    # size of the (B, C, H, W, rows x Kx) temporaries for a single kernel row
+    _, kx = _unpack_2d_ks(kernel_size)
+    B, C, H, W = input.shape
+    row_bytes = B * max(C, guidance.shape[1]) * H * W * kx * input.element_size() * 3
+    if engine == "auto" and memory_budget is None:
+        memory_budget = _BILATERAL_MEMORY_BUDGET
+    rows_per_chunk = None
+    if engine != "unfold" and memory_budget is not None:
+        rows_per_chunk = max(1, memory_budget // max(1, row_bytes))
+    if engine == "streamed" and memory_budget is None:
+        rows_per_chunk = 1
+    return _bilateral_windows(
+        input, guidance, kernel_size, sigma_color, sigma_space, border_type, color_distance_type, rows_per_chunk
+    )
 
 
 def bilateral_blur(
@@ -89,6 +251,8 @@ def bilateral_blur(
     sigma_space: tuple[float, float] | Tensor,
     border_type: str = "reflect",
     color_distance_type: str = "l1",
+    engine: str = "auto",
+    memory_budget: int | None = None,
 ) -> Tensor:
     r"""Blur a tensor using a Bilateral filter.
 
@@ -112,6 +276,15 @@ def bilateral_blur(
           difference. Only ``'l1'`` or ``'l2'`` is allowed. Use ``'l1'`` to
           match OpenCV implementation. Use ``'l2'`` to match Matlab implementation.
           Default: ``'l1'``.
+        engine: the implementation, one of ``"auto"``, ``"unfold"``, ``"streamed"`` or ``"grid"``.
+          ``"unfold"`` materializes all the kernel windows at once, ``"streamed"`` accumulates the weighted sums over
+          chunks of kernel rows that fit ``memory_budget`` and ``"auto"`` streams only when the windows exceed the
+          budget. ``"grid"`` is a fast bilateral grid approximation whose cost does not depend on the kernel size,
+          suited to large ``sigma_space``. It ignores ``kernel_size``, ``border_type`` and ``memory_budget``, and
+          filters every channel of the input with the same channel as guidance, where the ``'l1'`` and ``'l2'``
+          color distances are equal.
+        memory_budget: approximate maximum size, in bytes, of the temporary tensors of the ``"streamed"`` and
+          ``"auto"`` engines. One kernel row at a time if ``None`` for the ``"streamed"`` engine.
 
     Returns:
         the blurred tensor with shape :math:`(B, C, H, W)`.
@@ -123,7 +296,9 @@ def bilateral_blur(
         torch.Size([2, 4, 5, 5])
 
     """
-    return _bilateral_blur(input, None, kernel_size, sigma_color, sigma_space, border_type, color_distance_type)
+    return _bilateral_blur(
+        input, None, kernel_size, sigma_color, sigma_space, border_type, color_distance_type, engine, memory_budget
+    )
 
 
 def joint_bilateral_blur(
@@ -134,6 +309,8 @@ def joint_bilateral_blur(
     sigma_space: tuple[float, float] | Tensor,
     border_type: str = "reflect",
     color_distance_type: str = "l1",
+    engine: str = "auto",
+    memory_budget: int | None = None,
 ) -> Tensor:
     r"""Blur a tensor using a Joint Bilateral filter.
 
@@ -157,6 +334,15 @@ def joint_bilateral_blur(
         color_distance_type: the type of distance to calculate intensity/color
           difference. Only ``'l1'`` or ``'l2'`` is allowed. Use ``'l1'`` to
           match OpenCV implementation.
+        engine: the implementation, one of ``"auto"``, ``"unfold"``, ``"streamed"`` or ``"grid"``.
+          ``"unfold"`` materializes all the kernel windows at once, ``"streamed"`` accumulates the weighted sums over
+          chunks of kernel rows that fit ``memory_budget`` and ``"auto"`` streams only when the windows exceed the
+          budget. ``"grid"`` is a fast bilateral grid approximation whose cost does not depend on the kernel size,
+          suited to large ``sigma_space``. It ignores ``kernel_size``, ``border_type`` and ``memory_budget``. The
+          guidance must have one channel, or as many channels as the input to filter every channel of the input with
+          the same channel of the guidance, where the ``'l1'`` and ``'l2'`` color distances are equal.
+        memory_budget: approximate maximum size, in bytes, of the temporary tensors of the ``"streamed"`` and
+          ``"auto"`` engines. One kernel row at a time if ``None`` for the ``"streamed"`` engine.
 
     Returns:
         the blurred tensor with shape :math:`(B, C, H, W)`.
@@ -169,7 +355,9 @@ def joint_bilateral_blur(
         torch.Size([2, 4, 5, 5])
 
     """
-    return _bilateral_blur(input, guidance, kernel_size, sigma_color, sigma_space, border_type, color_distance_type)
+    return _bilateral_blur(
+        input, guidance, kernel_size, sigma_color, sigma_space, border_type, color_distance_type, engine, memory_budget
+    )
 
 
 # trick to make mypy not throw errors about difference in .forward() signatures of subclass and superclass
@@ -181,6 +369,8 @@ class _BilateralBlur(Module):
         sigma_space: tuple[float, float] | Tensor,
         border_type: str = "reflect",
         color_distance_type: str = "l1",
+        engine: str = "auto",
+        memory_budget: int | None = None,
     ) -> None:
         super().__init__()
         self.kernel_size = kernel_size
@@ -188,6 +378,8 @@ class _BilateralBlur(Module):
         self.sigma_space = sigma_space
         self.border_type = border_type
         self.color_distance_type = color_distance_type
+        self.engine = engine
+        self.memory_budget = memory_budget
 
     def __repr__(self) -> str:
         return (
@@ -196,7 +388,8 @@ class _BilateralBlur(Module):
             f"sigma_color={self.sigma_color}, "
             f"sigma_space={self.sigma_space}, "
             f"border_type={self.border_type}, "
-            f"color_distance_type={self.color_distance_type})"
+            f"color_distance_type={self.color_distance_type}, "
+            f"engine={self.engine})"
         )
 
 
@@ -220,6 +413,9 @@ class BilateralBlur(_BilateralBlur):
           difference. Only ``'l1'`` or ``'l2'`` is allowed. Use ``'l1'`` to
           match OpenCV implementation. Use ``'l2'`` to match Matlab implementation.
           Default: ``'l1'``.
+        engine: the implementation, one of ``"auto"``, ``"unfold"``, ``"streamed"`` or ``"grid"``.
+          See :func:`bilateral_blur`.
+        memory_budget: approximate maximum size, in bytes, of the temporary tensors. See :func:`bilateral_blur`.
 
     Returns:
         the blurred input tensor.
@@ -239,7 +435,14 @@ class BilateralBlur(_BilateralBlur):
 
     def forward(self, input: Tensor) -> Tensor:
         return bilateral_blur(
-            input, self.kernel_size, self.sigma_color, self.sigma_space, self.border_type, self.color_distance_type
+            input,
+            self.kernel_size,
+            self.sigma_color,
+            self.sigma_space,
+            self.border_type,
+            self.color_distance_type,
+            self.engine,
+            self.memory_budget,
         )
 
 
@@ -262,6 +465,9 @@ class JointBilateralBlur(_BilateralBlur):
         color_distance_type: the type of distance to calculate intensity/color
           difference. Only ``'l1'`` or ``'l2'`` is allowed. Use ``'l1'`` to
           match OpenCV implementation.
+        engine: the implementation, one of ``"auto"``, ``"unfold"``, ``"streamed"`` or ``"grid"``.
+          See :func:`joint_bilateral_blur`.
+        memory_budget: approximate maximum size, in bytes, of the temporary tensors. See :func:`joint_bilateral_blur`.
 
     Returns:
         the blurred input tensor.
@@ -289,4 +495,6 @@ class JointBilateralBlur(_BilateralBlur):
             self.sigma_space,
             self.border_type,
             self.color_distance_type,
+            self.engine,
+            self.memory_budget,
         )
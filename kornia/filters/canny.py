@@ -26,11 +26,56 @@ from kornia.color import rgb_to_grayscale
 from kornia.core import ImageModule as Module
 from kornia.core import Tensor
 from kornia.core.check import KORNIA_CHECK, KORNIA_CHECK_IS_TENSOR, KORNIA_CHECK_SHAPE
+from kornia.utils._compat import torch_version_ge
+from kornia.utils.helpers import _compact_labels, _propagate_min_labels
 
 from .gaussian import gaussian_blur2d
 from .kernels import get_canny_nms_kernel, get_hysteresis_kernel
 from .sobel import spatial_gradient
 
+_HYSTERESIS_ENGINES = ("auto", "iterative", "propagation")
+
+
+def _hysteresis_iterative(edges: Tensor) -> Tensor:
+    """Grow the strong edges (1) through the weak ones (0.5) one pixel per iteration until convergence."""
+    device, dtype = edges.device, edges.dtype
+    edges_old: Tensor = -torch.ones(edges.shape, device=device, dtype=dtype)
+    hysteresis_kernels: Tensor = get_hysteresis_kernel(device, dtype)
+
+    while ((edges_old - edges).abs() != 0).any():
+        weak: Tensor = (edges == 0.5).float()
+        strong: Tensor = (edges == 1).float()
+
+        hysteresis_magnitude: Tensor = F.conv2d(edges, hysteresis_kernels, padding=hysteresis_kernels.shape[-1] // 2)
+        hysteresis_magnitude = (hysteresis_magnitude == 1).any(1, keepdim=True).to(dtype)
+        hysteresis_magnitude = hysteresis_magnitude * weak + strong
+
+        edges_old = edges.clone()
+        edges = hysteresis_magnitude + (hysteresis_magnitude == 0) * weak * 0.5
+
+    return hysteresis_magnitude
+
+
+def _hysteresis_propagation(low: Tensor, high: Tensor, check_every: int) -> tuple[Tensor, Tensor]:
+    """Keep the 8-connected components of the weak edges that contain a strong edge.
+
+    The components are found by label equivalence with pointer jumping, as in
+    :func:`kornia.contrib.label_connected_components`.
+
+    Returns:
+        the boolean edges and their labels, ``0`` for the background and consecutive integers for each edge.
+
+    """
+    B, _, H, W = low.shape
+    low, high = low.view(B, H, W), high.view(B, H, W)
+    roots = _propagate_min_labels(low, connectivity=8, check_every=check_every)
+    # a component is kept if any of its pixels is a strong edge, the last entry is the background sentinel
+    is_strong = torch.zeros(B * H * W + 1, device=low.device, dtype=torch.bool)
+    is_strong[roots[high]] = True
+    edges = low & is_strong[roots]
+    labels, _ = _compact_labels(edges.view(B, H * W), roots.view(B, H * W))
+    return edges.view(B, 1, H, W), labels.view(B, 1, H, W)
+
 
 def canny(
     input: Tensor,
@@ -40,7 +85,10 @@ def canny(
     sigma: tuple[float, float] | Tensor = (1, 1),
     hysteresis: bool = True,
     eps: float = 1e-6,
-) -> tuple[Tensor, Tensor]:
+    hysteresis_engine: str = "auto",
+    check_every: int = 4,
+    return_labels: bool = False,
+) -> tuple[Tensor, Tensor] | tuple[Tensor, Tensor, Tensor]:
     r"""Find edges of the input image and filters them using the Canny algorithm.
 
     .. image:: _static/img/canny.png
@@ -54,10 +102,18 @@ def canny(
         hysteresis: if True, applies the hysteresis edge tracking.
             Otherwise, the edges are divided between weak (0.5) and strong (1) edges.
         eps: regularization number to avoid NaN during backprop.
+        hysteresis_engine: the hysteresis implementation. ``iterative`` grows the strong edges one pixel per
+            iteration and synchronizes with the host at each of them. ``propagation`` labels the weak edges
+            connected components by pointer jumping, in a number of iterations logarithmic in the edges length.
+            ``auto`` selects ``propagation`` when available (torch>=1.12).
+        check_every: number of iterations between the convergence checks of the ``propagation`` engine.
+        return_labels: if True, also returns the labels of the connected edges. Requires ``hysteresis``.
 
     Returns:
-        - the canny edge magnitudes map, shape of :math:`(B,1,H,W)`.
+        - the canny edge magnitudes map after non-maximal suppression, shape of :math:`(B,1,H,W)`.
         - the canny edge detection filtered by thresholds and hysteresis, shape of :math:`(B,1,H,W)`.
+        - if ``return_labels``, the labels of the edges, ``0`` for the background and consecutive integers for each
+          connected edge, shape of :math:`(B,1,H,W)`.
 
     .. note::
        See a working example `here <https://kornia.github.io/tutorials/nbs/canny.html>`__.
@@ -80,6 +136,12 @@ def canny(
     )
     KORNIA_CHECK(0 < low_threshold < 1, f"Invalid low threshold. Should be in range (0, 1). Got: {low_threshold}")
     KORNIA_CHECK(0 < high_threshold < 1, f"Invalid high threshold. Should be in range (0, 1). Got: {high_threshold}")
+    KORNIA_CHECK(
+        hysteresis_engine in _HYSTERESIS_ENGINES,
+        f"hysteresis_engine must be one of {_HYSTERESIS_ENGINES}. Got: {hysteresis_engine}",
+    )
+    KORNIA_CHECK(hysteresis or not return_labels, "return_labels requires the hysteresis.")
+    KORNIA_CHECK(check_every >= 1, f"check_every must be a positive integer. Got: {check_every}")
 
     device = input.device
     dtype = input.dtype
@@ -141,23 +203,15 @@ def canny(
 
     # Hysteresis
     if hysteresis:
-        edges_old: Tensor = -torch.ones(edges.shape, device=edges.device, dtype=dtype)
-        hysteresis_kernels: Tensor = get_hysteresis_kernel(device, dtype)
-
-        while ((edges_old - edges).abs() != 0).any():
-            weak: Tensor = (edges == 0.5).float()
-            strong: Tensor = (edges == 1).float()
-
-            hysteresis_magnitude: Tensor = F.conv2d(
-                edges, hysteresis_kernels, padding=hysteresis_kernels.shape[-1] // 2
-            )
-            hysteresis_magnitude = (hysteresis_magnitude == 1).any(1, keepdim=True).to(dtype)
-            hysteresis_magnitude = hysteresis_magnitude * weak + strong
-
-            edges_old = edges.clone()
-            edges = hysteresis_magnitude + (hysteresis_magnitude == 0) * weak * 0.5
-
-        edges = hysteresis_magnitude
+        if hysteresis_engine == "auto":
+            hysteresis_engine = "propagation" if torch_version_ge(1, 12) else "iterative"
+        if hysteresis_engine == "propagation" or return_labels:
+            edges_mask, labels = _hysteresis_propagation(low, high, check_every)
+            edges = edges_mask.to(dtype)
+            if return_labels:
+                return magnitude, edges, labels
+        else:
+            edges = _hysteresis_iterative(edges)
 
     return magnitude, edges
 
@@ -174,6 +228,9 @@ class Canny(Module):
         hysteresis: if True, applies the hysteresis edge tracking.
             Otherwise, the edges are divided between weak (0.5) and strong (1) edges.
         eps: regularization number to avoid NaN during backprop.
+        hysteresis_engine: the hysteresis implementation, one of ``auto``, ``iterative`` or ``propagation``.
+            See :func:`canny`.
+        check_every: number of iterations between the convergence checks of the ``propagation`` engine.
 
     Returns:
         - the canny edge magnitudes map, shape of :math:`(B,1,H,W)`.
@@ -200,6 +257,8 @@ class Canny(Module):
         sigma: tuple[float, float] | Tensor = (1, 1),
         hysteresis: bool = True,
         eps: float = 1e-6,
+        hysteresis_engine: str = "auto",
+        check_every: int = 4,
     ) -> None:
         super().__init__()
 
@@ -212,6 +271,10 @@ class Canny(Module):
         KORNIA_CHECK(
             0 < high_threshold < 1, f"Invalid high threshold. Should be in range (0, 1). Got: {high_threshold}"
         )
+        KORNIA_CHECK(
+            hysteresis_engine in _HYSTERESIS_ENGINES,
+            f"hysteresis_engine must be one of {_HYSTERESIS_ENGINES}. Got: {hysteresis_engine}",
+        )
 
         # Gaussian blur parameters
         self.kernel_size = kernel_size
@@ -223,6 +286,8 @@ class Canny(Module):
 
         # Hysteresis
         self.hysteresis = hysteresis
+        self.hysteresis_engine = hysteresis_engine
+        self.check_every = check_every
 
         self.eps: float = eps
 
@@ -238,6 +303,14 @@ class Canny(Module):
         )
 
     def forward(self, input: Tensor) -> tuple[Tensor, Tensor]:
-        return canny(
-            input, self.low_threshold, self.high_threshold, self.kernel_size, self.sigma, self.hysteresis, self.eps
+        return canny(  # type: ignore[return-value]
+            input,
+            self.low_threshold,
+            self.high_threshold,
+            self.kernel_size,
+            self.sigma,
+            self.hysteresis,
+            self.eps,
+            self.hysteresis_engine,
+            self.check_every,
         )
@@ -17,14 +17,24 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
+import torch
 import torch.nn.functional as F
 
 from kornia.core import ImageModule as Module
 from kornia.core import Tensor
-from kornia.core.check import KORNIA_CHECK_IS_TENSOR, KORNIA_CHECK_SHAPE
+from kornia.core.check import KORNIA_CHECK, KORNIA_CHECK_IS_TENSOR, KORNIA_CHECK_SHAPE
 
 from .kernels import _unpack_2d_ks, get_binary_kernel2d
 
+# default memory budget, in bytes, for the window tensors of the ``"auto"`` engine
+_MEDIAN_MEMORY_BUDGET: int = 2**30
+
+# smallest window, in elements, for which the ``"auto"`` engine picks the histogram engine for ``uint8`` images: its
+# 255 passes over the image only beat the sorting network from about 21x21 kernels (see benchmarks/filters)
+_MEDIAN_HISTOGRAM_MIN_WINDOW: int = 21 * 21
+
 
 def _compute_zero_padding(kernel_size: tuple[int, int] | int) -> tuple[int, int]:
     r"""Compute zero padding tuple."""
@@ -32,14 +42,159 @@ def _compute_zero_padding(kernel_size: tuple[int, int] | int) -> tuple[int, int]
     return (ky - 1) // 2, (kx - 1) // 2
 
 
-def median_blur(input: Tensor, kernel_size: tuple[int, int] | int) -> Tensor:
+def _batcher_comparators(n: int) -> list[tuple[int, int]]:
+    """Return the comparators of the Batcher odd-even merge sort network for ``n`` (a power of two) wires."""
+    comparators = []
+    p = 1
+    while p < n:
+        k = p
+        while k >= 1:
+            for j in range(k % p, n - k, 2 * k):
+                for i in range(min(k, n - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p):
+                        comparators.append((i + j, i + j + k))
+            k //= 2
+        p *= 2
+    return comparators
+
+
+@lru_cache(maxsize=32)
+def _median_selection_network(num_inputs: int) -> tuple[tuple[tuple[int, int, bool, bool], ...], int]:
+    r"""Build a selection network returning the lower median of ``num_inputs`` values.
+
+    A Batcher sorting network is padded to the next power of two with :math:`+\infty` wires, which are resolved
+    symbolically, and pruned from the comparators which do not contribute to the median wire.
+
+    Returns:
+        the comparators as ``(i, j, need_min, need_max)`` tuples, which write ``min`` to wire ``i`` and ``max`` to
+        wire ``j``, and the output wire.
+
+    """
+    n = 1
+    while n < num_inputs:
+        n *= 2
+    output = (num_inputs - 1) // 2
+    # resolve the +inf padding wires symbolically: the comparators touching them are either no-ops or moves.
+    # ``slot`` maps every wire position to the input slot currently holding its value.
+    slot = list(range(num_inputs)) + [-1] * (n - num_inputs)
+    network = []
+    for i, j in _batcher_comparators(n):
+        if slot[j] == -1:
+            continue
+        if slot[i] == -1:
+            slot[i], slot[j] = slot[j], -1
+            continue
+        network.append((slot[i], slot[j]))
+    output_slot = slot[output]
+    # backward pruning
+    needed = {output_slot}
+    pruned = []
+    for i, j in reversed(network):
+        need_min, need_max = i in needed, j in needed
+        if not (need_min or need_max):
+            continue
+        pruned.append((i, j, need_min, need_max))
+        needed.update((i, j))
+    return tuple(reversed(pruned)), output_slot
+
+
+def _median_unfold(padded: Tensor, ky: int, kx: int) -> Tensor:
+    """Median of the windows by materializing them with a binary kernel convolution."""
+    b, c, hp, wp = padded.shape
+    kernel: Tensor = get_binary_kernel2d((ky, kx), device=padded.device, dtype=padded.dtype)
+    features: Tensor = F.conv2d(padded.reshape(b * c, 1, hp, wp), kernel, stride=1)
+    features = features.view(b, c, ky * kx, hp - ky + 1, wp - kx + 1)  # BxCx(K_h * K_w)xHxW
+    return features.median(dim=2)[0]
+
+
+def _median_sorting_network(padded: Tensor, ky: int, kx: int) -> Tensor:
+    """Median of the windows with a min/max selection network over shifted views of the input."""
+    h, w = padded.shape[-2] - ky + 1, padded.shape[-1] - kx + 1
+    network, output = _median_selection_network(ky * kx)
+    wires = [padded[..., dy : dy + h, dx : dx + w] for dy in range(ky) for dx in range(kx)]
+    for i, j, need_min, need_max in network:
+        a, b = wires[i], wires[j]
+        if need_min:
+            wires[i] = torch.minimum(a, b)
+        if need_max:
+            wires[j] = torch.maximum(a, b)
+    return wires[output].contiguous()
+
+
+def _box_sum(x: Tensor, ky: int, kx: int) -> Tensor:
+    """Sum over the ``ky x kx`` windows of an already padded tensor, in constant time per pixel."""
+    integral = F.pad(x.cumsum(-2).cumsum(-1), (1, 0, 1, 0))
+    h, w = x.shape[-2] - ky + 1, x.shape[-1] - kx + 1
+    return (
+        integral[..., ky : ky + h, kx : kx + w]
+        - integral[..., :h, kx : kx + w]
+        - integral[..., ky : ky + h, :w]
+        + integral[..., :h, :w]
+    )
+
+
+def _median_histogram(padded: Tensor, ky: int, kx: int) -> Tensor:
+    r"""Median of the windows of an ``uint8`` tensor from its cumulative window histogram.
+
+    For every gray level :math:`t`, the number of window values :math:`\leq t` is a box sum of a binary image,
+    computed in constant time per pixel with an integral image. The median is the number of levels for which
+    this count is not larger than the median rank, so the cost does not depend on the kernel size, but every call
+    makes 255 passes over the image.
+    """
+    rank = (ky * kx - 1) // 2
+    h, w = padded.shape[-2] - ky + 1, padded.shape[-1] - kx + 1
+    out = torch.zeros(*padded.shape[:-2], h, w, device=padded.device, dtype=torch.int32)
+    for t in range(255):
+        count = _box_sum((padded <= t).to(torch.int32), ky, kx)
+        out += (count <= rank).to(torch.int32)
+    return out.to(padded.dtype)
+
+
+def _median_tiled(
+    padded: Tensor, ky: int, kx: int, engine: str, memory_budget: int | None, bytes_per_pixel: int
+) -> Tensor:
+    """Run a median engine on horizontal tiles of the output so that the temporaries fit the memory budget."""
+    fn = {"unfold": _median_unfold, "sorting_network": _median_sorting_network, "histogram": _median_histogram}[engine]
+    b, c, hp, wp = padded.shape
+    h, w = hp - ky + 1, wp - kx + 1
+    rows = h if memory_budget is None else max(1, memory_budget // max(1, b * c * w * bytes_per_pixel))
+    if rows >= h:
+        return fn(padded, ky, kx)
+    out = torch.empty(b, c, h, w, device=padded.device, dtype=padded.dtype)
+    for r0 in range(0, h, rows):
+        r1 = min(h, r0 + rows)
+        out[:, :, r0:r1] = fn(padded[:, :, r0 : r1 + ky - 1], ky, kx)
+    return out
+
+
+def median_blur(
+    input: Tensor, kernel_size: tuple[int, int] | int, engine: str = "auto", memory_budget: int | None = None
+) -> Tensor:
     r"""Blur an image using the median filter.
 
     .. image:: _static/img/median_blur.png
 
+    The image is zero padded, and for an even number of window elements the lower median is returned.
+    Several engines are available:
+
+    - ``"unfold"``: materializes the :math:`K_h \cdot K_w` window values of every pixel and computes their median.
+    - ``"sorting_network"``: selects the median with a network of element-wise min/max over shifted views of the
+      image. Well suited for small kernels such as 3x3 and 5x5.
+    - ``"histogram"``: for ``uint8`` images only, counts the window values below every gray level with integral
+      images, one pass over the image per gray level. The cost does not depend on the kernel size, so it only
+      pays off for very large kernels.
+    - ``"auto"``: ``"sorting_network"`` for kernels up to 5x5 and ``"unfold"`` otherwise, with a default memory
+      budget of 1 GiB. ``uint8`` images, which ``"unfold"`` does not support, use ``"sorting_network"`` for
+      windows smaller than 21x21 and ``"histogram"`` otherwise.
+
+    Every engine processes the image in horizontal tiles when its temporaries exceed ``memory_budget``.
+
     Args:
         input: the input image with shape :math:`(B,C,H,W)`.
         kernel_size: the blurring kernel size.
+        engine: the median engine, one of ``"auto"``, ``"unfold"``, ``"sorting_network"`` or ``"histogram"``.
+        memory_budget: approximate maximum size, in bytes, of the temporary tensors. No tiling if ``None``,
+          except for the ``"auto"`` engine.
 
     Returns:
         the blurred input tensor with shape :math:`(B,C,H,W)`.
@@ -56,19 +211,35 @@ def median_blur(input: Tensor, kernel_size: tuple[int, int] | int) -> Tensor:
     """
     KORNIA_CHECK_IS_TENSOR(input)
     KORNIA_CHECK_SHAPE(input, ["B", "C", "H", "W"])
+    KORNIA_CHECK(
+        engine in ("auto", "unfold", "sorting_network", "histogram"),
+        f"engine must be one of 'auto', 'unfold', 'sorting_network' or 'histogram'. Got: {engine}",
+    )
 
-    padding = _compute_zero_padding(kernel_size)
-
-    # prepare kernel
-    kernel: Tensor = get_binary_kernel2d(kernel_size, device=input.device, dtype=input.dtype)
-    b, c, h, w = input.shape
+    ky, kx = _unpack_2d_ks(kernel_size)
+    if engine == "auto":
+        if input.dtype == torch.uint8:
+            engine = "histogram" if ky * kx >= _MEDIAN_HISTOGRAM_MIN_WINDOW else "sorting_network"
+        elif ky * kx <= 25:
+            engine = "sorting_network"
+        else:
+            engine = "unfold"
+        if memory_budget is None:
+            memory_budget = _MEDIAN_MEMORY_BUDGET
+    if engine == "histogram":
+        KORNIA_CHECK(input.dtype == torch.uint8, f"The histogram engine expects an uint8 input. Got: {input.dtype}")
 
-    # map the local window to single vector
-    features: Tensor = F.conv2d(input.reshape(b * c, 1, h, w), kernel, padding=padding, stride=1)
-    features = features.view(b, c, -1, h, w)  # BxCx(K_h * K_w)xHxW
+    py, px = _compute_zero_padding((ky, kx))
+    padded = F.pad(input, (px, px, py, py))
 
-    # compute the median along the feature axis
-    return features.median(dim=2)[0]
+    # approximate temporaries per output pixel, in bytes
+    if engine == "unfold":
+        bytes_per_pixel = 2 * ky * kx * input.element_size()
+    elif engine == "sorting_network":
+        bytes_per_pixel = ky * kx * input.element_size()
+    else:
+        bytes_per_pixel = 4 * 4
+    return _median_tiled(padded, ky, kx, engine, memory_budget, bytes_per_pixel)
 
 
 class MedianBlur(Module):
@@ -76,6 +247,8 @@ class MedianBlur(Module):
 
     Args:
         kernel_size: the blurring kernel size.
+        engine: the median engine, see :func:`median_blur`.
+        memory_budget: approximate maximum size, in bytes, of the temporary tensors, see :func:`median_blur`.
 
     Returns:
         the blurred input tensor.
@@ -93,9 +266,13 @@ class MedianBlur(Module):
 
     """
 
-    def __init__(self, kernel_size: tuple[int, int] | int) -> None:
+    def __init__(
+        self, kernel_size: tuple[int, int] | int, engine: str = "auto", memory_budget: int | None = None
+    ) -> None:
         super().__init__()
         self.kernel_size = kernel_size
+        self.engine = engine
+        self.memory_budget = memory_budget
 
     def forward(self, input: Tensor) -> Tensor:
-        return median_blur(input, self.kernel_size)
+        return median_blur(input, self.kernel_size, self.engine, self.memory_budget)
@@ -27,6 +27,7 @@ from kornia.core import arange, ones_like, stack, where, zeros
 from .linalg import transform_points
 
 __all__ = [
+    "batched_nms",
     "bbox_generator",
     "bbox_generator3d",
     "bbox_to_mask",
@@ -190,6 +191,84 @@ def infer_bbox_shape3d(boxes: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor,
     return depths, heights, widths
 
 
+def _rasterize_boxes(
+    lower: torch.Tensor,
+    upper: torch.Tensor,
+    size: tuple[int, ...],
+    mode: str = "dense",
+    dtype: torch.dtype = torch.float32,
+) -> torch.Tensor:
+    """Rasterize axis-aligned boxes given by their integer half-open extents ``[lower, upper)`` on every axis.
+
+    Args:
+        lower: the first covered index of the boxes along every axis with shape :math:`(*, N, D)`.
+        upper: the index past the last covered index along every axis with shape :math:`(*, N, D)`.
+        size: the size of the :math:`D` axes of the masks.
+        mode: ``"dense"`` for a mask per box with shape :math:`(*, N, *size)`, ``"sparse"`` for the same masks as
+            a sparse COO tensor, or ``"union"`` for the union of the boxes with shape :math:`(*, *size)`.
+        dtype: the dtype of the masks.
+
+    Returns:
+        the masks, where the covered area is 1 and the remaining is 0.
+
+    """
+    num_dims = len(size)
+    lower = lower.long().clamp(min=0)
+    upper = torch.max(upper.long(), lower)
+    lower = torch.min(lower, torch.tensor(size, device=lower.device))
+    upper = torch.min(upper, torch.tensor(size, device=upper.device))
+    batch_shape = lower.shape[:-1]
+
+    if mode == "dense":
+        # broadcasted comparisons of every axis against its range
+        mask = torch.ones(1, dtype=dtype, device=lower.device)
+        for d, length in enumerate(size):
+            coords = arange(length, device=lower.device)
+            inside = (coords >= lower[..., d, None]) & (coords < upper[..., d, None])
+            mask = mask[..., None] * inside.to(dtype).view(*batch_shape, *([1] * d), length)
+        return mask
+
+    if mode == "union":
+        # difference array: +-1 on the corners of every box, integrated along every axis
+        num_groups = batch_shape[:-1].numel()
+        grid_size = [length + 1 for length in size]
+        grid = zeros((num_groups, *grid_size), dtype=torch.int32, device=lower.device).flatten(1)
+        lower_flat, upper_flat = lower.reshape(num_groups, -1, num_dims), upper.reshape(num_groups, -1, num_dims)
+        for corner in range(2**num_dims):
+            index = torch.zeros_like(lower_flat[..., 0])
+            sign = 1
+            for d in range(num_dims):
+                use_upper = (corner >> (num_dims - 1 - d)) & 1
+                index = index * grid_size[d] + (upper_flat if use_upper else lower_flat)[..., d]
+                sign = -sign if use_upper else sign
+            grid.scatter_add_(1, index, torch.full_like(index, sign, dtype=torch.int32))
+        grid = grid.view(num_groups, *grid_size)
+        for d in range(num_dims):
+            grid = grid.cumsum(d + 1)
+        union = grid[(slice(None), *(slice(0, length) for length in size))] > 0
+        return union.reshape(*batch_shape[:-1], *size).to(dtype)
+
+    if mode == "sparse":
+        # enumerate the covered elements of every box, without any dense allocation
+        extents = (upper - lower).reshape(-1, num_dims)
+        counts = extents.prod(-1)
+        box_idx = torch.repeat_interleave(arange(len(counts), device=lower.device), counts)
+        offset = arange(len(box_idx), device=lower.device) - (counts.cumsum(0) - counts)[box_idx]
+        coords = []
+        for d in reversed(range(num_dims)):
+            extent = extents[box_idx, d]
+            coords.append(offset % extent.clamp(min=1) + lower.reshape(-1, num_dims)[box_idx, d])
+            offset = offset // extent.clamp(min=1)
+        for length in reversed(batch_shape):
+            coords.append(box_idx % length)
+            box_idx = box_idx // length
+        indices = stack(coords[::-1])
+        values = torch.ones(indices.shape[1], dtype=dtype, device=lower.device)
+        return torch.sparse_coo_tensor(indices, values, (*batch_shape, *size)).coalesce()
+
+    raise ValueError(f"mode must be one of 'dense', 'sparse' or 'union'. Got: {mode}.")
+
+
 def bbox_to_mask(boxes: torch.Tensor, width: int, height: int) -> torch.Tensor:
     """Convert 2D bounding boxes to masks. Covered area is 1. and the remaining is 0.
 
@@ -222,15 +301,10 @@ def bbox_to_mask(boxes: torch.Tensor, width: int, height: int) -> torch.Tensor:
 
     """
     validate_bbox(boxes)
-    # zero padding the surroundings
-    mask = zeros((len(boxes), height + 2, width + 2), dtype=boxes.dtype, device=boxes.device)
-    # push all points one pixel off
-    # in order to zero-out the fully filled rows or columns
-    box_i = (boxes + 1).long()
-    # set all pixels within box to 1
-    for msk, bx in zip(mask, box_i):
-        msk[bx[0, 1] : bx[2, 1] + 1, bx[0, 0] : bx[1, 0] + 1] = 1.0
-    return mask[:, 1:-1, 1:-1]
+    # the boxes include their last row and column
+    lower = stack([boxes[:, 0, 1], boxes[:, 0, 0]], -1).floor()
+    upper = stack([boxes[:, 2, 1], boxes[:, 1, 0]], -1).floor() + 1
+    return _rasterize_boxes(lower[:, None], upper[:, None], (height, width), dtype=boxes.dtype)[:, 0]
 
 
 def bbox_to_mask3d(boxes: torch.Tensor, size: tuple[int, int, int]) -> torch.Tensor:
@@ -284,34 +358,13 @@ def bbox_to_mask3d(boxes: torch.Tensor, size: tuple[int, int, int]) -> torch.Ten
 
     """
     validate_bbox3d(boxes)
-    mask = zeros((len(boxes), *size))
-
-    mask_out = []
-    # TODO: Looking for a vectorized way
-    for m, box in zip(mask, boxes):
-        m = m.index_fill(
-            0,
-            arange(box[0, 2].item(), box[4, 2].item() + 1, device=box.device, dtype=torch.long),
-            torch.tensor(1, device=box.device, dtype=box.dtype),
-        )
-        m = m.index_fill(
-            1,
-            arange(box[1, 1].item(), box[2, 1].item() + 1, device=box.device, dtype=torch.long),
-            torch.tensor(1, device=box.device, dtype=box.dtype),
-        )
-        m = m.index_fill(
-            2,
-            arange(box[0, 0].item(), box[1, 0].item() + 1, device=box.device, dtype=torch.long),
-            torch.tensor(1, device=box.device, dtype=box.dtype),
-        )
-        m = m.unsqueeze(dim=0)
-        m_out = ones_like(m)
-        m_out = m_out * (m == 1).all(dim=2, keepdim=True).all(dim=1, keepdim=True)
-        m_out = m_out * (m == 1).all(dim=3, keepdim=True).all(dim=1, keepdim=True)
-        m_out = m_out * (m == 1).all(dim=2, keepdim=True).all(dim=3, keepdim=True)
-        mask_out.append(m_out)
-
-    return stack(mask_out, dim=0).float()
+    # the boxes include their last slice, row and column
+    lower = stack([boxes[:, 0, 2], boxes[:, 1, 1], boxes[:, 0, 0]], -1)
+    upper = stack([boxes[:, 4, 2], boxes[:, 2, 1], boxes[:, 1, 0]], -1) + 1
+    # same integer ranges as ``arange(lower, upper)`` for non-integer coordinates
+    lower_idx = lower.long()
+    upper_idx = lower_idx + (upper - lower).ceil().long()
+    return _rasterize_boxes(lower_idx[:, None], upper_idx[:, None], size)
 
 
 def bbox_generator(
@@ -528,9 +581,217 @@ def transform_bbox(
     return transformed_boxes
 
 
+def _pairwise_iou(boxes1: torch.Tensor, boxes2: torch.Tensor) -> torch.Tensor:
+    """Compute the IoU between the boxes :math:`(B, N, 4)` and :math:`(B, M, 4)` in the xyxy format."""
+    x11, y11, x12, y12 = (c[..., :, None] for c in boxes1.unbind(-1))
+    x21, y21, x22, y22 = (c[..., None, :] for c in boxes2.unbind(-1))
+    area1 = (x12 - x11) * (y12 - y11)
+    area2 = (x22 - x21) * (y22 - y21)
+    inter = (torch.min(x12, x22) - torch.max(x11, x21)).clamp(min=0.0) * (
+        torch.min(y12, y22) - torch.max(y11, y21)
+    ).clamp(min=0.0)
+    return inter / (area1 + area2 - inter)
+
+
+_NMS_CHECK_EVERY = 4
+
+
+def _suppression_matrix(
+    boxes1: torch.Tensor,
+    boxes2: torch.Tensor,
+    iou_threshold: float,
+    idxs1: torch.Tensor | None,
+    idxs2: torch.Tensor | None,
+) -> torch.Tensor:
+    """Return whether the boxes2 suppress the boxes1, as a :math:`(B, N, M)` boolean tensor."""
+    # NOTE: written as a negation so that the undefined IoU of degenerated boxes suppresses, as in the greedy loop
+    suppress = ~(_pairwise_iou(boxes1, boxes2) <= iou_threshold)
+    if idxs1 is not None and idxs2 is not None:
+        suppress = suppress & (idxs1[..., :, None] == idxs2[..., None, :])
+    return suppress
+
+
+def _nms_keep_mask(
+    boxes: torch.Tensor,
+    iou_threshold: float,
+    idxs: torch.Tensor | None = None,
+    valid: torch.Tensor | None = None,
+    top_k: int | None = None,
+    block_size: int = 256,
+) -> torch.Tensor:
+    r"""Compute the greedy NMS keep mask of boxes :math:`(B, N, 4)` already sorted by decreasing score.
+
+    The boxes are processed in blocks. Every block is first suppressed by the boxes kept in the previous blocks,
+    and the greedy suppression inside the block is solved as the fixed point of
+    :math:`k_i = c_i \wedge \neg \exists j < i, k_j \wedge s_{ji}`, whose solution is unique and reached in at
+    most ``block_size`` iterations, usually a few. The convergence is checked every ``_NMS_CHECK_EVERY`` iterations.
+    """
+    batch_size, num_boxes = boxes.shape[:2]
+    keep = torch.zeros(batch_size, num_boxes, dtype=torch.bool, device=boxes.device)
+    if valid is None:
+        valid = torch.ones_like(keep)
+    for start in range(0, num_boxes, block_size):
+        end = min(num_boxes, start + block_size)
+        block = boxes[:, start:end]
+        idxs_block = idxs[:, start:end] if idxs is not None else None
+        candidates = valid[:, start:end]
+        if start > 0:
+            idxs_prev = idxs[:, :start] if idxs is not None else None
+            suppress = _suppression_matrix(block, boxes[:, :start], iou_threshold, idxs_block, idxs_prev)
+            candidates = candidates & ~(suppress & keep[:, None, :start]).any(-1)
+        suppress = _suppression_matrix(block, block, iou_threshold, idxs_block, idxs_block)
+        suppress = suppress & torch.ones_like(suppress[0]).tril(-1)
+        keep_block = candidates
+        for step in range(end - start):
+            keep_next = candidates & ~(suppress & keep_block[:, None, :]).any(-1)
+            # NOTE: the iterations past the fixed point are no-ops, so only a few of them synchronize with the host
+            if (step + 1) % _NMS_CHECK_EVERY == 0 and torch.equal(keep_next, keep_block):
+                break
+            keep_block = keep_next
+        keep[:, start:end] = keep_block
+        if top_k is not None and end < num_boxes and bool((keep.sum(-1) >= top_k).all()):
+            break
+    return keep
+
+
+def _soft_nms(
+    boxes: torch.Tensor,
+    scores: torch.Tensor,
+    sigma: float,
+    score_threshold: float,
+    num_steps: int,
+    idxs: torch.Tensor | None = None,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    r"""Gaussian soft-NMS of boxes :math:`(B, N, 4)`, where the invalid boxes have a score of :math:`-\infty`."""
+    batch_size = boxes.shape[0]
+    batch_idx = arange(batch_size, device=boxes.device)
+    keep = torch.full((batch_size, num_steps), -1, dtype=torch.long, device=boxes.device)
+    kept_scores = torch.zeros(batch_size, num_steps, dtype=scores.dtype, device=scores.device)
+    scores = scores.clone()
+    for step in range(num_steps):
+        best_score, best = scores.max(-1)
+        found = best_score > score_threshold
+        # NOTE: the scores only decay, so an image without any box left keeps none and the steps past the last box
+        # are no-ops. Only a few of them synchronize with the host.
+        if step % _NMS_CHECK_EVERY == 0 and not bool(found.any()):
+            break
+        keep[:, step] = where(found, best, -1)
+        kept_scores[:, step] = where(found, best_score, zeros(1, dtype=scores.dtype, device=scores.device))
+        iou = _pairwise_iou(boxes[batch_idx, best][:, None], boxes)[:, 0]
+        decay = torch.exp(-(iou**2) / sigma)
+        if idxs is not None:
+            decay = where(idxs == idxs[batch_idx, best][:, None], decay, ones_like(decay))
+        alive = ~torch.isneginf(scores)
+        alive[batch_idx, best] = False
+        # NOTE: an infinite score fully decayed is undefined, it drops to zero
+        decayed = (scores * decay).nan_to_num(0.0, float("inf"), -float("inf"))
+        scores = where(alive, decayed, torch.full_like(scores, -float("inf")))
+    return keep, kept_scores
+
+
+def batched_nms(
+    boxes: torch.Tensor,
+    scores: torch.Tensor,
+    iou_threshold: float,
+    idxs: torch.Tensor | None = None,
+    num_valid: torch.Tensor | None = None,
+    top_k: int | None = None,
+    soft_nms_sigma: float | None = None,
+    score_threshold: float = 0.0,
+    block_size: int = 256,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    r"""Perform non-maxima suppression (NMS) on a batch of sets of bounding boxes.
+
+    All the images are processed at once. The hard NMS gives the same result as :func:`nms` for every image:
+    the boxes are visited by decreasing score in blocks of ``block_size``, and the suppression is computed with
+    pairwise IoU matrices instead of one box at a time.
+
+    With ``soft_nms_sigma``, the Gaussian soft-NMS is applied instead: the scores of the boxes overlapping a
+    selected box are decayed by :math:`\exp(-\text{IoU}^2 / \sigma)`, and the boxes whose score drops below
+    ``score_threshold`` are discarded.
+
+    Args:
+        boxes: tensor containing the encoded bounding boxes with the shape :math:`(B, N, (x_1, y_1, x_2, y_2))`
+          or :math:`(N, 4)`.
+        scores: tensor containing the scores associated to each bounding box with shape :math:`(B, N)` or
+          :math:`(N,)`. The boxes with a NaN score are ignored.
+        iou_threshold: the threshold to discard the overlapping boxes. Ignored by the soft-NMS.
+        idxs: the class of each box with shape :math:`(B, N)` or :math:`(N,)`. If given, the boxes only suppress
+          the boxes of the same class.
+        num_valid: the number of valid boxes of each image with shape :math:`(B,)`. The boxes past this number
+          are ignored.
+        top_k: the maximum number of boxes to keep per image.
+        soft_nms_sigma: the :math:`\sigma` of the Gaussian soft-NMS. If ``None``, the hard NMS is applied.
+        score_threshold: the minimum score of the boxes kept by the soft-NMS.
+        block_size: the number of boxes processed at once by the hard NMS.
+
+    Return:
+        - The indices of the kept boxes sorted by decreasing score with shape :math:`(B, K)` or :math:`(K,)`,
+          padded with ``-1``, where :math:`K` is ``top_k`` if given or :math:`N` otherwise.
+        - The scores of the kept boxes, decayed by the soft-NMS, padded with zeros.
+
+    Example:
+        >>> boxes = torch.tensor([[
+        ...     [10., 10., 20., 20.],
+        ...     [15., 5., 15., 25.],
+        ...     [100., 100., 200., 200.],
+        ...     [100., 100., 200., 200.]]])
+        >>> scores = torch.tensor([[0.9, 0.8, 0.7, 0.9]])
+        >>> batched_nms(boxes, scores, iou_threshold=0.8)[0]
+        tensor([[ 0,  3,  1, -1]])
+
+    """
+    if len(boxes.shape) not in (2, 3) or boxes.shape[-1] != 4:
+        raise ValueError(f"boxes expected as BxNx4 or Nx4. Got: {boxes.shape}.")
+
+    if scores.shape != boxes.shape[:-1]:
+        raise ValueError(f"boxes and scores must have compatible shapes. Got: {boxes.shape, scores.shape}.")
+
+    if idxs is not None and idxs.shape != scores.shape:
+        raise ValueError(f"idxs and scores must have same shape. Got: {idxs.shape, scores.shape}.")
+
+    is_batched = len(boxes.shape) == 3
+    if not is_batched:
+        boxes, scores = boxes[None], scores[None]
+        idxs = idxs[None] if idxs is not None else None
+
+    batch_size, num_boxes = scores.shape
+    num_out = num_boxes if top_k is None else min(top_k, num_boxes)
+
+    valid = ~torch.isnan(scores)
+    if num_valid is not None:
+        if num_valid.shape != (batch_size,):
+            raise ValueError(f"num_valid expected as B. Got: {num_valid.shape}.")
+        valid = valid & (arange(num_boxes, device=boxes.device)[None] < num_valid.to(boxes.device)[:, None])
+    scores = where(valid, scores, torch.full_like(scores, -float("inf")))
+
+    if soft_nms_sigma is not None:
+        keep, kept_scores = _soft_nms(boxes, scores, soft_nms_sigma, score_threshold, num_out, idxs)
+    else:
+        order = torch.sort(scores, dim=-1, descending=True, stable=True)[1]
+        boxes_sorted = boxes.gather(1, order[..., None].expand(-1, -1, 4))
+        idxs_sorted = idxs.gather(1, order) if idxs is not None else None
+        keep_mask = _nms_keep_mask(
+            boxes_sorted, iou_threshold, idxs_sorted, valid.gather(1, order), num_out, block_size
+        )
+        # move the kept boxes to the front, preserving their order
+        position = torch.sort((~keep_mask).to(torch.uint8), dim=-1, stable=True)[1][:, :num_out]
+        is_kept = keep_mask.gather(1, position)
+        keep = where(is_kept, order.gather(1, position), torch.full_like(position, -1))
+        kept_scores = where(
+            is_kept, scores.gather(1, keep.clamp(min=0)), zeros(1, dtype=scores.dtype, device=scores.device)
+        )
+
+    if not is_batched:
+        return keep[0], kept_scores[0]
+    return keep, kept_scores
+
+
 def nms(boxes: torch.Tensor, scores: torch.Tensor, iou_threshold: float) -> torch.Tensor:
     """Perform non-maxima suppression (NMS) on tensor of bounding boxes according to the intersection-over-union (IoU).
 
+    See :func:`batched_nms` to process several images at once, and for the class-aware and soft variants.
+
     Args:
         boxes: tensor containing the encoded bounding boxes with the shape :math:`(N, (x_1, y_1, x_2, y_2))`.
         scores: tensor containing the scores associated to each bounding box with shape :math:`(N,)`.
@@ -559,29 +820,5 @@ def nms(boxes: torch.Tensor, scores: torch.Tensor, iou_threshold: float) -> torc
     if boxes.shape[0] != scores.shape[0]:
         raise ValueError(f"boxes and scores mus have same shape. Got: {boxes.shape, scores.shape}.")
 
-    x1, y1, x2, y2 = boxes.unbind(-1)
-    areas = (x2 - x1) * (y2 - y1)
-
-    _, order = scores.sort(descending=True)
-
-    keep = []
-    while order.shape[0] > 0:
-        i = order[0]
-        keep.append(i)
-        xx1 = torch.max(x1[i], x1[order[1:]])
-        yy1 = torch.max(y1[i], y1[order[1:]])
-        xx2 = torch.min(x2[i], x2[order[1:]])
-        yy2 = torch.min(y2[i], y2[order[1:]])
-
-        w = torch.clamp(xx2 - xx1, min=0.0)
-        h = torch.clamp(yy2 - yy1, min=0.0)
-        inter = w * h
-        ovr = inter / (areas[i] + areas[order[1:]] - inter)
-
-        inds = where(ovr <= iou_threshold)[0]
-        order = order[inds + 1]
-
-    if len(keep) > 0:
-        return stack(keep)
-
-    return torch.tensor(keep)
+    keep, _ = batched_nms(boxes, scores, iou_threshold)
+    return keep[keep >= 0]
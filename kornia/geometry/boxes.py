@@ -23,7 +23,7 @@ import torch
 from torch import Size
 
 from kornia.core import Tensor, stack, zeros
-from kornia.geometry.bbox import validate_bbox
+from kornia.geometry.bbox import _rasterize_boxes, validate_bbox
 from kornia.geometry.linalg import transform_points
 from kornia.utils import eye_like
 
@@ -555,15 +555,19 @@ class Boxes:
             boxes = boxes if self._is_batched else boxes.squeeze(0)
         return boxes
 
-    def to_mask(self, height: int, width: int) -> torch.Tensor:
+    def to_mask(self, height: int, width: int, mode: str = "dense") -> torch.Tensor:
         """Convert 2D boxes to masks. Covered area is 1 and the remaining is 0.
 
         Args:
             height: height of the masked image/images.
             width: width of the masked image/images.
+            mode: ``"dense"`` for a mask per box, ``"sparse"`` for the same masks as a sparse COO tensor, or
+                ``"union"`` for a single mask per image covering all the boxes. The ``"sparse"`` and ``"union"``
+                modes do not allocate a dense mask per box.
 
         Returns:
-            the output mask tensor, shape of :math:`(N, width, height)` or :math:`(B,N, width, height)` and dtype of
+            the output mask tensor, shape of :math:`(N, height, width)` or :math:`(B,N, height, width)`, or
+            :math:`(height, width)` or :math:`(B, height, width)` for the ``"union"`` mode, and dtype of
             :func:`Boxes.dtype` (it can be any floating point dtype).
 
         Note:
@@ -589,25 +593,12 @@ class Boxes:
                 "Boxes.to_tensor isn't differentiable. Please, create boxes from tensors with `requires_grad=False`."
             )
 
-        if self._is_batched:  # (B, N, 4, 2)
-            mask = torch.zeros(
-                (self._data.shape[0], self._data.shape[1], height, width), dtype=self.dtype, device=self.device
-            )
-        else:  # (N, 4, 2)
-            mask = zeros((self._data.shape[0], height, width), dtype=self.dtype, device=self.device)
-
-        # Boxes coordinates can be outside the image size after transforms. Clamp values to the image size
-        clipped_boxes_xyxy = cast(torch.Tensor, self.to_tensor("xyxy", as_padded_sequence=True))
-        clipped_boxes_xyxy[..., ::2].clamp_(0, width)
-        clipped_boxes_xyxy[..., 1::2].clamp_(0, height)
-
-        # Reshape mask to (BxN, H, W) and boxes to (BxN, 4) to iterate over all of them.
+        # Boxes coordinates can be outside the image size after transforms. They are clamped to the image size.
         # Cast boxes coordinates to be integer to use them as indexes. Use round to handle decimal values.
-        for mask_channel, box_xyxy in zip(mask.view(-1, height, width), clipped_boxes_xyxy.view(-1, 4).round().int()):
-            # Mask channel dimensions: (height, width)
-            mask_channel[box_xyxy[1] : box_xyxy[3], box_xyxy[0] : box_xyxy[2]] = 1
-
-        return mask
+        boxes_xyxy = cast(torch.Tensor, self.to_tensor("xyxy", as_padded_sequence=True)).round()
+        lower = boxes_xyxy[..., [1, 0]]
+        upper = boxes_xyxy[..., [3, 2]]
+        return _rasterize_boxes(lower, upper, (height, width), mode, self.dtype)
 
     def transform_boxes(self, M: torch.Tensor, inplace: bool = False) -> Boxes:
         r"""Apply a transformation matrix to the 2D boxes.
@@ -963,17 +954,21 @@ class Boxes3D:
         boxes = boxes if self._is_batched else boxes.squeeze(0)
         return boxes
 
-    def to_mask(self, depth: int, height: int, width: int) -> torch.Tensor:
-        """Convert ·D boxes to masks. Covered area is 1 and the remaining is 0.
+    def to_mask(self, depth: int, height: int, width: int, mode: str = "dense") -> torch.Tensor:
+        """Convert 3D boxes to masks. Covered area is 1 and the remaining is 0.
 
         Args:
             depth: depth of the masked image/images.
             height: height of the masked image/images.
             width: width of the masked image/images.
+            mode: ``"dense"`` for a mask per box, ``"sparse"`` for the same masks as a sparse COO tensor, or
+                ``"union"`` for a single mask per volume covering all the boxes. The ``"sparse"`` and ``"union"``
+                modes do not allocate a dense mask per box.
 
         Returns:
-            the output mask tensor, shape of :math:`(N, depth, width, height)` or :math:`(B,N, depth, width, height)`
-             and dtype of :func:`Boxes3D.dtype` (it can be any floating point dtype).
+            the output mask tensor, shape of :math:`(N, depth, height, width)` or :math:`(B,N, depth, height, width)`,
+            without the :math:`N` dimension for the ``"union"`` mode, and dtype of :func:`Boxes3D.dtype` (it can be
+            any floating point dtype).
 
         Note:
             It is currently non-differentiable.
@@ -1020,32 +1015,12 @@ class Boxes3D:
                 "Boxes.to_tensor isn't differentiable. Please, create boxes from tensors with `requires_grad=False`."
             )
 
-        if self._is_batched:  # (B, N, 8, 3)
-            mask = zeros(
-                (self._data.shape[0], self._data.shape[1], depth, height, width),
-                dtype=self._data.dtype,
-                device=self._data.device,
-            )
-        else:  # (N, 8, 3)
-            mask = zeros((self._data.shape[0], depth, height, width), dtype=self._data.dtype, device=self._data.device)
-
-        # Boxes coordinates can be outside the image size after transforms. Clamp values to the image size
-        clipped_boxes_xyzxyz = self.to_tensor("xyzxyz")
-        clipped_boxes_xyzxyz[..., ::3].clamp_(0, width)
-        clipped_boxes_xyzxyz[..., 1::3].clamp_(0, height)
-        clipped_boxes_xyzxyz[..., 2::3].clamp_(0, depth)
-
-        # Reshape mask to (BxN, D, H, W) and boxes to (BxN, 6) to iterate over all of them.
+        # Boxes coordinates can be outside the image size after transforms. They are clamped to the image size.
         # Cast boxes coordinates to be integer to use them as indexes. Use round to handle decimal values.
-        for mask_channel, box_xyzxyz in zip(
-            mask.view(-1, depth, height, width), clipped_boxes_xyzxyz.view(-1, 6).round().int()
-        ):
-            # Mask channel dimensions: (depth, height, width)
-            mask_channel[
-                box_xyzxyz[2] : box_xyzxyz[5], box_xyzxyz[1] : box_xyzxyz[4], box_xyzxyz[0] : box_xyzxyz[3]
-            ] = 1
-
-        return mask
+        boxes_xyzxyz = self.to_tensor("xyzxyz").round()
+        lower = boxes_xyzxyz[..., [2, 1, 0]]
+        upper = boxes_xyzxyz[..., [5, 4, 3]]
+        return _rasterize_boxes(lower, upper, (depth, height, width), mode, self._data.dtype)
 
     def transform_boxes(self, M: torch.Tensor, inplace: bool = False) -> Boxes3D:
         r"""Apply a transformation matrix to the 3D boxes.
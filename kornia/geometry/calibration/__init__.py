@@ -17,6 +17,13 @@
 
 from .distort import distort_points, tilt_projection
 from .pnp import solve_pnp_dlt
-from .undistort import undistort_image, undistort_points
+from .undistort import Undistorter, undistort_image, undistort_points
 
-__all__ = ["distort_points", "solve_pnp_dlt", "tilt_projection", "undistort_image", "undistort_points"]
+__all__ = [
+    "Undistorter",
+    "distort_points",
+    "solve_pnp_dlt",
+    "tilt_projection",
+    "undistort_image",
+    "undistort_points",
+]
@@ -17,12 +17,16 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import weakref
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
 
 import torch
+import torch.nn.functional as F
 
-from kornia.core import stack
-from kornia.core.check import KORNIA_CHECK_SHAPE
+from kornia.core import Module, stack
+from kornia.core.check import KORNIA_CHECK, KORNIA_CHECK_SHAPE
+from kornia.geometry.conversions import normalize_pixel_coordinates
 from kornia.geometry.linalg import transform_points
 from kornia.geometry.transform import remap
 from kornia.utils import create_meshgrid
@@ -185,16 +189,282 @@ def undistort_image(image: torch.Tensor, K: torch.Tensor, dist: torch.Tensor) ->
     channels, rows, cols = image.shape[-3:]
     B = image.numel() // (channels * rows * cols)
 
-    # Create point coordinates for each pixel of the image
-    xy_grid: torch.Tensor = create_meshgrid(rows, cols, False, image.device, image.dtype)
-    pts = xy_grid.reshape(-1, 2)  # (rows*cols)x2 matrix of pixel coordinates
-
-    # Distort points and define maps
-    ptsd: torch.Tensor = distort_points(pts, K, dist)  # Bx(rows*cols)x2
-    mapx: torch.Tensor = ptsd[..., 0].reshape(B, rows, cols)  # B x rows x cols, float
-    mapy: torch.Tensor = ptsd[..., 1].reshape(B, rows, cols)  # B x rows x cols, float
+    # Distort the pixel coordinates and define the maps
+    mapx, mapy = _undistort_maps(K, dist, (rows, cols), None, image.device, image.dtype)  # B x rows x cols, float
+    mapx, mapy = mapx.reshape(B, rows, cols), mapy.reshape(B, rows, cols)
 
     # Remap image to undistort
     out = remap(image.reshape(B, channels, rows, cols), mapx, mapy, align_corners=True)
 
     return out.view_as(image)
+
+
+def _undistort_maps(
+    K: torch.Tensor,
+    dist: torch.Tensor,
+    image_size: tuple[int, int],
+    new_K: torch.Tensor | None,
+    device: torch.device,
+    dtype: torch.dtype,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Compute the pixel coordinates of the distorted image sampled by each pixel of the undistorted one.
+
+    Returns:
+        the x and y maps with shape :math:`(*, H, W)`.
+
+    """
+    rows, cols = image_size
+    # Create point coordinates for each pixel of the image
+    xy_grid: torch.Tensor = create_meshgrid(rows, cols, False, device, dtype)
+    pts = xy_grid.reshape(-1, 2)  # (rows*cols)x2 matrix of pixel coordinates
+
+    ptsd: torch.Tensor = distort_points(pts, K.to(device, dtype), dist.to(device, dtype), new_K)  # *x(rows*cols)x2
+    mapx: torch.Tensor = ptsd[..., 0].reshape(*ptsd.shape[:-2], rows, cols)
+    mapy: torch.Tensor = ptsd[..., 1].reshape(*ptsd.shape[:-2], rows, cols)
+    return mapx, mapy
+
+
+# number of fractional bits of the fixed-point maps, as the interpolation tables of OpenCV
+_FIXED_POINT_BITS: int = 5
+
+
+class Undistorter(Module):
+    r"""Compensate images for lens distortion, caching the sampling grids of the calibrations.
+
+    The sampling grid of a calibration, i.e. the distorted pixel coordinates sampled by each pixel of the
+    undistorted image, is computed once for each calibration, image size, device and dtype. It is then kept in a
+    cache with least recently used eviction, so that undistorting the frames of a camera with fixed calibration
+    costs a single :func:`torch.nn.functional.grid_sample`.
+
+    The values of the calibration tensors are never read to look up the cache, which would synchronize with the
+    device at every frame. A calibration is identified either by an explicit hashable ``key`` given by the caller,
+    or by its :math:`(K, dist, new_K)` tensor objects: passing the same tensors again, not modified in place in
+    the meantime, hits the cache, while new tensors, even with equal values, e.g. a new slice ``K[:1]``, compute a
+    new grid.
+
+    The grids can be stored to disk with :meth:`save` and loaded with :meth:`load`. They are stored as the offsets
+    from the identity map, in pixels, either in half precision or in 16 bits fixed point with 1/32 pixel
+    resolution.
+
+    Args:
+        cache_size: maximum number of sampling grids kept in the cache.
+        mode: interpolation mode, ``'bilinear'`` or ``'nearest'``.
+
+    Example:
+        >>> img = torch.rand(1, 3, 5, 5)
+        >>> K = torch.eye(3)[None]
+        >>> dist_coeff = torch.rand(1, 4)
+        >>> undistorter = Undistorter()
+        >>> out = undistorter(img, K, dist_coeff)
+        >>> torch.allclose(out, undistort_image(img, K, dist_coeff))
+        True
+
+    """
+
+    def __init__(self, cache_size: int = 8, mode: str = "bilinear") -> None:
+        super().__init__()
+        KORNIA_CHECK(cache_size >= 1, f"cache_size must be a positive integer. Got: {cache_size}")
+        self.cache_size = cache_size
+        self.mode = mode
+        # the grids, with weak references to the calibration tensors they were computed from
+        self._cache: OrderedDict[tuple[Any, ...], tuple[torch.Tensor, tuple[Any, ...]]] = OrderedDict()
+
+    @staticmethod
+    def _cache_key(
+        calibration: tuple[torch.Tensor | None, ...],
+        key: Hashable | None,
+        image_size: tuple[int, int],
+        device: torch.device,
+        dtype: torch.dtype,
+    ) -> tuple[Any, ...]:
+        if key is not None:
+            return ("key", key, tuple(image_size), str(device), dtype)
+        # the identity and version counter of the tensors, which are read without any device synchronization
+        identities = tuple(None if t is None else (id(t), _version(t)) for t in calibration)
+        return ("tensors", identities, tuple(image_size), str(device), dtype)
+
+    def _lookup(self, key: tuple[Any, ...], calibration: tuple[torch.Tensor | None, ...]) -> torch.Tensor | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        grid, refs = entry
+        # an ``id`` may be reused by a new tensor once the calibration tensors are freed
+        if any(ref() is not t for ref, t in zip(refs, _defined(calibration))):
+            return None
+        self._cache.move_to_end(key)
+        return grid
+
+    def _insert(self, key: tuple[Any, ...], grid: torch.Tensor, calibration: tuple[torch.Tensor | None, ...]) -> None:
+        self._cache[key] = (grid, tuple(weakref.ref(t) for t in _defined(calibration)))
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Remove all the sampling grids from the cache."""
+        self._cache.clear()
+
+    def grid(
+        self,
+        K: torch.Tensor,
+        dist: torch.Tensor,
+        image_size: tuple[int, int],
+        new_K: torch.Tensor | None = None,
+        device: torch.device | None = None,
+        dtype: torch.dtype | None = None,
+        key: Hashable | None = None,
+    ) -> torch.Tensor:
+        r"""Return the normalized sampling grid of a calibration, computing it on a cache miss.
+
+        Args:
+            K: Intrinsic camera matrix with shape :math:`(*, 3, 3)`.
+            dist: Distortion coefficients with shape :math:`(*, n)`, see :func:`undistort_image`.
+            image_size: the image size :math:`(H, W)`.
+            new_K: Intrinsic camera matrix of the undistorted image with shape :math:`(*, 3, 3)`. Default: K.
+            device: the device of the grid. Default: the device of K.
+            dtype: the dtype of the grid. Default: the dtype of K.
+            key: a hashable identifying the calibration in the cache. Default: the calibration tensor objects.
+
+        Returns:
+            the sampling grid for :func:`torch.nn.functional.grid_sample` with ``align_corners=True`` and shape
+            :math:`(B, H, W, 2)`, where :math:`B` is the number of calibrations.
+
+        """
+        KORNIA_CHECK_SHAPE(K, ["*", "3", "3"])
+        if dist.shape[-1] not in [4, 5, 8, 12, 14]:
+            raise ValueError(f"Invalid number of distortion coefficients. Got {dist.shape[-1]}.")
+        device = K.device if device is None else torch.device(device)
+        dtype = K.dtype if dtype is None else dtype
+        calibration = () if key is not None else (K, dist, new_K)
+        cache_key = self._cache_key(calibration, key, image_size, device, dtype)
+        grid = self._lookup(cache_key, calibration)
+        if grid is None:
+            mapx, mapy = _undistort_maps(K, dist, image_size, new_K, device, dtype)
+            grid = self._normalize(stack([mapx, mapy], -1).reshape(-1, *image_size, 2))
+            self._insert(cache_key, grid, calibration)
+        return grid
+
+    @staticmethod
+    def _normalize(maps: torch.Tensor) -> torch.Tensor:
+        height, width = maps.shape[-3:-1]
+        return normalize_pixel_coordinates(maps, height, width)
+
+    def forward(
+        self,
+        image: torch.Tensor,
+        K: torch.Tensor,
+        dist: torch.Tensor,
+        new_K: torch.Tensor | None = None,
+        key: Hashable | None = None,
+    ) -> torch.Tensor:
+        r"""Compensate an image for lens distortion.
+
+        Args:
+            image: Input image with shape :math:`(*, C, H, W)`.
+            K: Intrinsic camera matrix with shape :math:`(*, 3, 3)` or :math:`(3, 3)` to share it across the batch.
+            dist: Distortion coefficients with shape :math:`(*, n)` or :math:`(n,)`, see :func:`undistort_image`.
+            new_K: Intrinsic camera matrix of the undistorted image with shape :math:`(*, 3, 3)`. Default: K.
+            key: a hashable identifying the calibration in the cache. Default: the calibration tensor objects.
+
+        Returns:
+            Undistorted image with shape :math:`(*, C, H, W)`.
+
+        """
+        if len(image.shape) < 3:
+            raise ValueError(f"Image shape is invalid. Got: {image.shape}.")
+        if not image.is_floating_point():
+            raise ValueError(f"Invalid input image data type. Input should be float. Got {image.dtype}.")
+
+        channels, rows, cols = image.shape[-3:]
+        B = image.numel() // (channels * rows * cols)
+        grid = self.grid(K, dist, (rows, cols), new_K, image.device, image.dtype, key)
+        if grid.shape[0] != B:
+            KORNIA_CHECK(grid.shape[0] == 1, f"Expected 1 or {B} calibrations. Got {grid.shape[0]}.")
+            grid = grid.expand(B, -1, -1, -1)
+
+        out = F.grid_sample(
+            image.reshape(B, channels, rows, cols), grid, mode=self.mode, padding_mode="zeros", align_corners=True
+        )
+        return out.view_as(image)
+
+    def save(
+        self,
+        path: str,
+        K: torch.Tensor,
+        dist: torch.Tensor,
+        image_size: tuple[int, int],
+        new_K: torch.Tensor | None = None,
+        precision: str = "half",
+    ) -> None:
+        r"""Store to disk the sampling grid of a calibration.
+
+        Args:
+            path: the path of the file.
+            K: Intrinsic camera matrix with shape :math:`(*, 3, 3)`.
+            dist: Distortion coefficients with shape :math:`(*, n)`.
+            image_size: the image size :math:`(H, W)`.
+            new_K: Intrinsic camera matrix of the undistorted image with shape :math:`(*, 3, 3)`. Default: K.
+            precision: ``'half'`` to store the offsets in float16 or ``'fixed'`` to store them as int16 with
+              :math:`1/32` pixel resolution, in the range :math:`[-1024, 1024)` pixels.
+
+        """
+        KORNIA_CHECK(precision in ("half", "fixed"), f"precision must be 'half' or 'fixed'. Got: {precision}")
+        mapx, mapy = _undistort_maps(K, dist, image_size, new_K, K.device, torch.float64)
+        identity = create_meshgrid(*image_size, False, K.device, torch.float64)
+        offsets = stack([mapx, mapy], -1).reshape(-1, *image_size, 2) - identity
+        if precision == "half":
+            data = offsets.to(torch.float16)
+        else:
+            scale = 2**_FIXED_POINT_BITS
+            data = (offsets * scale).round().clamp(-(2**15), 2**15 - 1).to(torch.int16)
+        state = {
+            "K": K.detach().cpu(),
+            "dist": dist.detach().cpu(),
+            "new_K": new_K.detach().cpu() if new_K is not None else None,
+            "image_size": tuple(image_size),
+            "precision": precision,
+            "offsets": data.cpu(),
+        }
+        torch.save(state, path)
+
+    def load(
+        self,
+        path: str,
+        device: torch.device | None = None,
+        dtype: torch.dtype = torch.float32,
+        key: Hashable | None = None,
+    ) -> torch.Tensor:
+        r"""Load from disk a sampling grid stored with :meth:`save` and insert it in the cache.
+
+        Args:
+            path: the path of the file.
+            device: the device of the grid.
+            dtype: the dtype of the grid, it must match the dtype of the images to undistort.
+            key: the key of the grid in the cache, to be given to :meth:`forward`. Default: ``path``.
+
+        Returns:
+            the sampling grid with shape :math:`(B, H, W, 2)`.
+
+        """
+        state = torch.load(path, map_location="cpu")
+        device = torch.device("cpu") if device is None else torch.device(device)
+        image_size: tuple[int, int] = tuple(state["image_size"])  # type: ignore[assignment]
+        offsets = state["offsets"].to(device, dtype)
+        if state["precision"] == "fixed":
+            offsets = offsets / 2**_FIXED_POINT_BITS
+        grid = self._normalize(offsets + create_meshgrid(*image_size, False, device, dtype))
+        cache_key = self._cache_key((), path if key is None else key, image_size, device, dtype)
+        self._insert(cache_key, grid, ())
+        return grid
+
+
+def _version(tensor: torch.Tensor) -> int:
+    """Return the version counter of a tensor, bumped by in-place operations, or -1 for inference tensors."""
+    try:
+        return tensor._version
+    except RuntimeError:
+        return -1
+
+
+def _defined(tensors: tuple[torch.Tensor | None, ...]) -> tuple[torch.Tensor, ...]:
+    return tuple(t for t in tensors if t is not None)
@@ -24,6 +24,7 @@ import torch
 from kornia.core import eye, ones_like, stack, where, zeros
 from kornia.core.check import KORNIA_CHECK, KORNIA_CHECK_SAME_SHAPE, KORNIA_CHECK_SHAPE
 from kornia.geometry import solvers
+from kornia.geometry.linalg import _weighted_gram
 from kornia.utils import eye_like, vec_like
 from kornia.utils.helpers import _torch_solve_cast, _torch_svd_cast
 
@@ -76,11 +77,7 @@ def run_5point(points1: torch.Tensor, points2: torch.Tensor, weights: Optional[t
     X = torch.cat([x1 * x2, x1 * y2, x1, y1 * x2, y1 * y2, y1, x2, y2, ones], dim=-1)
 
     # apply the weights to the linear system
-    if weights is None:
-        X = X.transpose(-2, -1) @ X
-    else:
-        w_diag = torch.diag_embed(weights)
-        X = X.transpose(-2, -1) @ w_diag @ X
+    X = _weighted_gram(X, weights)
 
     # use Nister's 5PC to solve essential matrix
     E_Nister = null_to_Nister_solution(X, batch_size)
@@ -601,7 +598,10 @@ def relative_camera_motion(
 
 
 def find_essential(
-    points1: torch.Tensor, points2: torch.Tensor, weights: Optional[torch.Tensor] = None
+    points1: torch.Tensor,
+    points2: torch.Tensor,
+    weights: Optional[torch.Tensor] = None,
+    mask: Optional[torch.Tensor] = None,
 ) -> torch.Tensor:
     r"""Find essential matrices.
 
@@ -609,6 +609,8 @@ def find_essential(
          points1: A set of points in the first image with a tensor shape :math:`(B, N, 2), N>=5`.
          points2: A set of points in the second image with a tensor shape :math:`(B, N, 2), N>=5`.
          weights: Tensor containing the weights per point correspondence with a shape of :math:`(5, N)`.
+         mask: optional boolean mask with shape :math:`(B, N)` of the valid correspondences, to batch problems with
+           different numbers of correspondences padded to :math:`N`. The masked out ones are ignored.
 
     Returns:
          the computed essential matrices with shape :math:`(B, 10, 3, 3)`.
@@ -616,5 +618,8 @@ def find_essential(
          To choose the best one out of 10, try to check the one with the lowest Sampson distance.
 
     """
+    if mask is not None:
+        KORNIA_CHECK_SAME_SHAPE(points1[..., 0], mask)
+        weights = mask.to(points1.dtype) if weights is None else weights * mask
     E = run_5point(points1, points2, weights).to(points1.dtype)
     return E
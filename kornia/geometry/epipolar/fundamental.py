@@ -24,12 +24,12 @@ import torch
 from kornia.core import Tensor, concatenate, ones_like, stack, where, zeros
 from kornia.core.check import KORNIA_CHECK_SAME_SHAPE, KORNIA_CHECK_SHAPE
 from kornia.geometry.conversions import convert_points_from_homogeneous, convert_points_to_homogeneous
-from kornia.geometry.linalg import transform_points
+from kornia.geometry.linalg import _weighted_gram, transform_points
 from kornia.geometry.solvers import solve_cubic
 from kornia.utils.helpers import _torch_svd_cast, safe_inverse_with_mask
 
 
-def normalize_points(points: Tensor, eps: float = 1e-8) -> Tuple[Tensor, Tensor]:
+def normalize_points(points: Tensor, eps: float = 1e-8, mask: Optional[Tensor] = None) -> Tuple[Tensor, Tensor]:
     r"""Normalize points (isotropic).
 
     Computes the transformation matrix such that the two principal moments of the set of points
@@ -42,6 +42,7 @@ def normalize_points(points: Tensor, eps: float = 1e-8) -> Tuple[Tensor, Tensor]
     Args:
        points: Tensor containing the points to be normalized with shape :math:`(B, N, 2)`.
        eps: epsilon value to avoid numerical instabilities.
+       mask: optional boolean mask with shape :math:`(B, N)` of the points used to compute the transformation.
 
     Returns:
        tuple containing the normalized points in the shape :math:`(B, N, 2)` and the transformation matrix
@@ -53,9 +54,16 @@ def normalize_points(points: Tensor, eps: float = 1e-8) -> Tuple[Tensor, Tensor]
     if points.shape[-1] != 2:
         raise AssertionError(points.shape)
 
-    x_mean = torch.mean(points, dim=1, keepdim=True)  # Bx1x2
+    if mask is None:
+        x_mean = torch.mean(points, dim=1, keepdim=True)  # Bx1x2
 
-    scale = (points - x_mean).norm(dim=-1, p=2).mean(dim=-1)  # B
+        scale = (points - x_mean).norm(dim=-1, p=2).mean(dim=-1)  # B
+    else:
+        w = mask.to(points.dtype)
+        count = w.sum(dim=-1).clamp(min=1)  # B
+        x_mean = (points * w[..., None]).sum(dim=1, keepdim=True) / count[:, None, None]  # Bx1x2
+
+        scale = ((points - x_mean).norm(dim=-1, p=2) * w).sum(dim=-1) / count  # B
     scale = torch.sqrt(torch.tensor(2.0)) / (scale + eps)  # B
 
     ones, zeros = ones_like(scale), torch.zeros_like(scale)
@@ -186,7 +194,9 @@ def run_7point(points1: Tensor, points2: Tensor) -> Tensor:
     return normalize_transformation(fmatrix)
 
 
-def run_8point(points1: Tensor, points2: Tensor, weights: Optional[Tensor] = None) -> Tensor:
+def run_8point(
+    points1: Tensor, points2: Tensor, weights: Optional[Tensor] = None, mask: Optional[Tensor] = None
+) -> Tensor:
     r"""Compute the fundamental matrix using the DLT formulation.
 
     The linear system is solved by using the Weighted Least Squares Solution for the 8 Points algorithm.
@@ -195,6 +205,9 @@ def run_8point(points1: Tensor, points2: Tensor, weights: Optional[Tensor] = Non
         points1: A set of points in the first image with a tensor shape :math:`(B, N, 2), N>=8`.
         points2: A set of points in the second image with a tensor shape :math:`(B, N, 2), N>=8`.
         weights: Tensor containing the weights per point correspondence with a shape of :math:`(B, N)`.
+        mask: optional boolean mask with shape :math:`(B, N)` of the valid correspondences, to batch problems with
+          different numbers of correspondences padded to :math:`N`. The masked out ones are ignored, including in
+          the points normalization.
 
     Returns:
         the computed fundamental matrix with shape :math:`(B, 3, 3)`.
@@ -209,9 +222,12 @@ def run_8point(points1: Tensor, points2: Tensor, weights: Optional[Tensor] = Non
         KORNIA_CHECK_SHAPE(weights, ["B", "N"])
         if not (weights.shape[1] == points1.shape[1]):
             raise AssertionError(weights.shape)
+    if mask is not None:
+        KORNIA_CHECK_SAME_SHAPE(points1[..., 0], mask)
+        weights = mask.to(points1.dtype) if weights is None else weights * mask
 
-    points1_norm, transform1 = normalize_points(points1)
-    points2_norm, transform2 = normalize_points(points2)
+    points1_norm, transform1 = normalize_points(points1, mask=mask)
+    points2_norm, transform2 = normalize_points(points2, mask=mask)
 
     x1, y1 = torch.chunk(points1_norm, dim=-1, chunks=2)  # Bx1xN
     x2, y2 = torch.chunk(points2_norm, dim=-1, chunks=2)  # Bx1xN
@@ -225,11 +241,7 @@ def run_8point(points1: Tensor, points2: Tensor, weights: Optional[Tensor] = Non
     X = torch.cat([x2 * x1, x2 * y1, x2, y2 * x1, y2 * y1, y2, x1, y1, ones], dim=-1)  # BxNx9
 
     # apply the weights to the linear system
-    if weights is None:
-        X = X.transpose(-2, -1) @ X
-    else:
-        w_diag = torch.diag_embed(weights)
-        X = X.transpose(-2, -1) @ w_diag @ X
+    X = _weighted_gram(X, weights)
     # compute eigevectors and retrieve the one with the smallest eigenvalue
 
     _, _, V = _torch_svd_cast(X)
@@ -21,13 +21,13 @@ from typing import Optional, Tuple
 import torch
 
 from kornia.core import Tensor
-from kornia.core.check import KORNIA_CHECK_SHAPE
+from kornia.core.check import KORNIA_CHECK_SAME_SHAPE, KORNIA_CHECK_SHAPE
 from kornia.utils import _extract_device_dtype, safe_inverse_with_mask, safe_solve_with_mask
 from kornia.utils.helpers import _torch_svd_cast
 
 from .conversions import convert_points_from_homogeneous, convert_points_to_homogeneous
 from .epipolar import normalize_points
-from .linalg import transform_points
+from .linalg import _weighted_gram, transform_points
 
 TupleTensor = Tuple[Tensor, Tensor]
 
@@ -140,7 +140,11 @@ def line_segment_transfer_error_one_way(ls1: Tensor, ls2: Tensor, H: Tensor, squ
 
 
 def find_homography_dlt(
-    points1: torch.Tensor, points2: torch.Tensor, weights: Optional[torch.Tensor] = None, solver: str = "lu"
+    points1: torch.Tensor,
+    points2: torch.Tensor,
+    weights: Optional[torch.Tensor] = None,
+    solver: str = "lu",
+    mask: Optional[torch.Tensor] = None,
 ) -> torch.Tensor:
     r"""Compute the homography matrix using the DLT formulation.
 
@@ -151,6 +155,9 @@ def find_homography_dlt(
         points2: A set of points in the second image with a tensor shape :math:`(B, N, 2)`.
         weights: Tensor containing the weights per point correspondence with a shape of :math:`(B, N)`.
         solver: variants: svd, lu.
+        mask: optional boolean mask with shape :math:`(B, N)` of the valid correspondences, to batch problems with
+          different numbers of correspondences padded to :math:`N`. The masked out ones are ignored, including in
+          the points normalization.
 
 
     Returns:
@@ -165,10 +172,15 @@ def find_homography_dlt(
     KORNIA_CHECK_SHAPE(points2, ["B", "N", "2"])
 
     device, dtype = _extract_device_dtype([points1, points2])
+    if weights is not None and not (len(weights.shape) == 2 and weights.shape == points1.shape[:2]):
+        raise AssertionError(weights.shape)
+    if mask is not None:
+        KORNIA_CHECK_SAME_SHAPE(points1[..., 0], mask)
+        weights = mask.to(dtype) if weights is None else weights * mask
 
     eps: float = 1e-8
-    points1_norm, transform1 = normalize_points(points1)
-    points2_norm, transform2 = normalize_points(points2)
+    points1_norm, transform1 = normalize_points(points1, mask=mask)
+    points2_norm, transform2 = normalize_points(points2, mask=mask)
 
     x1, y1 = torch.chunk(points1_norm, dim=-1, chunks=2)  # BxNx1
     x2, y2 = torch.chunk(points2_norm, dim=-1, chunks=2)  # BxNx1
@@ -179,15 +191,8 @@ def find_homography_dlt(
     ay = torch.cat([x1, y1, ones, zeros, zeros, zeros, -x2 * x1, -x2 * y1, -x2], dim=-1)
     A = torch.cat((ax, ay), dim=-1).reshape(ax.shape[0], -1, ax.shape[-1])
 
-    if weights is None:
-        # All points are equally important
-        A = A.transpose(-2, -1) @ A
-    else:
-        # We should use provided weights
-        if not (len(weights.shape) == 2 and weights.shape == points1.shape[:2]):
-            raise AssertionError(weights.shape)
-        w_diag = torch.diag_embed(weights.unsqueeze(dim=-1).repeat(1, 1, 2).reshape(weights.shape[0], -1))
-        A = A.transpose(-2, -1) @ w_diag @ A
+    # each correspondence gives two equations with the same weight
+    A = _weighted_gram(A, weights.repeat_interleave(2, dim=-1) if weights is not None else None)
 
     if solver == "svd":
         try:
@@ -268,7 +273,9 @@ def sample_is_valid_for_homography(points1: Tensor, points2: Tensor) -> Tensor:
     return sample_is_valid
 
 
-def find_homography_lines_dlt(ls1: Tensor, ls2: Tensor, weights: Optional[Tensor] = None) -> Tensor:
+def find_homography_lines_dlt(
+    ls1: Tensor, ls2: Tensor, weights: Optional[Tensor] = None, mask: Optional[Tensor] = None
+) -> Tensor:
     """Compute the homography matrix using the DLT formulation for line correspondences.
 
     See :cite:`homolines2001` for details.
@@ -279,6 +286,9 @@ def find_homography_lines_dlt(ls1: Tensor, ls2: Tensor, weights: Optional[Tensor
         ls1: A set of line segments in the first image with a tensor shape :math:`(B, N, 2, 2)`.
         ls2: A set of line segments in the second image with a tensor shape :math:`(B, N, 2, 2)`.
         weights: Tensor containing the weights per point correspondence with a shape of :math:`(B, N)`.
+        mask: optional boolean mask with shape :math:`(B, N)` of the valid line correspondences, to batch problems
+          with different numbers of line correspondences padded to :math:`N`. The masked out ones are ignored,
+          including in the points normalization.
 
     Returns:
         the computed homography matrix with shape :math:`(B, 3, 3)`.
@@ -293,11 +303,21 @@ def find_homography_lines_dlt(ls1: Tensor, ls2: Tensor, weights: Optional[Tensor
     BS, N = ls1.shape[:2]
     device, dtype = _extract_device_dtype([ls1, ls2])
 
+    if weights is not None and not ((len(weights.shape) == 2) and (weights.shape == ls1.shape[:2])):
+        raise AssertionError(weights.shape)
+    points_mask: Optional[Tensor] = None
+    if mask is not None:
+        KORNIA_CHECK_SAME_SHAPE(ls1[..., 0, 0], mask)
+        points_mask = mask.repeat_interleave(2, dim=-1)
+        # the equations pair the points i and N + i, both must be valid
+        pairs_mask = points_mask[:, :N] & points_mask[:, N:]
+        weights = pairs_mask.to(dtype) if weights is None else weights * pairs_mask
+
     points1 = ls1.reshape(BS, 2 * N, 2)
     points2 = ls2.reshape(BS, 2 * N, 2)
 
-    points1_norm, transform1 = normalize_points(points1)
-    points2_norm, transform2 = normalize_points(points2)
+    points1_norm, transform1 = normalize_points(points1, mask=points_mask)
+    points2_norm, transform2 = normalize_points(points2, mask=points_mask)
     lst1, le1 = torch.chunk(points1_norm, dim=1, chunks=2)
     lst2, le2 = torch.chunk(points2_norm, dim=1, chunks=2)
 
@@ -317,15 +337,8 @@ def find_homography_lines_dlt(ls1: Tensor, ls2: Tensor, weights: Optional[Tensor
     ay = torch.cat([A * xe1, A * ye1, A, B * xe1, B * ye1, B, C * xe1, C * ye1, C], dim=-1)
     A = torch.cat((ax, ay), dim=-1).reshape(ax.shape[0], -1, ax.shape[-1])
 
-    if weights is None:
-        # All points are equally important
-        A = A.transpose(-2, -1) @ A
-    else:
-        # We should use provided weights
-        if not ((len(weights.shape) == 2) and (weights.shape == ls1.shape[:2])):
-            raise AssertionError(weights.shape)
-        w_diag = torch.diag_embed(weights.unsqueeze(dim=-1).repeat(1, 1, 2).reshape(weights.shape[0], -1))
-        A = A.transpose(-2, -1) @ w_diag @ A
+    # each pair of points gives two equations with the same weight
+    A = _weighted_gram(A, weights.repeat_interleave(2, dim=-1) if weights is not None else None)
 
     try:
         _, _, V = _torch_svd_cast(A)
@@ -284,3 +284,23 @@ squared_norm = batched_squared_norm
 
 # TODO:
 # - project_points: from opencv
+
+
+def _weighted_gram(A: Tensor, weights: Tensor | None = None) -> Tensor:
+    r"""Compute the normal matrix :math:`A^T W A` of a weighted linear system.
+
+    The rows of :math:`A` are scaled by their weights instead of building the dense diagonal matrix :math:`W`,
+    so that the memory grows linearly with the number of equations.
+
+    Args:
+        A: the equations of the linear systems with shape :math:`(B, N, D)`.
+        weights: the weight of each equation with shape :math:`(B, N)`. Zero weights ignore the equation, which
+          allows to batch problems with different numbers of equations.
+
+    Returns:
+        the normal matrix with shape :math:`(B, D, D)`.
+
+    """
+    if weights is None:
+        return A.transpose(-2, -1) @ A
+    return (A * weights[..., None]).transpose(-2, -1) @ A
@@ -23,7 +23,7 @@ import torch
 
 from kornia.core import Module, Parameter, Tensor, normalize, where
 from kornia.core.check import KORNIA_CHECK, KORNIA_CHECK_IS_TENSOR, KORNIA_CHECK_SHAPE
-from kornia.geometry.linalg import batched_dot_product, squared_norm
+from kornia.geometry.linalg import _weighted_gram, batched_dot_product, squared_norm
 from kornia.geometry.plane import Hyperplane
 from kornia.utils.helpers import _torch_svd_cast
 
@@ -210,9 +210,7 @@ def fit_line(points: Tensor, weights: Optional[Tensor] = None) -> ParametrizedLi
         KORNIA_CHECK_IS_TENSOR(weights, "weights must be a tensor")
         KORNIA_CHECK_SHAPE(weights, ["B", "N"])
         KORNIA_CHECK(points.shape[0] == weights.shape[0])
-        A = A.transpose(-2, -1) @ torch.diag_embed(weights) @ A
-    else:
-        A = A.transpose(-2, -1) @ A
+    A = _weighted_gram(A, weights)
 
     # NOTE: not optimal for 2d points, but for now works for other dimensions
     _, _, V = _torch_svd_cast(A)
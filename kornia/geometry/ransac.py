@@ -23,9 +23,10 @@ from typing import Callable, Optional, Tuple
 
 import torch
 
-from kornia.core import Device, Module, Tensor, zeros
-from kornia.core.check import KORNIA_CHECK_SHAPE
+from kornia.core import Device, Module, Tensor, where, zeros
+from kornia.core.check import KORNIA_CHECK, KORNIA_CHECK_SHAPE
 from kornia.geometry import (
+    find_essential,
     find_fundamental,
     find_homography_dlt,
     find_homography_dlt_iterated,
@@ -33,6 +34,7 @@ from kornia.geometry import (
     find_homography_lines_dlt_iterated,
     symmetrical_epipolar_distance,
 )
+from kornia.geometry.epipolar.fundamental import run_8point
 from kornia.geometry.homography import (
     line_segment_transfer_error_one_way,
     oneway_transfer_error,
@@ -47,12 +49,15 @@ class RANSAC(Module):
 
     Args:
         model_type: type of model to estimate: "homography", "fundamental", "fundamental_7pt",
-            "homography_from_linesegments".
+            "essential", "homography_from_linesegments". For "essential" the correspondences are expected
+            in normalized camera coordinates.
         inliers_threshold: threshold for the correspondence to be an inlier.
         batch_size: number of generated samples at once.
         max_iterations: maximum batches to generate. Actual number of models to try is ``batch_size * max_iterations``.
         confidence: desired confidence of the result, used for the early stopping.
         max_local_iterations: number of local optimization (polishing) iterations.
+        sync_every: number of iterations between the early stopping checks in :meth:`forward_batched`.
+            Each check is the only host synchronization of the batched loop.
 
     """
 
@@ -64,41 +69,62 @@ class RANSAC(Module):
         max_iter: int = 10,
         confidence: float = 0.99,
         max_lo_iters: int = 5,
+        sync_every: int = 2,
     ) -> None:
         super().__init__()
-        self.supported_models = ["homography", "fundamental", "fundamental_7pt", "homography_from_linesegments"]
+        self.supported_models = [
+            "homography",
+            "fundamental",
+            "fundamental_7pt",
+            "essential",
+            "homography_from_linesegments",
+        ]
         self.inl_th = inl_th
         self.max_iter = max_iter
         self.batch_size = batch_size
         self.model_type = model_type
         self.confidence = confidence
         self.max_lo_iters = max_lo_iters
+        self.sync_every = sync_every
         self.model_type = model_type
 
         self.error_fn: Callable[..., Tensor]
         self.minimal_solver: Callable[..., Tensor]
         self.polisher_solver: Callable[..., Tensor]
+        # weighted least squares solver used for the local optimization in the batched mode, where zero weights
+        # mask out the outliers, and the mask the padded correspondences, also in the points normalization.
+        self.weighted_polisher_solver: Callable[..., Tensor]
 
         if model_type == "homography":
             self.error_fn = oneway_transfer_error
             self.minimal_solver = find_homography_dlt
             self.polisher_solver = find_homography_dlt_iterated
+            self.weighted_polisher_solver = find_homography_dlt
             self.minimal_sample_size = 4
         elif model_type == "homography_from_linesegments":
             self.error_fn = line_segment_transfer_error_one_way
             self.minimal_solver = find_homography_lines_dlt
             self.polisher_solver = find_homography_lines_dlt_iterated
+            self.weighted_polisher_solver = find_homography_lines_dlt
             self.minimal_sample_size = 4
         elif model_type == "fundamental":
             self.error_fn = symmetrical_epipolar_distance
             self.minimal_solver = find_fundamental
             self.minimal_sample_size = 8
             self.polisher_solver = find_fundamental
+            self.weighted_polisher_solver = run_8point
         elif model_type == "fundamental_7pt":
             self.error_fn = symmetrical_epipolar_distance
             self.minimal_solver = partial(find_fundamental, method="7POINT")
             self.minimal_sample_size = 7
             self.polisher_solver = find_fundamental
+            self.weighted_polisher_solver = run_8point
+        elif model_type == "essential":
+            self.error_fn = symmetrical_epipolar_distance
+            self.minimal_solver = find_essential
+            self.minimal_sample_size = 5
+            self.polisher_solver = find_essential
+            self.weighted_polisher_solver = find_essential
         else:
             raise NotImplementedError(f"{model_type} is unknown. Try one of {self.supported_models}")
 
@@ -123,10 +149,50 @@ class RANSAC(Module):
             return 1.0
         return math.log(1.0 - conf) / min(-eps, math.log(max(eps, 1.0 - math.pow(n_inl / num_tc, sample_size))))
 
+    @staticmethod
+    def max_samples_by_conf_batched(n_inl: Tensor, num_tc: Tensor, sample_size: int, conf: float) -> Tensor:
+        """Vectorized version of :meth:`max_samples_by_conf` for a batch of problems."""
+        eps = 1e-9
+        n_inl = n_inl.to(torch.float64)
+        num_tc = num_tc.to(torch.float64)
+        inl_ratio = (n_inl / num_tc.clamp(min=1.0)).clamp(0.0, 1.0)
+        denom = torch.log((1.0 - inl_ratio.pow(sample_size)).clamp(min=eps)).clamp(max=-eps)
+        out = math.log(1.0 - conf) / denom
+        return where((num_tc <= sample_size) | (n_inl == num_tc), torch.ones_like(out), out)
+
+    def sample_batched(self, sample_size: int, num_valid: Tensor, order: Tensor, batch_size: int) -> Tensor:
+        """Sample minimal samples without replacement for a batch of problems.
+
+        Args:
+            sample_size: size of the minimal sample.
+            num_valid: number of valid correspondences per problem :math:`(B,)`.
+            order: correspondences indices per problem, valid ones first :math:`(B, N)`.
+            batch_size: number of samples per problem.
+
+        Returns:
+            indices of the sampled correspondences :math:`(B, batch_size, sample_size)`.
+
+        """
+        B = num_valid.shape[0]
+        chosen = []
+        for j in range(sample_size):
+            pop = (num_valid - j).clamp(min=1)[:, None]
+            pos = (torch.rand(B, batch_size, device=order.device) * pop).long()
+            pos = torch.minimum(pos, pop - 1)
+            if j > 0:
+                # shift the position over the already taken ones to get the pos-th untaken correspondence
+                taken = torch.stack(chosen, -1).sort(dim=-1)[0]
+                for t in range(j):
+                    pos = pos + (pos >= taken[..., t]).long()
+            chosen.append(pos)
+        pos = torch.stack(chosen, -1).clamp(max=order.shape[1] - 1)
+        return order.gather(1, pos.view(B, -1)).view(B, batch_size, sample_size)
+
     def estimate_model_from_minsample(self, kp1: Tensor, kp2: Tensor) -> Tensor:
         batch_size, sample_size = kp1.shape[:2]
         H = self.minimal_solver(kp1, kp2, torch.ones(batch_size, sample_size, dtype=kp1.dtype, device=kp1.device))
-        return H
+        # solvers with several solutions per sample (7pt, 5pt) return (B, S, 3, 3)
+        return H.reshape(-1, 3, 3)
 
     def verify(self, kp1: Tensor, kp2: Tensor, models: Tensor, inl_th: float) -> Tuple[Tensor, Tensor, float]:
         if len(kp1.shape) == 2:
@@ -154,12 +220,17 @@ class RANSAC(Module):
             return kp1[mask], kp2[mask]
         return kp1, kp2
 
-    def remove_bad_models(self, models: Tensor) -> Tensor:
+    def good_models_mask(self, models: Tensor) -> Tensor:
         # ToDo: add more and better degenerate model rejection
         # For now it is simple and hardcoded
-        main_diagonal = torch.diagonal(models, dim1=1, dim2=2)
-        mask = main_diagonal.abs().min(dim=1)[0] > 1e-4
-        return models[mask]
+        if self.model_type == "essential":
+            # the diagonal of an essential matrix can be zero, e.g. for a pure translation
+            return models.flatten(-2).norm(dim=-1) > 1e-4
+        main_diagonal = torch.diagonal(models, dim1=-2, dim2=-1)
+        return main_diagonal.abs().min(dim=-1)[0] > 1e-4
+
+    def remove_bad_models(self, models: Tensor) -> Tensor:
+        return models[self.good_models_mask(models)]
 
     def polish_model(self, kp1: Tensor, kp2: Tensor, inliers: Tensor) -> Tensor:
         # TODO: Replace this with MAGSAC++ polisher
@@ -169,10 +240,10 @@ class RANSAC(Module):
         model = self.polisher_solver(
             kp1_inl, kp2_inl, torch.ones(1, num_inl, dtype=kp1_inl.dtype, device=kp1_inl.device)
         )
-        return model
+        return model.reshape(-1, 3, 3)
 
     def validate_inputs(self, kp1: Tensor, kp2: Tensor, weights: Optional[Tensor] = None) -> None:
-        if self.model_type in ["homography", "fundamental"]:
+        if self.model_type in ["homography", "fundamental", "fundamental_7pt", "essential"]:
             KORNIA_CHECK_SHAPE(kp1, ["N", "2"])
             KORNIA_CHECK_SHAPE(kp2, ["N", "2"])
             if not (kp1.shape[0] == kp2.shape[0]) or (kp1.shape[0] < self.minimal_sample_size):
@@ -231,10 +302,10 @@ class RANSAC(Module):
                     model_lo = self.polish_model(kp1, kp2, inliers)
                     if (model_lo is None) or (len(model_lo) == 0):
                         continue
-                    _, inliers_lo, score_lo = self.verify(kp1, kp2, model_lo, self.inl_th)
+                    model_lo, inliers_lo, score_lo = self.verify(kp1, kp2, model_lo, self.inl_th)
                     # print (f"Orig score = {best_model_score}, LO score = {score_lo} TC={num_tc}")
                     if score_lo > model_score:
-                        model = model_lo.clone()[0]
+                        model = model_lo.clone()
                         inliers = inliers_lo.clone()
                         model_score = score_lo
                     else:
@@ -254,3 +325,127 @@ class RANSAC(Module):
                     break
         # local optimization with all inliers for better precision
         return best_model_total, inliers_best_total
+
+    def verify_batched(
+        self, kp1: Tensor, kp2: Tensor, models: Tensor, valid: Tensor, inl_th: float
+    ) -> Tuple[Tensor, Tensor, Tensor]:
+        """Score the models of a batch of problems and select the best one per problem.
+
+        Args:
+            kp1: source correspondences :math:`(B, N, 2)` or :math:`(B, N, 2, 2)` for line segments.
+            kp2: destination correspondences with the same shape as ``kp1``.
+            models: hypotheses :math:`(B, M, 3, 3)`.
+            valid: mask of the non-padded correspondences :math:`(B, N)`.
+            inl_th: threshold for the correspondence to be an inlier.
+
+        Returns:
+            - The best model per problem :math:`(B, 3, 3)`.
+            - The inliers of the best model :math:`(B, N)`.
+            - The score of the best model :math:`(B,)`, -1 if no hypothesis was valid.
+
+        """
+        B, M = models.shape[:2]
+        N = kp1.shape[1]
+        shape = (B, M, *kp1.shape[1:])
+        errors = self.error_fn(
+            kp1[:, None].expand(shape).reshape(B * M, *kp1.shape[1:]),
+            kp2[:, None].expand(shape).reshape(B * M, *kp2.shape[1:]),
+            models.reshape(B * M, 3, 3),
+        ).view(B, M, N)
+        inl = (errors <= inl_th) & valid[:, None]
+        models_score = inl.sum(dim=-1)
+        good = self.good_models_mask(models) & torch.isfinite(models).flatten(-2).all(dim=-1)
+        models_score = where(good, models_score, -torch.ones_like(models_score))
+        best_score, best_idx = models_score.max(dim=1)
+        batch_idx = torch.arange(B, device=models.device)
+        return models[batch_idx, best_idx], inl[batch_idx, best_idx], best_score
+
+    def forward_batched(self, kp1: Tensor, kp2: Tensor, mask: Optional[Tensor] = None) -> Tuple[Tensor, Tensor]:
+        r"""Run RANSAC for a batch of independent problems at once.
+
+        All the problems are sampled, estimated, scored and locally optimized simultaneously. The host is
+        synchronized only every ``sync_every`` iterations, to check the adaptive termination criterion and skip
+        the local optimization when no model improves.
+
+        Args:
+            kp1: source image keypoints :math:`(B, N, 2)`, or line segments :math:`(B, N, 2, 2)`, padded to
+              the same number of correspondences.
+            kp2: destination image keypoints with the same shape as ``kp1``.
+            mask: boolean mask of the valid (non-padded) correspondences :math:`(B, N)`. All correspondences
+              are valid if ``None``.
+
+        Returns:
+            - Estimated models, shape of :math:`(B, 3, 3)`. Zero for problems without a model found.
+            - The inlier/outlier masks, shape of :math:`(B, N)`.
+
+        Example:
+            >>> kp1 = torch.rand(3, 20, 2)
+            >>> kp2 = kp1 + 0.1
+            >>> mask = torch.ones(3, 20, dtype=torch.bool)
+            >>> models, inliers = RANSAC("homography").forward_batched(kp1, kp2, mask)
+            >>> models.shape, inliers.shape
+            (torch.Size([3, 3, 3]), torch.Size([3, 20]))
+
+        """
+        if self.model_type == "homography_from_linesegments":
+            KORNIA_CHECK_SHAPE(kp1, ["B", "N", "2", "2"])
+        else:
+            KORNIA_CHECK_SHAPE(kp1, ["B", "N", "2"])
+        KORNIA_CHECK(kp1.shape == kp2.shape, f"kp1 and kp2 should have the same shape, got {kp1.shape}, {kp2.shape}")
+        B, N = kp1.shape[:2]
+        KORNIA_CHECK(N >= self.minimal_sample_size, f"At least {self.minimal_sample_size} correspondences needed")
+        if mask is None:
+            mask = torch.ones(B, N, dtype=torch.bool, device=kp1.device)
+        KORNIA_CHECK_SHAPE(mask, ["B", "N"])
+        mask = mask.bool()
+
+        k = self.minimal_sample_size
+        num_valid = mask.sum(dim=1)
+        # valid correspondences first, so that we can sample positions in [0, num_valid)
+        order = torch.sort((~mask).to(torch.uint8), dim=1, stable=True)[1]
+        batch_idx = torch.arange(B, device=kp1.device)
+
+        best_model = zeros(B, 3, 3, dtype=kp1.dtype, device=kp1.device)
+        best_inliers = zeros(B, N, dtype=torch.bool, device=kp1.device)
+        best_score = torch.full((B,), k, dtype=torch.long, device=kp1.device)
+        for i in range(self.max_iter):
+            idxs = self.sample_batched(k, num_valid, order, self.batch_size)
+            kp1_sampled = kp1[batch_idx[:, None, None], idxs].reshape(B * self.batch_size, k, *kp1.shape[2:])
+            kp2_sampled = kp2[batch_idx[:, None, None], idxs].reshape(B * self.batch_size, k, *kp2.shape[2:])
+            models = self.estimate_model_from_minsample(kp1_sampled, kp2_sampled).view(B, -1, 3, 3)
+            if self.model_type == "homography":
+                # degenerate samples give zero models, which are rejected by the scoring
+                good_samples = sample_is_valid_for_homography(kp1_sampled, kp2_sampled).view(B, -1, 1, 1)
+                models = where(good_samples, models, torch.zeros_like(models))
+            model, inliers, score = self.verify_batched(kp1, kp2, models, mask, self.inl_th)
+
+            # Should we check the termination criteria? Only once in a while, to avoid the host synchronization.
+            sync = (i + 1) % self.sync_every == 0
+
+            # Local optimization: weighted least squares on the inliers, for all the problems at once. As in the
+            # sequential mode, it only applies to the models better than the best so far, while they improve.
+            active = score > best_score
+            for _ in range(self.max_lo_iters):
+                if sync and not bool(active.any()):
+                    break
+                models_lo = self.weighted_polisher_solver(kp1, kp2, inliers.to(kp1.dtype), mask=mask)
+                model_lo, inliers_lo, score_lo = self.verify_batched(
+                    kp1, kp2, models_lo.view(B, -1, 3, 3), mask, self.inl_th
+                )
+                active = active & (score_lo > score)
+                model = where(active[:, None, None], model_lo, model)
+                inliers = where(active[:, None], inliers_lo, inliers)
+                score = where(active, score_lo, score)
+
+            improved = score > best_score
+            best_model = where(improved[:, None, None], model, best_model)
+            best_inliers = where(improved[:, None], inliers, best_inliers)
+            best_score = where(improved, score, best_score)
+
+            # Should we already stop?
+            if sync and i + 1 < self.max_iter:
+                new_max_iter = self.max_samples_by_conf_batched(best_score, num_valid, k, self.confidence)
+                done = ((i + 1) * self.batch_size >= new_max_iter) | (num_valid < k)
+                if bool(done.all()):
+                    break
+        return best_model, best_inliers
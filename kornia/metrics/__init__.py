@@ -19,7 +19,7 @@ from .accuracy import accuracy
 from .average_meter import AverageMeter
 from .confusion_matrix import confusion_matrix
 from .endpoint_error import AEPE, aepe, average_endpoint_error
-from .mean_average_precision import mean_average_precision
+from .mean_average_precision import MeanAveragePrecision, mean_average_precision
 from .mean_iou import mean_iou, mean_iou_bbox
 from .psnr import psnr
 from .ssim import SSIM, ssim
@@ -30,6 +30,7 @@ __all__ = [
     "SSIM",
     "SSIM3D",
     "AverageMeter",
+    "MeanAveragePrecision",
     "accuracy",
     "aepe",
     "average_endpoint_error",
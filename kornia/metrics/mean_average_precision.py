@@ -15,13 +15,14 @@
 # limitations under the License.
 #
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import torch
+from torch.nn.utils.rnn import pad_sequence
 
 from kornia.core import Tensor, concatenate, tensor, zeros
 
-from .mean_iou import mean_iou_bbox
+__all__ = ["MeanAveragePrecision", "mean_average_precision"]
 
 
 def mean_average_precision(
@@ -57,123 +58,238 @@ def mean_average_precision(
         (tensor(1.), {1: 1.0})
 
     """
-    # these are all lists of tensors of the same length, i.e. number of images
-    if not len(pred_boxes) == len(pred_labels) == len(pred_scores) == len(gt_boxes) == len(gt_labels):
-        raise AssertionError
-
-    # Store all (true) objects in a single continuous tensor while keeping track of the image it is from
-    gt_images = []
-    for i, labels in enumerate(gt_labels):
-        gt_images.extend([i] * labels.size(0))
-    # (n_objects), n_objects is the total no. of objects across all images
-    _gt_boxes = concatenate(gt_boxes, 0)  # (n_objects, 4)
-    _gt_labels = concatenate(gt_labels, 0)  # (n_objects)
-    _gt_images = tensor(gt_images, device=_gt_boxes.device, dtype=torch.long)
-
-    if not _gt_images.size(0) == _gt_boxes.size(0) == _gt_labels.size(0):
-        raise AssertionError
-
-    # Store all detections in a single continuous tensor while keeping track of the image it is from
-    pred_images = []
-    for i, labels in enumerate(pred_labels):
-        pred_images.extend([i] * labels.size(0))
-    _pred_boxes = concatenate(pred_boxes, 0)  # (n_detections, 4)
-    _pred_labels = concatenate(pred_labels, 0)  # (n_detections)
-    _pred_scores = concatenate(pred_scores, 0)  # (n_detections)
-    _pred_images = tensor(pred_images, device=_pred_boxes.device, dtype=torch.long)  # (n_detections)
-
-    if not _pred_images.size(0) == _pred_boxes.size(0) == _pred_labels.size(0) == _pred_scores.size(0):
-        raise AssertionError
-
-    # Calculate APs for each class (except background)
-    average_precisions = zeros((n_classes - 1), device=_pred_boxes.device, dtype=_pred_boxes.dtype)  # (n_classes - 1)
-    for c in range(1, n_classes):
-        # Extract only objects with this class
-        gt_class_images = _gt_images[_gt_labels == c]  # (n_class_objects)
-        gt_class_boxes = _gt_boxes[_gt_labels == c]  # (n_class_objects, 4)
-
-        # Keep track of which true objects with this class have already been 'detected'
-        # (n_class_objects)
-        gt_class_boxes_detected = zeros((gt_class_images.size(0)), dtype=torch.uint8, device=gt_class_images.device)
-
-        # Extract only detections with this class
-        pred_class_images = _pred_images[_pred_labels == c]  # (n_class_detections)
-        pred_class_boxes = _pred_boxes[_pred_labels == c]  # (n_class_detections, 4)
-        pred_class_scores = _pred_scores[_pred_labels == c]  # (n_class_detections)
-        n_class_detections = pred_class_boxes.size(0)
-        if n_class_detections == 0:
-            continue
-
-        # Sort detections in decreasing order of confidence/scores
-        pred_class_scores, sort_ind = torch.sort(pred_class_scores, dim=0, descending=True)  # (n_class_detections)
-        pred_class_images = pred_class_images[sort_ind]  # (n_class_detections)
-        pred_class_boxes = pred_class_boxes[sort_ind]  # (n_class_detections, 4)
-
-        # In the order of decreasing scores, check if true or false positive
-        gt_positives = zeros(
-            (n_class_detections,), dtype=pred_class_boxes.dtype, device=pred_class_boxes.device
-        )  # (n_class_detections)
-        false_positives = zeros(
-            (n_class_detections,), dtype=pred_class_boxes.dtype, device=pred_class_boxes.device
-        )  # (n_class_detections)
-        for d in range(n_class_detections):
-            this_detection_box = pred_class_boxes[d].unsqueeze(0)  # (1, 4)
-            this_image = pred_class_images[d]  # (), scalar
-
-            # Find objects in the image with this class, their difficulties, and whether they have been detected before
-            object_boxes = gt_class_boxes[gt_class_images == this_image]  # (n_class_objects_in_img)
-            # If no such object in this image, then the detection is a false positive
-            if object_boxes.size(0) == 0:
-                false_positives[d] = 1
-                continue
-
-            # Find maximum overlap of this detection with objects in this image of this class
-            overlaps = mean_iou_bbox(this_detection_box, object_boxes)  # (1, n_class_objects_in_img)
-            max_overlap, ind = torch.max(overlaps.squeeze(0), dim=0)  # (), () - scalars
-
-            # 'ind' is the index of the object in these image-level tensors 'object_boxes', 'object_difficulties'
-            # In the original class-level tensors 'gt_class_boxes', etc., 'ind' corresponds to object with index...
-            original_ind = tensor(
-                range(gt_class_boxes.size(0)), device=gt_class_boxes_detected.device, dtype=torch.long
-            )[gt_class_images == this_image][ind]
-            # We need 'original_ind' to update 'gt_class_boxes_detected'
-
-            # If the maximum overlap is greater than the threshold of 0.5, it's a match
-            if max_overlap.item() > threshold:
-                # If this object has already not been detected, it's a true positive
-                if gt_class_boxes_detected[original_ind] == 0:
-                    gt_positives[d] = 1
-                    gt_class_boxes_detected[original_ind] = 1  # this object has now been detected/accounted for
-                # Otherwise, it's a false positive (since this object is already accounted for)
-                else:
-                    false_positives[d] = 1
-            # Otherwise, the detection occurs in a different location than the actual object, and is a false positive
-            else:
-                false_positives[d] = 1
+    metric = MeanAveragePrecision(n_classes, threshold)
+    metric.update(pred_boxes, pred_labels, pred_scores, gt_boxes, gt_labels)
+    return metric.compute()
+
+
+class MeanAveragePrecision:
+    """Accumulate the detections of an evaluation and compute their Mean Average Precision (mAP).
+
+    Every call to :meth:`update` matches the detections of a batch of images to their ground truth, for all the
+    IoU thresholds at once, and only keeps the labels, scores and true positive flags of the detections. The
+    precision-recall curves are built once, by :meth:`compute`, over all the accumulated batches. The results are
+    the same as calling :func:`mean_average_precision` on all the images.
+
+    Background class (0 index) is excluded.
+
+    Args:
+        n_classes: the number of classes.
+        thresholds: the IoU threshold, or sequence of thresholds, above which a detection can be a positive.
+            With several thresholds, the precisions are averaged over them, e.g. ``[0.5, 0.55, ..., 0.95]`` for the
+            COCO mAP.
+
+    Example:
+        >>> metric = MeanAveragePrecision(n_classes=2, thresholds=[0.5, 0.75])
+        >>> boxes, labels, scores = torch.tensor([[100, 50, 150, 100.]]), torch.tensor([1]), torch.tensor([.7])
+        >>> gt_boxes, gt_labels = torch.tensor([[100, 50, 150, 80.]]), torch.tensor([1])
+        >>> metric.update([boxes], [labels], [scores], [gt_boxes], [gt_labels])
+        >>> metric.compute()
+        (tensor(0.5000), {1: 0.5})
+        >>> metric.average_precisions()
+        tensor([[1.],
+                [0.]])
+
+    """
+
+    def __init__(self, n_classes: int, thresholds: Union[float, Sequence[float]] = 0.5) -> None:
+        self.n_classes = n_classes
+        self.thresholds = [thresholds] if isinstance(thresholds, (float, int)) else list(thresholds)
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the accumulated detections."""
+        self._labels: List[Tensor] = []
+        self._scores: List[Tensor] = []
+        self._true_positives: List[Tensor] = []
+        self._num_gt: int = 0
+        self._dtype: Optional[torch.dtype] = None
+        self._device: Optional[torch.device] = None
+
+    def update(
+        self,
+        pred_boxes: List[Tensor],
+        pred_labels: List[Tensor],
+        pred_scores: List[Tensor],
+        gt_boxes: List[Tensor],
+        gt_labels: List[Tensor],
+    ) -> None:
+        """Match the detections of a batch of images to their ground truth and accumulate them.
+
+        Args:
+            pred_boxes: a tensor list of predicted bounding boxes.
+            pred_labels: a tensor list of predicted labels.
+            pred_scores: a tensor list of predicted labels' scores.
+            gt_boxes: a tensor list of ground truth bounding boxes.
+            gt_labels: a tensor list of ground truth labels.
+
+        """
+        # these are all lists of tensors of the same length, i.e. number of images
+        if not len(pred_boxes) == len(pred_labels) == len(pred_scores) == len(gt_boxes) == len(gt_labels):
+            raise AssertionError
+        if len(pred_boxes) == 0:
+            return
+
+        self._dtype = pred_boxes[0].dtype
+        self._device = pred_boxes[0].device
+        self._num_gt += sum(int(boxes.shape[0]) for boxes in gt_boxes)
+        thresholds = tensor(self.thresholds, device=self._device, dtype=self._dtype)
+        labels, scores, true_positives = _match_detections(
+            pred_boxes, pred_labels, pred_scores, gt_boxes, gt_labels, thresholds
+        )
+        self._labels.append(labels)
+        self._scores.append(scores)
+        self._true_positives.append(true_positives)
+
+    def average_precisions(self) -> Tensor:
+        """Compute the average precision of every IoU threshold and class.
+
+        Returns:
+            the 11-point interpolated average precisions with shape :math:`(T, C - 1)`, for the
+            :math:`T` thresholds and the :math:`C` classes but the background.
+
+        """
+        dtype = self._dtype if self._dtype is not None else torch.get_default_dtype()
+        num_thresholds, num_classes = len(self.thresholds), self.n_classes - 1
+        if not self._labels:
+            return zeros((num_thresholds, num_classes), device=self._device, dtype=dtype)
+
+        labels = concatenate(self._labels, 0)
+        scores = concatenate(self._scores, 0)
+        true_positives = concatenate(self._true_positives, 1)
+        keep = (labels >= 1) & (labels < self.n_classes)
+        labels, scores, true_positives = labels[keep], scores[keep], true_positives[:, keep]
+        if labels.numel() == 0:
+            return zeros((num_thresholds, num_classes), device=self._device, dtype=dtype)
+
+        # group the detections per class, in decreasing order of score
+        order = torch.sort(scores, descending=True, stable=True).indices
+        order = order[torch.sort(labels[order], stable=True).indices]
+        classes, true_positives = labels[order] - 1, true_positives[:, order]
+
+        # scatter them into a (T, n_classes - 1, max detections per class) padded tensor
+        counts = torch.bincount(classes, minlength=num_classes)
+        position = torch.arange(classes.shape[0], device=classes.device) - (torch.cumsum(counts, 0) - counts)[classes]
+        shape = (num_thresholds, num_classes, int(counts.max()))
+        gt_positives = zeros(shape, device=classes.device, dtype=dtype)
+        false_positives = zeros(shape, device=classes.device, dtype=dtype)
+        gt_positives[:, classes, position] = true_positives.to(dtype)
+        false_positives[:, classes, position] = (~true_positives).to(dtype)
 
         # Compute cumulative precision and recall at each detection in the order of decreasing scores
-        cumul_gt_positives = torch.cumsum(gt_positives, dim=0)  # (n_class_detections)
-        cumul_false_positives = torch.cumsum(false_positives, dim=0)  # (n_class_detections)
-        cumul_precision = cumul_gt_positives / (
-            cumul_gt_positives + cumul_false_positives + 1e-10
-        )  # (n_class_detections)
-        cumul_recall = cumul_gt_positives / _gt_boxes.size(0)  # (n_class_detections)
-
-        # Find the mean of the maximum of the precisions corresponding to recalls above the threshold 't'
-        recall_thresholds = torch.arange(start=0, end=1.1, step=0.1).tolist()  # (11)
-        precisions = zeros((len(recall_thresholds)), device=_gt_boxes.device, dtype=_gt_boxes.dtype)  # (11)
-        for i, t in enumerate(recall_thresholds):
-            recalls_above_t = cumul_recall >= t
-            if recalls_above_t.any():
-                precisions[i] = cumul_precision[recalls_above_t].max()
-            else:
-                precisions[i] = 0.0
-        average_precisions[c - 1] = precisions.mean()  # c is in [1, n_classes - 1]
-
-    # Calculate Mean Average Precision (mAP)
-    mean_ap = average_precisions.mean()
-
-    # Keep class-wise average precisions in a dictionary
-    ap_dict = {c + 1: float(v) for c, v in enumerate(average_precisions.tolist())}
-
-    return mean_ap, ap_dict
+        cumul_gt_positives = torch.cumsum(gt_positives, dim=-1)
+        cumul_false_positives = torch.cumsum(false_positives, dim=-1)
+        cumul_precision = cumul_gt_positives / (cumul_gt_positives + cumul_false_positives + 1e-10)
+        cumul_recall = cumul_gt_positives / self._num_gt
+
+        # the padding has no precision, and a recall above all the thresholds to keep the recalls sorted
+        is_detection = torch.arange(shape[-1], device=classes.device) < counts[:, None]
+        cumul_precision = torch.where(is_detection, cumul_precision, zeros((), device=classes.device, dtype=dtype))
+        cumul_recall = torch.where(is_detection, cumul_recall, tensor(float("inf"), device=classes.device, dtype=dtype))
+
+        # Find the mean of the maximum of the precisions corresponding to recalls above the threshold 't', which is
+        # the running maximum from the end taken at the first detection reaching 't'
+        max_precision = cumul_precision.flip(-1).cummax(-1).values.flip(-1)
+        max_precision = torch.nn.functional.pad(max_precision, [0, 1])
+        recall_thresholds = torch.arange(start=0, end=1.1, step=0.1).to(classes.device, dtype)  # (11)
+        first = torch.searchsorted(
+            cumul_recall.contiguous(), recall_thresholds.expand(num_thresholds, num_classes, -1).contiguous()
+        )
+        return max_precision.gather(-1, first).mean(-1)
+
+    def compute(self) -> Tuple[Tensor, Dict[int, float]]:
+        """Compute the Mean Average Precision (mAP) of the accumulated detections.
+
+        Returns:
+            mean average precision (mAP), list of average precisions for each class, both averaged over the
+            IoU thresholds.
+
+        """
+        average_precisions = self.average_precisions().mean(0)
+        ap_dict = {c + 1: float(v) for c, v in enumerate(average_precisions.tolist())}
+        return average_precisions.mean(), ap_dict
+
+
+def _pairwise_iou(boxes_1: Tensor, boxes_2: Tensor) -> Tensor:
+    """Compute the IoU of every pair of boxes, as :func:`mean_iou_bbox`, for a batch of images.
+
+    Args:
+        boxes_1: boxes in (x1, y1, x2, y2) format with shape :math:`(B, N_1, 4)`.
+        boxes_2: boxes in (x1, y1, x2, y2) format with shape :math:`(B, N_2, 4)`.
+
+    Returns:
+        the IoUs with shape :math:`(B, N_1, N_2)`.
+
+    """
+    lower_bounds = torch.max(boxes_1[..., :2].unsqueeze(2), boxes_2[..., :2].unsqueeze(1))  # (B, n1, n2, 2)
+    upper_bounds = torch.min(boxes_1[..., 2:].unsqueeze(2), boxes_2[..., 2:].unsqueeze(1))  # (B, n1, n2, 2)
+    intersection_dims = torch.clamp(upper_bounds - lower_bounds, min=0)  # (B, n1, n2, 2)
+    intersection = intersection_dims[..., 0] * intersection_dims[..., 1]  # (B, n1, n2)
+    areas_set_1 = (boxes_1[..., 2] - boxes_1[..., 0]) * (boxes_1[..., 3] - boxes_1[..., 1])  # (B, n1)
+    areas_set_2 = (boxes_2[..., 2] - boxes_2[..., 0]) * (boxes_2[..., 3] - boxes_2[..., 1])  # (B, n2)
+    union = areas_set_1.unsqueeze(2) + areas_set_2.unsqueeze(1) - intersection  # (B, n1, n2)
+    return intersection / union
+
+
+def _match_detections(
+    pred_boxes: List[Tensor],
+    pred_labels: List[Tensor],
+    pred_scores: List[Tensor],
+    gt_boxes: List[Tensor],
+    gt_labels: List[Tensor],
+    thresholds: Tensor,
+) -> Tuple[Tensor, Tensor, Tensor]:
+    """Flag the true positive detections of a batch of images, for several IoU thresholds at once.
+
+    In the order of decreasing scores, a detection is a true positive if its best overlapping ground truth object
+    of the same class is above the threshold and has not been detected yet. The first detection of every object is
+    found for all the images and thresholds with a single stable sort.
+
+    Returns:
+        the labels and scores of all the detections with shape :math:`(D,)`, and their true positive flags with
+        shape :math:`(T, D)`.
+
+    """
+    device = pred_boxes[0].device
+    num_images = len(pred_boxes)
+    num_preds = tensor([int(labels.shape[0]) for labels in pred_labels], device=device)
+    # pad the images to the same number of detections and objects, the padded ones never share a label
+    boxes = pad_sequence(pred_boxes, batch_first=True)  # (B, max_preds, 4)
+    labels = pad_sequence(pred_labels, batch_first=True, padding_value=-1)  # (B, max_preds)
+    scores = pad_sequence(pred_scores, batch_first=True)  # (B, max_preds)
+    objects = pad_sequence(gt_boxes, batch_first=True)  # (B, max_gt, 4)
+    object_labels = pad_sequence(gt_labels, batch_first=True, padding_value=-2)  # (B, max_gt)
+    max_gt = objects.shape[1]
+
+    if max_gt > 0:
+        # Find maximum overlap of every detection with objects in its image of its class
+        overlaps = _pairwise_iou(boxes, objects)
+        overlaps = torch.where(labels[:, :, None] == object_labels[:, None, :], overlaps, -torch.ones_like(overlaps))
+        max_overlap, ind = torch.max(overlaps, dim=-1)  # (B, max_preds)
+    else:
+        max_overlap = -torch.ones_like(scores)
+        ind = torch.zeros_like(labels)
+    # the index of the object among all the objects of the batch
+    object_ids = ind + torch.arange(num_images, device=device)[:, None] * max_gt
+
+    is_pred = torch.arange(boxes.shape[1], device=device) < num_preds[:, None]
+    labels, scores, max_overlap, object_ids = (
+        labels[is_pred],
+        scores[is_pred],
+        max_overlap[is_pred],
+        object_ids[is_pred],
+    )
+
+    # In the order of decreasing scores, the first detection overlapping an object enough is a true positive, the
+    # next ones are false positives since this object is already accounted for
+    order = torch.sort(scores, descending=True, stable=True).indices
+    labels, scores, max_overlap, object_ids = labels[order], scores[order], max_overlap[order], object_ids[order]
+    is_match = max_overlap[None] > thresholds[:, None]  # (T, D)
+    threshold_offsets = torch.arange(thresholds.shape[0], device=device)[:, None] * (num_images * max_gt)
+    keys = torch.where(is_match, object_ids[None] + threshold_offsets, -torch.ones_like(object_ids[None])).flatten()
+    sorted_keys, perm = torch.sort(keys, stable=True)
+    is_first = torch.ones_like(sorted_keys, dtype=torch.bool)
+    is_first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    is_first = torch.empty_like(is_first).scatter_(0, perm, is_first)
+    true_positives = is_match & is_first.view_as(is_match)
+    return labels, scores, true_positives
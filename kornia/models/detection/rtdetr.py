@@ -50,6 +50,7 @@ class RTDETRDetectorBuilder:
         image_size: Optional[int] = None,
         confidence_threshold: Optional[float] = None,
         confidence_filtering: Optional[bool] = None,
+        nms_threshold: Optional[float] = None,
     ) -> ObjectDetector:
         """Build and returns an RT-DETR object detector model.
 
@@ -70,7 +71,7 @@ class RTDETRDetectorBuilder:
                 [480, 512, 544, 576, 608, 640, 672, 704, 736, 768, 800].
             confidence_threshold: Threshold to filter results based on confidence scores.
             confidence_filtering: Whether to filter results based on confidence scores.
-
+            nms_threshold: If given, the IoU threshold of a class-aware non-maxima suppression of the filtered results.
 
         Returns:
             ObjectDetector
@@ -106,5 +107,6 @@ class RTDETRDetectorBuilder:
                 confidence_filtering=confidence_filtering or not torch.onnx.is_in_onnx_export(),
                 num_classes=model.decoder.num_classes,
                 num_top_queries=model.decoder.num_queries,
+                nms_threshold=nms_threshold,
             ),
         )
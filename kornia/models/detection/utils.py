@@ -17,8 +17,11 @@
 
 from typing import Any, ClassVar, List, Optional, Tuple, Union
 
-from kornia.core import Module, Tensor, rand, tensor
+import torch
+
+from kornia.core import Module, Tensor, concatenate, rand, tensor, where, zeros
 from kornia.core.mixin.onnx import ONNXExportMixin
+from kornia.geometry.bbox import batched_nms
 
 __all__ = ["BoxFiltering"]
 
@@ -30,6 +33,8 @@ class BoxFiltering(Module, ONNXExportMixin):
         confidence_threshold: an 0-d scalar that represents the desired threshold.
         classes_to_keep: a 1-d list of classes to keep. If None, keep all classes.
         filter_as_zero: whether to filter boxes as zero.
+        nms_threshold: if given, the IoU threshold of a class-aware non-maxima suppression applied to the boxes
+            which pass the confidence and class filtering. See :func:`kornia.geometry.bbox.batched_nms`.
 
     """
 
@@ -42,9 +47,11 @@ class BoxFiltering(Module, ONNXExportMixin):
         confidence_threshold: Optional[Union[Tensor, float]] = None,
         classes_to_keep: Optional[Union[Tensor, List[int]]] = None,
         filter_as_zero: bool = False,
+        nms_threshold: Optional[float] = None,
     ) -> None:
         super().__init__()
         self.filter_as_zero = filter_as_zero
+        self.nms_threshold = nms_threshold
         self.classes_to_keep = None
         self.confidence_threshold = None
         if classes_to_keep is not None:
@@ -97,6 +104,10 @@ class BoxFiltering(Module, ONNXExportMixin):
         # Combine the confidence and class masks
         combined_mask = confidence_mask & class_mask  # [B, D]
 
+        # Apply class-aware non-maxima suppression
+        if self.nms_threshold is not None:
+            combined_mask = combined_mask & self._nms_mask(boxes, combined_mask)
+
         if self.filter_as_zero:
             filtered_boxes = boxes * combined_mask[:, :, None]
             return filtered_boxes
@@ -110,6 +121,16 @@ class BoxFiltering(Module, ONNXExportMixin):
 
         return filtered_boxes_list
 
+    def _nms_mask(self, boxes: Tensor, mask: Tensor) -> Tensor:
+        """Return the mask of the boxes kept by the non-maxima suppression among the boxes in the mask."""
+        num_boxes = boxes.shape[1]
+        xy, wh = boxes[:, :, 2:4], boxes[:, :, 4:6]
+        scores = where(mask, boxes[:, :, 1], tensor(-float("inf"), device=boxes.device, dtype=boxes.dtype))
+        keep, _ = batched_nms(concatenate([xy, xy + wh], -1), scores, self.nms_threshold, idxs=boxes[:, :, 0])
+        keep_mask = zeros(boxes.shape[0], num_boxes + 1, device=boxes.device, dtype=torch.bool)
+        keep_mask.scatter_(1, where(keep >= 0, keep, num_boxes), True)
+        return keep_mask[:, :num_boxes]
+
     def _create_dummy_input(
         self, input_shape: List[int], pseudo_shape: Optional[List[int]] = None
     ) -> Union[Tuple[Any, ...], Tensor]:
@@ -15,7 +15,8 @@
 # limitations under the License.
 #
 
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 import torch
 import torch.nn.functional as F
@@ -29,6 +30,97 @@ def _neight2channels_like_kernel(kernel: torch.Tensor) -> torch.Tensor:
     return kernel.view(h * w, 1, h, w)
 
 
+@lru_cache(maxsize=64)
+def _decompose_flat_se(support: Tuple[Tuple[bool, ...], ...]) -> Tuple[Tuple[int, int, int, int], ...]:
+    """Decompose the support of a flat structuring element into a union of rectangles.
+
+    Every row of the support is split into runs of consecutive elements, and identical runs of consecutive rows
+    are merged. A rectangular support gives a single rectangle.
+
+    Returns:
+        the rectangles as ``(y0, y1, x0, x1)`` tuples, with inclusive bounds.
+
+    """
+    rectangles: List[Tuple[int, int, int, int]] = []
+    open_runs: dict = {}
+    for y, row in enumerate(support):
+        runs = []
+        x = 0
+        while x < len(row):
+            if row[x]:
+                x0 = x
+                while x < len(row) and row[x]:
+                    x += 1
+                runs.append((x0, x - 1))
+            else:
+                x += 1
+        next_runs = {}
+        for run in runs:
+            next_runs[run] = open_runs.pop(run, y)
+        for (x0, x1), y0 in open_runs.items():
+            rectangles.append((y0, y - 1, x0, x1))
+        open_runs = next_runs
+    for (x0, x1), y0 in open_runs.items():
+        rectangles.append((y0, len(support) - 1, x0, x1))
+    return tuple(sorted(rectangles))
+
+
+def _running_max_1d(tensor: torch.Tensor, size: int, dim: int) -> torch.Tensor:
+    """Max over the sliding windows of length ``size`` along ``dim``, with the van Herk/Gil-Werman algorithm.
+
+    The input is split into blocks of length ``size``, whose prefix and suffix maxima give every window maximum
+    with a single comparison, independently of ``size``. The output is ``size - 1`` shorter along ``dim``.
+    """
+    if size == 1:
+        return tensor
+    tensor = tensor.movedim(dim, -1)
+    length = tensor.shape[-1]
+    out_length = length - size + 1
+    num_blocks = -(-length // size)
+    blocks = F.pad(tensor, [0, num_blocks * size - length], value=float("-inf"))
+    blocks = blocks.reshape(*tensor.shape[:-1], num_blocks, size)
+    prefix = blocks.cummax(-1)[0].flatten(-2)
+    suffix = blocks.flip(-1).cummax(-1)[0].flip(-1).flatten(-2)
+    out = torch.maximum(suffix[..., :out_length], prefix[..., size - 1 : size - 1 + out_length])
+    return out.movedim(-1, dim)
+
+
+@torch.jit.ignore
+def _flat_morphology_vhgw(
+    padded: torch.Tensor, kernel: torch.Tensor, structuring_element: Optional[torch.Tensor], dilate: bool
+) -> torch.Tensor:
+    """Dilate or erode an already padded tensor with a flat structuring element, in 1D van Herk/Gil-Werman passes.
+
+    The support of the structuring element is decomposed into rectangles, cached by :func:`_decompose_flat_se`,
+    and each rectangle is processed with two separable passes whose cost does not depend on its size.
+    """
+    se_h, se_w = kernel.shape
+    offset = 0.0
+    if structuring_element is not None:
+        values = structuring_element[kernel != 0]
+        if values.numel() > 0:
+            offset = float(values[0])
+            if not bool((values == offset).all()):
+                raise ValueError("The vhgw engine only supports flat structuring elements.")
+
+    # the dilation reflects the structuring element, and the erosion is computed as a dilation of the negation
+    support = kernel.flip((0, 1)) if dilate else kernel
+    rectangles = _decompose_flat_se(tuple(tuple(row) for row in (support != 0).tolist()))
+    x = padded if dilate else -padded
+    height, width = x.shape[-2] - se_h + 1, x.shape[-1] - se_w + 1
+
+    output = torch.full((*x.shape[:-2], height, width), float("-inf"), device=x.device, dtype=x.dtype)
+    row_max_cache = {}
+    for y0, y1, x0, x1 in rectangles:
+        if (x0, x1) not in row_max_cache:
+            row_max_cache[(x0, x1)] = _running_max_1d(x[..., x0 : x1 + width], x1 - x0 + 1, -1)
+        output = torch.maximum(
+            output, _running_max_1d(row_max_cache[(x0, x1)][..., y0 : y1 + height, :], y1 - y0 + 1, -2)
+        )
+
+    return output + offset if dilate else -output - offset
+
+
 def dilation(
     tensor: torch.Tensor,
     kernel: torch.Tensor,
@@ -59,7 +151,8 @@ def dilation(
             outside the image when applying the operation.
         border_value: Value to fill past edges of input if ``border_type`` is ``constant``.
         max_val: The value of the infinite elements in the kernel.
-        engine: convolution is faster and less memory hungry, and unfold is more stable numerically
+        engine: convolution is faster and less memory hungry, and unfold is more stable numerically. vhgw only
+            supports flat structuring elements, and its cost does not depend on their size.
 
     Returns:
         Dilated image with shape :math:`(B, C, H, W)`.
@@ -117,8 +210,10 @@ def dilation(
             output.view(B * C, 1, h_pad, w_pad), reshape_kernel, padding=0, bias=neighborhood.view(-1).flip(0)
         ).max(dim=1)
         output = output.view(B, C, H, W)
+    elif engine == "vhgw":
+        output = _flat_morphology_vhgw(output, kernel, structuring_element, True)
     else:
-        raise NotImplementedError(f"engine {engine} is unknown, use 'convolution' or 'unfold'")
+        raise NotImplementedError(f"engine {engine} is unknown, use 'convolution', 'unfold' or 'vhgw'")
     return output.view_as(tensor)
 
 
@@ -152,7 +247,8 @@ def erosion(
             outside the image when applying the operation.
         border_value: Value to fill past edges of input if border_type is ``constant``.
         max_val: The value of the infinite elements in the kernel.
-        engine: ``convolution`` is faster and less memory hungry, and ``unfold`` is more stable numerically
+        engine: ``convolution`` is faster and less memory hungry, and ``unfold`` is more stable numerically.
+            ``vhgw`` only supports flat structuring elements, and its cost does not depend on their size.
 
     Returns:
         Eroded image with shape :math:`(B, C, H, W)`.
@@ -210,8 +306,10 @@ def erosion(
             output.view(B * C, 1, Hpad, Wpad), reshape_kernel, padding=0, bias=-neighborhood.view(-1)
         ).min(dim=1)
         output = output.view(B, C, H, W)
+    elif engine == "vhgw":
+        output = _flat_morphology_vhgw(output, kernel, structuring_element, False)
     else:
-        raise NotImplementedError(f"engine {engine} is unknown, use 'convolution' or 'unfold'")
+        raise NotImplementedError(f"engine {engine} is unknown, use 'convolution', 'unfold' or 'vhgw'")
 
     return output
 
@@ -246,7 +344,8 @@ def opening(
             outside the image when applying the operation.
         border_value: Value to fill past edges of input if ``border_type`` is ``constant``.
         max_val: The value of the infinite elements in the kernel.
-        engine: convolution is faster and less memory hungry, and unfold is more stable numerically
+        engine: convolution is faster and less memory hungry, and unfold is more stable numerically. vhgw only
+            supports flat structuring elements, and its cost does not depend on their size.
 
     Returns:
        torch.Tensor: Opened image with shape :math:`(B, C, H, W)`.
@@ -323,7 +422,8 @@ def closing(
             outside the image when applying the operation.
         border_value: Value to fill past edges of input if ``border_type`` is ``constant``.
         max_val: The value of the infinite elements in the kernel.
-        engine: convolution is faster and less memory hungry, and unfold is more stable numerically
+        engine: convolution is faster and less memory hungry, and unfold is more stable numerically. vhgw only
+            supports flat structuring elements, and its cost does not depend on their size.
 
     Returns:
        Closed image with shape :math:`(B, C, H, W)`.
@@ -402,7 +502,8 @@ def gradient(
             outside the image when applying the operation.
         border_value: Value to fill past edges of input if ``border_type`` is ``constant``.
         max_val: The value of the infinite elements in the kernel.
-        engine: convolution is faster and less memory hungry, and unfold is more stable numerically
+        engine: convolution is faster and less memory hungry, and unfold is more stable numerically. vhgw only
+            supports flat structuring elements, and its cost does not depend on their size.
 
     Returns:
        Gradient image with shape :math:`(B, C, H, W)`.
@@ -470,7 +571,8 @@ def top_hat(
             outside the image when applying the operation.
         border_value: Value to fill past edges of input if ``border_type`` is ``constant``.
         max_val: The value of the infinite elements in the kernel.
-        engine: convolution is faster and less memory hungry, and unfold is more stable numerically
+        engine: convolution is faster and less memory hungry, and unfold is more stable numerically. vhgw only
+            supports flat structuring elements, and its cost does not depend on their size.
 
     Returns:
        Top hat transformed image with shape :math:`(B, C, H, W)`.
@@ -541,7 +643,8 @@ def bottom_hat(
             outside the image when applying the operation.
         border_value: Value to fill past edges of input if ``border_type`` is ``constant``.
         max_val: The value of the infinite elements in the kernel.
-        engine: convolution is faster and less memory hungry, and unfold is more stable numerically
+        engine: convolution is faster and less memory hungry, and unfold is more stable numerically. vhgw only
+            supports flat structuring elements, and its cost does not depend on their size.
 
     Returns:
        Top hat transformed image with shape :math:`(B, C, H, W)`.
@@ -21,7 +21,7 @@ import torch
 from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
 from typing_extensions import TypeGuard
 
-from kornia.core import Device, Tensor, stack
+from kornia.core import Device, Tensor, concatenate, tensor
 from kornia.geometry.camera import PinholeCamera
 from kornia.io import ImageLoadType, load_image
 from kornia.nerf.core import Images, ImageTensors
@@ -56,7 +56,9 @@ class RayDataset(Dataset[RayGroup]):
     ) -> None:
         super().__init__()
         self._ray_sampler: Optional[RaySampler] = None
-        self._imgs: Optional[List[Tensor]] = None
+        self._imgs: Optional[Tensor] = None  # (N, 3) pixels of all the images
+        self._img_offsets: Optional[Tensor] = None  # (B) index of the first pixel of each image
+        self._img_widths: Optional[Tensor] = None  # (B)
         self._cameras = cameras
         self._min_depth = min_depth
         self._max_depth = max_depth
@@ -96,8 +98,12 @@ class RayDataset(Dataset[RayGroup]):
 
         self._check_dimensions(images)
 
-        # Move images to defined device
-        self._imgs = [img.to(self._device) for img in images]
+        # Pack the images, in their own dtype, into a single tensor of pixels on the defined device so that the
+        # colors of a batch of rays are gathered with one flat index
+        self._imgs = concatenate([img.to(self._device).permute(1, 2, 0).reshape(-1, 3) for img in images], 0)
+        num_pixels = tensor([img.shape[1] * img.shape[2] for img in images], device=self._imgs.device)
+        self._img_offsets = torch.cumsum(num_pixels, 0) - num_pixels
+        self._img_widths = tensor([img.shape[2] for img in images], device=self._imgs.device)
 
     def _init_random_ray_dataset(self, num_img_rays: Tensor) -> None:
         r"""Initialize a random ray sampler and calculates dataset ray parameters.
@@ -164,15 +170,13 @@ class RayDataset(Dataset[RayGroup]):
 
         origins = self._ray_sampler.origins[idxs]
         directions = self._ray_sampler.directions[idxs]
-        if self._imgs is None:
+        if self._imgs is None or self._img_offsets is None or self._img_widths is None:
             return origins, directions, None
 
-        camerd_ids = self._ray_sampler.camera_ids[idxs]
-        points_2d = self._ray_sampler.points_2d[idxs]
-        rgbs = None
-        imgs_for_ids = [self._imgs[i] for i in camerd_ids]
-        rgbs = stack([img[:, point2d[1].item(), point2d[0].item()] for img, point2d in zip(imgs_for_ids, points_2d)])
-        rgbs = rgbs.to(dtype=self._dtype) / 255.0
+        camera_ids = self._ray_sampler.camera_ids[idxs].to(self._imgs.device)
+        points_2d = self._ray_sampler.points_2d[idxs].to(self._imgs.device).long()
+        pixel_ids = self._img_offsets[camera_ids] + points_2d[..., 1] * self._img_widths[camera_ids] + points_2d[..., 0]
+        rgbs = self._imgs[pixel_ids].to(dtype=self._dtype) / 255.0
         return origins, directions, rgbs
 
 
@@ -25,7 +25,7 @@ from kornia.core import Module, Tensor
 from kornia.geometry.camera import PinholeCamera
 from kornia.geometry.ray import Ray
 from kornia.nerf.positional_encoder import PositionalEncoder
-from kornia.nerf.samplers import sample_lengths, sample_ray_points
+from kornia.nerf.samplers import sample_lengths, sample_lengths_from_weights, sample_ray_points
 from kornia.nerf.volume_renderer import IrregularRenderer, RegularRenderer
 from kornia.utils._compat import torch_inference_mode
 from kornia.utils.grid import create_meshgrid
@@ -84,6 +84,10 @@ class NerfModel(Module):
         num_unit_layers: Number of fully connected layers in each sub-unit.
         num_hidden: Layer hidden dimensions.
         log_space_encoding: Whether to apply log spacing for encoding.
+        num_fine_ray_points: Number of points to resample along rays where the first ``num_ray_points`` contribute
+            the most, following the hierarchical volume sampling of Mildenhall (2020) Sec. 5.2. Zero disables the
+            hierarchical sampling.
+        min_transmittance: Transmittance along a ray below which the fine points are not evaluated anymore.
 
     """
 
@@ -97,11 +101,16 @@ class NerfModel(Module):
         num_unit_layers: int = 4,
         num_hidden: int = 128,  # FIXME: add as call argument
         log_space_encoding: bool = True,
+        num_fine_ray_points: int = 0,
+        min_transmittance: float = 1.0e-4,
     ) -> None:
         super().__init__()
         self._num_ray_points = num_ray_points
+        self._num_fine_ray_points = num_fine_ray_points
+        self._min_transmittance = min_transmittance
         self._irregular_ray_sampling = irregular_ray_sampling
         self._renderer = IrregularRenderer() if self._irregular_ray_sampling else RegularRenderer()
+        self._fine_renderer = IrregularRenderer()
 
         self._pos_encoder = PositionalEncoder(3, num_pos_freqs, log_space=log_space_encoding)
         self._dir_encoder = PositionalEncoder(3, num_dir_freqs, log_space=log_space_encoding)
@@ -137,12 +146,68 @@ class NerfModel(Module):
             device=origins.device,
             dtype=origins.dtype,
             irregular=self._irregular_ray_sampling,
-        )  # FIXME: handle the case of hierarchical sampling
+        )
         points_3d = sample_ray_points(origins, directions, lengths)
 
-        # Encode positions & directions
-        points_3d_encoded = self._pos_encoder(points_3d)
+        # Encode directions, shared by all the points of a ray
         directions_encoded = self._dir_encoder(F.normalize(directions, dim=-1))
+        directions_encoded = directions_encoded[..., None, :].expand(-1, self._num_ray_points, -1)
+
+        rgbs_ray_points, densities_ray_points = self._evaluate(points_3d, directions_encoded)
+
+        if self._num_fine_ray_points <= 0:
+            # Rendering rgbs and densities along rays
+            return self._renderer(rgbs_ray_points, densities_ray_points, points_3d)
+
+        # Resample the rays where the coarse points contribute the most
+        weights = self._renderer.calc_weights(densities_ray_points.detach(), points_3d)[..., 0]  # (B, N)
+        fine_lengths = sample_lengths_from_weights(
+            lengths, weights, self._num_fine_ray_points, irregular=self._irregular_ray_sampling
+        )
+        fine_points_3d = sample_ray_points(origins, directions, fine_lengths)
+        fine_directions_encoded = directions_encoded[..., :1, :].expand(-1, self._num_fine_ray_points, -1)
+
+        # Early ray termination: skip the fine points behind the coarse point where the transmittance vanishes
+        is_visible = None
+        if self._min_transmittance > 0:
+            transmittance = 1 - torch.cumsum(weights, dim=-1)  # (B, N)
+            is_opaque = transmittance < self._min_transmittance
+            termination = torch.where(is_opaque, lengths, torch.full_like(lengths, float("inf"))).min(-1).values
+            is_visible = fine_lengths <= termination[..., None]  # (B, N_fine)
+
+        fine_rgbs, fine_densities = self._evaluate(fine_points_3d, fine_directions_encoded, is_visible)
+
+        # Render the coarse and fine points together, sorted along rays
+        order = torch.sort(torch.cat([lengths, fine_lengths], dim=-1), dim=-1).indices[..., None]  # (B, N_all, 1)
+        rgbs_ray_points = torch.cat([rgbs_ray_points, fine_rgbs], dim=-2).gather(-2, order.expand(-1, -1, 3))
+        densities_ray_points = torch.cat([densities_ray_points, fine_densities], dim=-2).gather(-2, order)
+        points_3d = torch.cat([points_3d, fine_points_3d], dim=-2).gather(-2, order.expand(-1, -1, 3))
+
+        return self._fine_renderer(rgbs_ray_points, densities_ray_points, points_3d)
+
+    def _evaluate(
+        self, points_3d: Tensor, directions_encoded: Tensor, mask: Tensor | None = None
+    ) -> tuple[Tensor, Tensor]:
+        """Evaluate the rgbs and densities of ray points.
+
+        Args:
+            points_3d: Ray points with shape :math:`(B, N, 3)`.
+            directions_encoded: Encoded ray directions of the points with shape :math:`(B, N, D)`.
+            mask: Points to evaluate with shape :math:`(B, N)`, the others have no color and density.
+
+        Returns:
+            - Ray point rgbs with shape :math:`(B, N, 3)`.
+            - Ray point densities with shape :math:`(B, N, 1)`.
+
+        """
+        if mask is not None:
+            rgbs = torch.zeros(*mask.shape, 3, device=points_3d.device, dtype=points_3d.dtype)
+            densities = torch.zeros(*mask.shape, 1, device=points_3d.device, dtype=points_3d.dtype)
+            rgbs[mask], densities[mask] = self._evaluate(points_3d[mask], directions_encoded[mask])
+            return rgbs, densities
+
+        # Encode positions
+        points_3d_encoded = self._pos_encoder(points_3d)
 
         # Map positional encodings to latent features (MLP with skip connections)
         y = self._mlp(points_3d_encoded)
@@ -154,22 +219,23 @@ class NerfModel(Module):
         densities_ray_points = torch.relu(densities_ray_points)  # FIXME: Revise this
 
         # Calculate ray point rgb values
-        y = torch.cat((y, directions_encoded[..., None, :].expand(-1, self._num_ray_points, -1)), dim=-1)
+        y = torch.cat((y, directions_encoded), dim=-1)
         y = self._fc2(y)
         rgbs_ray_points = self._rgb(y)
 
-        # Rendering rgbs and densities along rays
-        rgbs = self._renderer(rgbs_ray_points, densities_ray_points, points_3d)
-
-        # Return pixel point rendered rgb
-        return rgbs
+        return rgbs_ray_points, densities_ray_points
 
 
 class NerfModelRenderer:
     """Renders a novel synthesis view of a trained NeRF model for given camera."""
 
     def __init__(
-        self, nerf_model: NerfModel, image_size: tuple[int, int], device: torch.device | None, dtype: torch.dtype | None
+        self,
+        nerf_model: NerfModel,
+        image_size: tuple[int, int],
+        device: torch.device | None,
+        dtype: torch.dtype | None,
+        chunk_size: int | None = None,
     ) -> None:
         """Construct NerfModelRenderer.
 
@@ -178,12 +244,17 @@ class NerfModelRenderer:
             image_size: image size.
             device: device to run the model on.
             dtype: dtype to run the model on.
+            chunk_size: maximal number of rays to render at once, to bound the memory of large views. All the rays
+                of the view are rendered at once if None.
 
         """
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError(f"chunk_size must be a positive integer, got {chunk_size}.")
         self._nerf_model = nerf_model
         self._image_size = image_size
         self._device = device
         self._dtype = dtype
+        self._chunk_size = chunk_size
 
         self._pixels_grid, self._ones = self._create_pixels_grid()  # 1xHxWx2 and (H*W)x1
 
@@ -221,9 +292,15 @@ class NerfModelRenderer:
         # create ray for this camera
         rays: Ray = self._create_rays(camera)
 
-        # render the image
+        # render the image, by chunks of rays
+        chunk_size = self._chunk_size or rays.origin.shape[0]
         with torch_inference_mode():
-            rgb_model = self._nerf_model(rays.origin, rays.direction)
+            rgb_model = torch.cat(
+                [
+                    self._nerf_model(origins, directions)
+                    for origins, directions in zip(rays.origin.split(chunk_size), rays.direction.split(chunk_size))
+                ]
+            )
 
         rgb_image = rgb_model.view(self._image_size[0], self._image_size[1], 3)
 
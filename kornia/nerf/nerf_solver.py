@@ -90,6 +90,7 @@ class NerfSolver:
         irregular_ray_sampling: bool = True,
         log_space_encoding: bool = True,
         lr: float = 1.0e-3,
+        num_fine_ray_points: int = 0,
     ) -> None:
         """Initialize training settings and model.
 
@@ -105,6 +106,7 @@ class NerfSolver:
             irregular_ray_sampling: Whether to sample ray points irregularly.
             log_space_encoding: Whether frequency sampling should be log spaced.
             lr: Learning rate.
+            num_fine_ray_points: Number of points to resample along rays by hierarchical sampling, zero to disable it.
 
         """
         self._cameras = cameras
@@ -136,7 +138,10 @@ class NerfSolver:
         self._batch_size = batch_size
 
         self._nerf_model = NerfModel(
-            num_ray_points, irregular_ray_sampling=irregular_ray_sampling, log_space_encoding=log_space_encoding
+            num_ray_points,
+            irregular_ray_sampling=irregular_ray_sampling,
+            log_space_encoding=log_space_encoding,
+            num_fine_ray_points=num_fine_ray_points,
         )
         self._nerf_model.to(device=self._device, dtype=self._dtype)
 
@@ -431,7 +431,53 @@ def sample_lengths(
     return lengths
 
 
-# TODO: Implement hierarchical ray sampling as described in Mildenhall (2020) Sec. 5.2
+def sample_lengths_from_weights(
+    lengths: Tensor, weights: Tensor, num_ray_points: int, irregular: bool = True, eps: float = 1.0e-5
+) -> Tensor:
+    r"""Sample points along rays where a coarse sampling of the rays found the most contributing points.
+
+    Implements the hierarchical volume sampling of Mildenhall (2020) Sec. 5.2: the new lengths are drawn from the
+    piecewise-constant distribution of the coarse weights between the midpoints of the coarse lengths, by inverting
+    its cumulative distribution function.
+
+    Args:
+        lengths: coarse lengths sorted along each ray. Tensor shape :math:`(*, N)`.
+        weights: contribution of each coarse point to the rendered color of its ray. Tensor shape :math:`(*, N)`.
+        num_ray_points: number of lengths to sample along each ray.
+        irregular: whether to sample randomly, or regularly, the cumulative distribution function.
+        eps: weight added to every interval to sample rays without any density.
+
+    Returns:
+        lengths: sampled distances along each ray, without gradient. Tensor shape :math:`(*, num\_ray\_points)`.
+
+    """
+    if lengths.shape[-1] < 3:
+        raise ValueError("Number of coarse ray points must be greater than 2")
+    if num_ray_points < 1:
+        raise ValueError("Number of ray points must be positive")
+    lengths, weights = lengths.detach(), weights.detach().to(lengths.dtype)
+
+    # the weights of the inner points are spread between the midpoints of their neighbours
+    bins = (lengths[..., 1:] + lengths[..., :-1]) / 2  # (*, N - 1)
+    pdf = weights[..., 1:-1] + eps  # (*, N - 2)
+    pdf = pdf / pdf.sum(dim=-1, keepdim=True)
+    cdf = torch.cat([torch.zeros_like(pdf[..., :1]), torch.cumsum(pdf, dim=-1)], dim=-1)  # (*, N - 1)
+
+    if irregular:
+        u = torch.rand(*cdf.shape[:-1], num_ray_points, device=cdf.device, dtype=cdf.dtype)
+    else:
+        u = torch.linspace(0.0, 1.0, num_ray_points, device=cdf.device, dtype=cdf.dtype)
+        u = u.expand(*cdf.shape[:-1], num_ray_points).contiguous()
+
+    # invert the cumulative distribution function by a linear interpolation in its interval
+    above = torch.searchsorted(cdf.contiguous(), u, right=True)
+    below = torch.clamp(above - 1, min=0)
+    above = torch.clamp(above, max=cdf.shape[-1] - 1)
+    cdf_below, cdf_above = cdf.gather(-1, below), cdf.gather(-1, above)
+    bins_below, bins_above = bins.gather(-1, below), bins.gather(-1, above)
+    denom = cdf_above - cdf_below
+    denom = torch.where(denom < eps, torch.ones_like(denom), denom)
+    return bins_below + (u - cdf_below) / denom * (bins_above - bins_below)
 
 
 def sample_ray_points(
@@ -41,17 +41,38 @@ class VolumeRenderer(torch.nn.Module):
         super().__init__()
         self._shift = shift
 
-    def _render(self, alpha: Tensor, rgbs: Tensor) -> Tensor:
+    def _calc_weights(self, alpha: Tensor) -> Tensor:
         trans = torch.cumprod(1 - alpha + self._eps, dim=-2)  # (*, N, 1)
         trans = torch.roll(trans, shifts=self._shift, dims=-2)  # (*, N, 1)
         trans[..., : self._shift, :] = 1  # (*, N, 1)
 
         weights = trans * alpha  # (*, N, 1)
 
+        return weights
+
+    def _render(self, alpha: Tensor, rgbs: Tensor) -> Tensor:
+        weights = self._calc_weights(alpha)  # (*, N, 1)
+
         rgbs_rendered = torch.sum(weights * rgbs, dim=-2)  # (*, 3)
 
         return rgbs_rendered
 
+    def _calc_alpha(self, densities: Tensor, points_3d: Tensor) -> Tensor:
+        raise NotImplementedError
+
+    def calc_weights(self, densities: Tensor, points_3d: Tensor) -> Tensor:
+        r"""Calculate the contribution of points along rays to the rendered RGB values of the rays.
+
+        Args:
+            densities: Volume densities of points along rays :math:`(*, N)`
+            points_3d: 3D points along rays :math:`(*, N, 3)`
+
+        Returns:
+            Weights of the points along rays :math:`(*, N, 1)`
+
+        """
+        return self._calc_weights(self._calc_alpha(densities, points_3d))
+
     def forward(self, rgbs: Tensor, densities: Tensor, points_3d: Tensor) -> Tensor:
         raise NotImplementedError
 
@@ -71,6 +92,9 @@ class IrregularRenderer(VolumeRenderer):
             Rendered RGB values for each ray :math:`(*, 3)`
 
         """
+        return self._render(self._calc_alpha(densities, points_3d), rgbs)
+
+    def _calc_alpha(self, densities: Tensor, points_3d: Tensor) -> Tensor:
         t_vals = calc_ray_t_vals(points_3d)
         deltas = t_vals[..., 1:] - t_vals[..., :-1]  # (*, N - 1)
         far = torch.empty(size=t_vals.shape[:-1], dtype=t_vals.dtype, device=t_vals.device).fill_(self._huge)
@@ -78,7 +102,7 @@ class IrregularRenderer(VolumeRenderer):
 
         alpha = 1 - torch.exp(-1.0 * densities * deltas[..., None])  # (*, N)
 
-        return self._render(alpha, rgbs)
+        return alpha
 
 
 class RegularRenderer(VolumeRenderer):
@@ -100,6 +124,9 @@ class RegularRenderer(VolumeRenderer):
         KORNIA_CHECK_SHAPE(densities, ["*", "N"])
         KORNIA_CHECK_SHAPE(points_3d, ["*", "N", "3"])
 
+        return self._render(self._calc_alpha(densities, points_3d), rgbs)
+
+    def _calc_alpha(self, densities: Tensor, points_3d: Tensor) -> Tensor:
         num_ray_points: int = points_3d.shape[-2]
 
         points_3d = points_3d.reshape(-1, num_ray_points, 3)  # (*, N, 3)
@@ -109,4 +136,4 @@ class RegularRenderer(VolumeRenderer):
 
         alpha = 1 - torch.exp(-1.0 * densities * delta)  # (*, N)
 
-        return self._render(alpha, rgbs)
+        return alpha
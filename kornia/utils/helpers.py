@@ -25,6 +25,7 @@ from inspect import isclass, isfunction
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union, overload
 
 import torch
+import torch.nn.functional as F
 from torch.linalg import inv_ex
 
 from kornia.core import Tensor
@@ -195,6 +196,150 @@ def _torch_histc_cast(input: Tensor, bins: int, min: int, max: int) -> Tensor:
     return torch.histc(input.to(dtype), bins, min, max).to(input.dtype)
 
 
+def _scatter_histogram(bin_idx: Tensor, num_bins: int, weights: Optional[Tensor] = None) -> Tensor:
+    r"""Compute the histograms of all the rows of a tensor of bin indices at once.
+
+    The rows are offset to disjoint ranges of a single flat histogram, which is filled with one ``bincount``, or
+    one ``scatter_add`` when weights are given, instead of one launch per row.
+
+    Args:
+        bin_idx: integer bin of every element in :math:`[-1, num\_bins)` with shape :math:`(*, N)`. The elements
+          in the bin -1 are ignored.
+        num_bins: the number of bins.
+        weights: the value every element adds to its bin with shape :math:`(*, N)`. Counts the elements if ``None``.
+
+    Returns:
+        The histograms with shape :math:`(*, num\_bins)`, in the dtype of ``weights`` or as int64 counts.
+
+    """
+    num_elements = bin_idx.shape[-1]
+    flat_idx = bin_idx.reshape(-1, num_elements)
+    num_groups = flat_idx.shape[0]
+    # every row owns num_bins + 1 slots, the first one collects the ignored elements and is dropped afterwards
+    offsets = torch.arange(num_groups, device=bin_idx.device, dtype=flat_idx.dtype) * (num_bins + 1) + 1
+    flat_idx = (flat_idx + offsets[:, None]).reshape(-1)
+    size = num_groups * (num_bins + 1)
+    if weights is None:
+        hist = torch.bincount(flat_idx, minlength=size)
+    else:
+        hist = torch.zeros(size, device=weights.device, dtype=weights.dtype)
+        hist = hist.scatter_add(0, flat_idx, weights.reshape(-1))
+    # NOTE: TorchScript does not support starred expressions in lists
+    out_shape: List[int] = list(bin_idx.shape[:-1]) + [num_bins]  # noqa: RUF005
+    return hist.view(num_groups, num_bins + 1)[:, 1:].reshape(out_shape)
+
+
+def _torch_histc_batched(input: Tensor, bins: int, min: float, max: float) -> Tensor:
+    """Compute the ``torch.histc`` of every row of a tensor at once.
+
+    Args:
+        input: the values with shape :math:`(*, N)`, of any floating point dtype.
+        bins: the number of bins.
+        min: lower end of the range (inclusive).
+        max: upper end of the range (inclusive).
+
+    Returns:
+        The histograms with shape :math:`(*, bins)` in the dtype of the input, equal to applying
+        :func:`_torch_histc_cast` on every row.
+
+    """
+    dtype: torch.dtype = input.dtype
+    if dtype not in (torch.float32, torch.float64):
+        dtype = torch.float32
+    values = input.to(dtype)
+    if values.device.type == "cpu" and values.shape[-1] > 2048 and values.numel() > 0:
+        # without launch overheads, the histc kernel is faster than the scatter on long rows
+        rows = values.reshape(-1, values.shape[-1])
+        hist = torch.stack([torch.histc(row, bins, min, max) for row in rows])
+        return hist.reshape(list(input.shape[:-1]) + [bins]).to(input.dtype)  # noqa: RUF005
+    # same binning as histc, the upper end of the range falls into the last bin
+    bin_idx = (values - min).mul_(bins).div_(max - min).floor_()
+    # the values above the range, or NaN, are ignored as well as the ones below it
+    bin_idx = bin_idx.masked_fill_(values.le(max).logical_not_(), -1).clamp_(-1, bins - 1)
+    return _scatter_histogram(bin_idx.long(), bins).to(input.dtype)
+
+
+def _neighbours_min(labels: Tensor, fill_value: int, connectivity: int) -> Tensor:
+    """Return the minimum label among each pixel and its neighbours for a :math:`(B, H, W)` labels tensor."""
+    H, W = labels.shape[-2:]
+    padded = F.pad(labels, (1, 1, 1, 1), value=fill_value)
+    if connectivity == 8:
+        # the 3x3 min is separable
+        rows = torch.minimum(torch.minimum(padded[..., :-2], padded[..., 1:-1]), padded[..., 2:])
+        return torch.minimum(torch.minimum(rows[:, :-2], rows[:, 1:-1]), rows[:, 2:])
+    out = torch.minimum(labels, padded[:, 1 : H + 1, :W])
+    out = torch.minimum(out, padded[:, 1 : H + 1, 2:])
+    out = torch.minimum(out, padded[:, :H, 1 : W + 1])
+    return torch.minimum(out, padded[:, 2:, 1 : W + 1])
+
+
+def _propagate_min_labels(
+    mask: Tensor, connectivity: int = 8, check_every: int = 4, max_iterations: Optional[int] = None
+) -> Tensor:
+    r"""Label the connected components of a boolean mask by label equivalence with pointer jumping.
+
+    Each foreground pixel starts with its flat index as label. Every iteration hooks the root of each pixel to the
+    smallest label found in its neighbourhood, and compresses the paths by pointer jumping, so the number of
+    iterations grows with the logarithm of the components diameter. Convergence is checked, with a single host
+    synchronization, every ``check_every`` iterations.
+
+    Args:
+        mask: the foreground mask with shape :math:`(B, H, W)`.
+        connectivity: pixel connectivity, either 4 or 8.
+        check_every: number of iterations between the convergence checks.
+        max_iterations: maximum number of iterations. Default: :math:`H \cdot W`, which is never reached.
+
+    Returns:
+        the flat index of the component root, i.e. of its first pixel in raster scan order, for each pixel, with
+        shape :math:`(B, H, W)`. Background pixels are set to :math:`B \cdot H \cdot W`.
+
+    """
+    B, H, W = mask.shape
+    background = B * H * W
+    index = torch.arange(background, device=mask.device, dtype=torch.long).view(B, H, W)
+    labels = torch.where(mask, index, torch.full_like(index, background))
+    # the extra last entry is the background sentinel, pointing to itself
+    parents = torch.cat([labels.flatten(), labels.new_tensor([background])])
+    if max_iterations is None:
+        max_iterations = H * W
+    for i in range(max_iterations):
+        labels_prev = labels
+        neighbours = _neighbours_min(labels, background, connectivity)
+        neighbours = torch.where(mask, neighbours, labels)
+        # hooking: link the root of every pixel to the smallest neighbouring label
+        parents = parents.scatter_reduce(0, labels.flatten(), neighbours.flatten(), reduce="amin")
+        # pointer jumping
+        parents = parents[parents]
+        parents = parents[parents]
+        # background entries always point to the sentinel
+        labels = parents[:-1].view(B, H, W)
+        if (i + 1) % check_every == 0 and not bool((labels != labels_prev).any()):
+            break
+    return labels
+
+
+def _compact_labels(mask: Tensor, roots: Tensor) -> Tuple[Tensor, Tensor]:
+    r"""Turn the roots found by :func:`_propagate_min_labels` into consecutive labels.
+
+    Args:
+        mask: the foreground mask with shape :math:`(B, H \cdot W)`.
+        roots: the flat index of the component root of each pixel with shape :math:`(B, H \cdot W)`.
+
+    Returns:
+        the labels, ``0`` for the background and the rank of the root in raster scan order otherwise, and the number
+        of components of each image with shape :math:`(B,)`.
+
+    """
+    B, HW = mask.shape
+    offsets = HW * torch.arange(B, device=mask.device)[:, None]
+    is_root = mask & (roots == torch.arange(HW, device=mask.device) + offsets)
+    rank = is_root.long().cumsum(dim=1)
+    local_roots = (roots - offsets).clamp(0, max(HW - 1, 0))
+    labels = torch.where(mask, rank.gather(1, local_roots), torch.zeros_like(rank))
+    num_components = rank[:, -1] if HW > 0 else rank.new_zeros(B)
+    return labels, num_components
+
+
 def _torch_svd_cast(input: Tensor) -> Tuple[Tensor, Tensor, Tensor]:
     """Make torch.svd work with other than fp32/64.
 
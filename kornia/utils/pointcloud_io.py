@@ -16,18 +16,67 @@
 #
 
 import os
+import warnings
+from typing import BinaryIO, List, Optional, Tuple, Union
 
 import torch
 
+from kornia.core.external import numpy as np
 
-def save_pointcloud_ply(filename: str, pointcloud: torch.Tensor) -> None:
+# mapping between the PLY scalar types and the numpy ones
+_PLY_TO_NUMPY_TYPE = {
+    "char": "i1",
+    "int8": "i1",
+    "uchar": "u1",
+    "uint8": "u1",
+    "short": "i2",
+    "int16": "i2",
+    "ushort": "u2",
+    "uint16": "u2",
+    "int": "i4",
+    "int32": "i4",
+    "uint": "u4",
+    "uint32": "u4",
+    "float": "f4",
+    "float32": "f4",
+    "double": "f8",
+    "float64": "f8",
+}
+
+_PLY_FORMATS = {"ascii": "", "binary_little_endian": "<", "binary_big_endian": ">"}
+
+
+def _flatten_attribute(name: str, attribute: Optional[torch.Tensor], num_points: int) -> Optional[torch.Tensor]:
+    if attribute is None:
+        return None
+    if not torch.is_tensor(attribute):
+        raise TypeError(f"Input {name} type is not a torch.Tensor. Got {type(attribute)}")
+    if attribute.shape[-1] != 3 or attribute.numel() != 3 * num_points:
+        raise TypeError(f"Input {name} must have the same shape as the pointcloud. Got {attribute.shape}.")
+    return attribute.reshape(-1, 3)
+
+
+def save_pointcloud_ply(
+    filename: str,
+    pointcloud: torch.Tensor,
+    colors: Optional[torch.Tensor] = None,
+    normals: Optional[torch.Tensor] = None,
+    binary: bool = False,
+) -> None:
     r"""Save to disk a pointcloud in PLY format.
 
+    The points whose coordinates are all non finite are skipped. The data is written at once from a single
+    contiguous buffer.
+
     Args:
         filename: the path to save the pointcloud.
         pointcloud: tensor containing the pointcloud to save.
           The tensor must be in the shape of :math:`(*, 3)` where the last
           component is assumed to be a 3d point coordinate :math:`(X, Y, Z)`.
+        colors: optional tensor with the RGB color of every point with shape :math:`(*, 3)`. Floating point colors
+          are expected in the range :math:`[0, 1]`. They are saved as ``uchar``.
+        normals: optional tensor with the normal of every point with shape :math:`(*, 3)`.
+        binary: whether to save in the ``binary_little_endian`` format instead of the ``ascii`` one.
 
     """
     if not isinstance(filename, str) and filename[-3:] == ".ply":
@@ -39,64 +88,179 @@ def save_pointcloud_ply(filename: str, pointcloud: torch.Tensor) -> None:
     if not len(pointcloud.shape) >= 2 and pointcloud.shape[-1] == 3:
         raise TypeError(f"Input pointcloud must be in the following shape HxWx3. Got {pointcloud.shape}.")
 
-    # flatten the input pointcloud in a vector to iterate points
+    # flatten the input pointcloud in a vector of points
     xyz_vec: torch.Tensor = pointcloud.reshape(-1, 3)
+    colors_vec = _flatten_attribute("colors", colors, xyz_vec.shape[0])
+    normals_vec = _flatten_attribute("normals", normals, xyz_vec.shape[0])
+
+    # skip the points without any finite coordinate
+    is_valid = torch.isfinite(xyz_vec).any(-1)
+    if not bool(is_valid.all()):
+        xyz_vec = xyz_vec[is_valid]
+        colors_vec = colors_vec[is_valid] if colors_vec is not None else None
+        normals_vec = normals_vec[is_valid] if normals_vec is not None else None
+
+    # the coordinates are saved in double precision only for double precision inputs
+    coord_type = "double" if xyz_vec.dtype == torch.float64 else "float"
+    coord_dtype = _PLY_FORMATS["binary_little_endian"] + _PLY_TO_NUMPY_TYPE[coord_type]
+    fields: List[Tuple[str, str, torch.Tensor]] = [(coord_type, name, xyz_vec) for name in ("x", "y", "z")]
+    if normals_vec is not None:
+        fields += [(coord_type, name, normals_vec) for name in ("nx", "ny", "nz")]
+    if colors_vec is not None:
+        if colors_vec.is_floating_point():
+            colors_vec = (colors_vec * 255).round().clamp(0, 255)
+        fields += [("uchar", name, colors_vec.to(torch.uint8)) for name in ("red", "green", "blue")]
+
+    # pack all the properties in a single structured buffer
+    num_points: int = xyz_vec.shape[0]
+    struct_dtype = np.dtype([(name, coord_dtype if ply_type != "uchar" else "u1") for ply_type, name, _ in fields])
+    data = np.empty(num_points, dtype=struct_dtype)
+    for i, (_, name, values) in enumerate(fields):
+        data[name] = values[:, i % 3].detach().cpu().numpy()
+
+    header = ["ply", f"format {'binary_little_endian' if binary else 'ascii'} 1.0", "comment arraiy generated"]
+    header.append(f"element vertex {num_points}")
+    header += [f"property {ply_type} {name}" for ply_type, name, _ in fields]
+    header.append("end_header")
+
+    with open(filename, "wb") as f:
+        f.write(("\n".join(header) + "\n").encode("ascii"))
+        if binary:
+            data.tofile(f)
+        else:
+            float_fmt = "%.17g" if xyz_vec.dtype == torch.float64 else "%.9g"
+            fmt = " ".join(float_fmt if ply_type != "uchar" else "%d" for ply_type, _, _ in fields)
+            np.savetxt(f, data, fmt=fmt)
 
-    with open(filename, "w") as f:
-        data_str: str = ""
-        num_points: int = xyz_vec.shape[0]
-        for idx in range(num_points):
-            xyz = xyz_vec[idx]
-            if not bool(torch.isfinite(xyz).any()):
-                num_points -= 1
-                continue
-            x: float = float(xyz[0])
-            y: float = float(xyz[1])
-            z: float = float(xyz[2])
-            data_str += f"{x} {y} {z}\n"
-
-        f.write("ply\n")
-        f.write("format ascii 1.0\n")
-        f.write("comment arraiy generated\n")
-        f.write(f"element vertex {num_points}\n")
-        f.write("property double x\n")
-        f.write("property double y\n")
-        f.write("property double z\n")
-        f.write("end_header\n")
-        f.write(data_str)
-
-
-def load_pointcloud_ply(filename: str, header_size: int = 8) -> torch.Tensor:
+
+def _parse_ply_header(f: BinaryIO) -> Tuple[str, int, List[Tuple[str, str]]]:
+    """Parse the header of a PLY file, leaving the file positioned at the beginning of the data.
+
+    Returns:
+        the format, the number of vertices, and the type and name of the vertex properties.
+
+    """
+    if f.readline().strip() != b"ply":
+        raise ValueError("Input file is not a PLY file.")
+    ply_format: Optional[str] = None
+    num_vertices: Optional[int] = None
+    properties: List[Tuple[str, str]] = []
+    current_element: Optional[str] = None
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError("Input PLY file has no end_header.")
+        tokens = line.decode("ascii", errors="replace").split()
+        if not tokens or tokens[0] in ("comment", "obj_info"):
+            continue
+        if tokens[0] == "end_header":
+            break
+        if tokens[0] == "format":
+            ply_format = tokens[1]
+        elif tokens[0] == "element":
+            if current_element is None and tokens[1] != "vertex":
+                raise ValueError(f"The vertex element must be the first one of the PLY file. Got {tokens[1]}.")
+            current_element = tokens[1]
+            if current_element == "vertex":
+                num_vertices = int(tokens[2])
+        elif tokens[0] == "property" and current_element == "vertex":
+            if tokens[1] == "list":
+                raise ValueError("List properties are not supported for the vertex element.")
+            properties.append((tokens[1], tokens[2]))
+
+    if ply_format not in _PLY_FORMATS:
+        raise ValueError(f"Unsupported PLY format {ply_format}.")
+    if num_vertices is None:
+        raise ValueError("Input PLY file has no vertex element.")
+    return ply_format, num_vertices, properties
+
+
+def load_pointcloud_ply(
+    filename: str,
+    header_size: Optional[int] = None,
+    return_attributes: bool = False,
+    dtype: Optional[torch.dtype] = None,
+) -> Union[torch.Tensor, Tuple[torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor]]]:
     r"""Load from disk a pointcloud in PLY format.
 
+    The ``ascii``, ``binary_little_endian`` and ``binary_big_endian`` formats are supported. Binary files are memory
+    mapped: when the three coordinates, or normal components, of a point are consecutive properties of the same
+    native type, they are returned as a strided view of the mapping without any copy, otherwise they are copied.
+
     Args:
         filename: the path to the pointcloud.
-        header_size: the size of the ply file header that will
-          be skipped during loading.
+        header_size: deprecated and ignored, the header is parsed to find the data.
+        return_attributes: whether to also return the colors and the normals of the points.
+        dtype: the dtype of the points and normals. Default: the type stored in binary files, and the default
+          torch dtype for ``ascii`` files, as the ``double`` ones written by the previous versions.
 
     Return:
         tensor containing the loaded point with shape :math:`(*, 3)` where
-        :math:`*` represents the number of points.
+        :math:`*` represents the number of points. If ``return_attributes`` is ``True``, the colors as ``uint8``
+        and the normals of the points with shape :math:`(*, 3)` are also returned, or ``None`` if the file does not
+        contain them.
 
     """
     if not isinstance(filename, str) and filename[-3:] == ".ply":
         raise TypeError(f"Input filename must be a string in with the .ply  extension. Got {filename}")
     if not os.path.isfile(filename):
         raise ValueError("Input filename is not an existing file.")
-    if not (isinstance(header_size, int) and header_size > 0):
-        raise TypeError(f"Input header_size must be a positive integer. Got {header_size}.")
-    # open the file and populate tensor
-    with open(filename) as f:
-        points = []
-
-        # skip header
-        lines = f.readlines()[header_size:]
-
-        # iterate over the points
-        for line in lines:
-            x_str, y_str, z_str = line.split()
-            points.append((torch.tensor(float(x_str)), torch.tensor(float(y_str)), torch.tensor(float(z_str))))
-
-        # create tensor from list
-        pointcloud: torch.Tensor = torch.tensor(points)
+    if header_size is not None:
+        warnings.warn(
+            "header_size is deprecated and ignored, the header is parsed to find the data.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
+    with open(filename, "rb") as f:
+        ply_format, num_vertices, properties = _parse_ply_header(f)
+        byte_order = _PLY_FORMATS[ply_format]
+        struct_dtype = np.dtype([(name, byte_order + _PLY_TO_NUMPY_TYPE[ply_type]) for ply_type, name in properties])
+        if ply_format == "ascii":
+            values = np.fromstring(f.read().decode("ascii"), sep=" ")  # type: ignore[call-overload]
+            num_properties = len(properties)
+            if values.size < num_vertices * num_properties:
+                raise ValueError("Input PLY file is truncated.")
+            values = values[: num_vertices * num_properties].reshape(num_vertices, num_properties)
+            data = None
+            if dtype is None:
+                dtype = torch.get_default_dtype()
+        else:
+            # copy-on-write, so that the views of the mapping are writable tensors
+            data = np.memmap(filename, dtype=struct_dtype, mode="c", offset=f.tell(), shape=(num_vertices,))
+
+    def _stack(names: Tuple[str, str, str], is_color: bool = False) -> Optional[torch.Tensor]:
+        if not all(name in struct_dtype.names for name in names):
+            return None
+        if data is None:
+            columns = values[:, [struct_dtype.names.index(name) for name in names]]
+            return torch.from_numpy(columns.astype("u1" if is_color else "f8"))
+        fields = [struct_dtype.fields[name] for name in names]
+        field_dtype, offset = fields[0][:2]
+        if (
+            field_dtype.isnative
+            and all(field[:2] == (field_dtype, offset + i * field_dtype.itemsize) for i, field in enumerate(fields))
+            and struct_dtype.itemsize % field_dtype.itemsize == 0
+        ):
+            view = np.ndarray(
+                (num_vertices, 3),
+                field_dtype,
+                buffer=data,
+                offset=offset,
+                strides=(struct_dtype.itemsize, field_dtype.itemsize),
+            )
+            return torch.from_numpy(view)
+        return torch.from_numpy(np.stack([data[name].astype(data.dtype[name].newbyteorder("=")) for name in names], -1))
+
+    pointcloud = _stack(("x", "y", "z"))
+    if pointcloud is None:
+        raise ValueError("Input PLY file has no x, y and z vertex properties.")
+    if dtype is not None:
+        pointcloud = pointcloud.to(dtype)
+    if not return_attributes:
         return pointcloud
+    colors = _stack(("red", "green", "blue"), is_color=True)
+    normals = _stack(("nx", "ny", "nz"))
+    if normals is not None and dtype is not None:
+        normals = normals.to(dtype)
+    return pointcloud, colors.to(torch.uint8) if colors is not None else None, normals
@@ -140,6 +140,26 @@ class TestAugmentationBase2D(BaseTester):
             # output = augmentation((input, input_transform))
             # assert output is expected_output
 
+    @pytest.mark.parametrize("inplace", [False, True])
+    def test_partial_apply(self, inplace, device, dtype):
+        input = torch.rand((4, 3, 4, 5), device=device, dtype=dtype)
+        expected = input.clone()
+        expected[1::2] = 1.0 - expected[1::2]
+        params = {"batch_prob": torch.tensor([False, True, False, True], device=device)}
+        augmentation = AugmentationBase2D(p=0.5)
+        augmentation._inplace = inplace
+
+        buffer = input.clone()
+        with patch.object(augmentation, "apply_transform", autospec=True) as apply_transform:
+            apply_transform.side_effect = lambda x, *args, **kwargs: 1.0 - x
+            output = augmentation(buffer, params=params)
+            assert apply_transform.call_args[0][0].shape == (2, 3, 4, 5)
+
+        self.assert_close(output, expected)
+        # the unselected samples are left untouched and only the buffer may be written in place
+        assert (output.data_ptr() == buffer.data_ptr()) is inplace
+        self.assert_close(buffer, expected if inplace else input)
+
     def test_gradcheck(self, device):
         torch.manual_seed(42)
 
@@ -251,6 +251,79 @@ class TestSequential:
         aug.inverse(inp)
         reproducibility_test(inp, aug)
 
+    @pytest.mark.parametrize(
+        "augmentations",
+        [
+            [K.RandomAffine(10, translate=(0.1, 0.1), p=1.0), K.RandomRotation(10.0, p=1.0)],
+            [K.RandomHorizontalFlip(p=0.5), K.RandomShear(5.0, p=1.0), K.RandomVerticalFlip(p=0.5)],
+            [
+                K.RandomResizedCrop((20, 24), scale=(0.8, 1.0), cropping_mode="resample", align_corners=False),
+                K.RandomTranslate(0.1, p=1.0),
+                K.RandomRotation(10.0, p=0.5),
+            ],
+        ],
+    )
+    def test_fuse_geometric(self, augmentations, device, dtype):
+        # bilinear interpolation is exact on a linear ramp, so a single warp must match the chained warps
+        ys, xs = torch.meshgrid(
+            torch.arange(30, device=device, dtype=dtype), torch.arange(40, device=device, dtype=dtype), indexing="ij"
+        )
+        inp = (1.0 + xs / 40 + ys / 30).expand(2, 3, -1, -1)
+        aug = K.ImageSequential(*augmentations)
+        fused = K.ImageSequential(*augmentations, fuse_geometric=True)
+        expected = aug(inp)
+        params = aug._params
+        assert len(fused.split_fused_runs(params)) == 1
+        out = fused(inp, params=params)
+        assert out.shape == expected.shape
+        # skip the pixels blended with the padding of the intermediate warps
+        padded = ((out == 0) | (expected == 0)).to(dtype)
+        valid = torch.nn.functional.max_pool2d(padded, 5, stride=1, padding=2) == 0
+        valid[..., :2, :] = valid[..., -2:, :] = valid[..., :2] = valid[..., -2:] = False
+        assert_close(out[valid], expected[valid], rtol=1e-4, atol=1e-4)
+        assert_close(
+            fused.get_transformation_matrix(inp, params=params), aug.get_transformation_matrix(inp, params=params)
+        )
+
+    def test_reuse_buffer(self, device, dtype):
+        inp = torch.rand(8, 3, 10, 12, device=device, dtype=dtype)
+        ref = inp.clone()
+        augmentations = [
+            K.RandomAffine(15, p=0.5),
+            K.ColorJiggle(0.2, 0.2, p=0.5),
+            K.RandomHorizontalFlip(p=0.5),
+            K.RandomInvert(p=0.5),
+        ]
+        aug = K.ImageSequential(*augmentations)
+        reused = K.ImageSequential(*augmentations, reuse_buffer=True)
+        expected = aug(inp)
+        out = reused(inp, params=aug._params)
+        assert_close(out, expected)
+        assert_close(inp, ref, rtol=0, atol=0)
+
+    def test_fuse_geometric_runs(self):
+        aug = K.ImageSequential(
+            K.RandomAffine(10, p=1.0),
+            K.RandomHorizontalFlip(p=1.0),
+            K.RandomPerspective(0.1, p=1.0),
+            K.ColorJiggle(0.1, p=1.0),
+            K.RandomRotation(10.0, p=1.0),
+            K.RandomRotation(10.0, resample="nearest", p=1.0),
+            K.RandomVerticalFlip(p=1.0),
+            fuse_geometric=True,
+        )
+        params = aug.forward_parameters(torch.Size((1, 3, 8, 8)))
+        assert [len(run) for run in aug.split_fused_runs(params)] == [3, 1, 1, 2]
+        aug.fuse_geometric = False
+        assert [len(run) for run in aug.split_fused_runs(params)] == [1] * 7
+
+    def test_fuse_geometric_flips_only(self, device, dtype):
+        inp = torch.rand(2, 3, 10, 12, device=device, dtype=dtype)
+        aug = K.ImageSequential(K.RandomHorizontalFlip(p=1.0), K.RandomVerticalFlip(p=1.0), fuse_geometric=True)
+        params = aug.forward_parameters(inp.shape)
+        assert [len(run) for run in aug.split_fused_runs(params)] == [1, 1]
+        assert_close(aug(inp, params=params), inp.flip(-1).flip(-2), rtol=0, atol=0)
+
 
 class TestAugmentationSequential:
     @pytest.mark.parametrize(
@@ -613,6 +686,43 @@ class TestAugmentationSequential:
         if random_apply is False:
             reproducibility_test((inp, mask, bbox, keypoints), aug)
 
+    def test_fuse_geometric(self, device, dtype):
+        inp = torch.rand(2, 3, 20, 24, device=device, dtype=dtype)
+        mask = (torch.rand(2, 1, 20, 24, device=device) > 0.5).to(dtype)
+        bbox = torch.tensor([[[2.0, 3.0, 10.0, 12.0]], [[5.0, 5.0, 15.0, 18.0]]], device=device, dtype=dtype)
+        keypoints = torch.tensor([[[4.0, 6.0]], [[10.0, 12.0]]], device=device, dtype=dtype)
+        augmentations = [K.RandomAffine(15, p=1.0), K.RandomHorizontalFlip(p=0.5), K.RandomRotation(15.0, p=1.0)]
+        data_keys = ["input", "mask", "bbox_xyxy", "keypoints"]
+        aug = K.AugmentationSequential(*augmentations, data_keys=data_keys)
+        fused = K.AugmentationSequential(*augmentations, data_keys=data_keys, fuse_geometric=True)
+
+        expected = aug(inp, mask, bbox, keypoints)
+        params = aug._params
+        out = fused(inp, mask, bbox, keypoints, params=params)
+        assert out[0].shape == expected[0].shape
+        for actual, target in zip(out[1:], expected[1:]):
+            assert_close(actual, target)
+        assert_close(fused.transform_matrix, aug.transform_matrix)
+
+        reverted = fused.inverse(*out)
+        assert reverted[0].shape == inp.shape
+        for actual, target in zip(reverted[1:], aug.inverse(*expected)[1:]):
+            assert_close(actual, target)
+
+    def test_reuse_buffer(self, device, dtype):
+        inp = torch.rand(8, 3, 10, 12, device=device, dtype=dtype)
+        mask = (torch.rand(8, 1, 10, 12, device=device) > 0.5).to(dtype)
+        refs = (inp.clone(), mask.clone())
+        augmentations = [K.RandomAffine(15, p=0.5), K.RandomInvert(p=0.5), K.RandomVerticalFlip(p=0.5)]
+        aug = K.AugmentationSequential(*augmentations, data_keys=["input", "mask"])
+        reused = K.AugmentationSequential(*augmentations, data_keys=["input", "mask"], reuse_buffer=True)
+        expected = aug(inp, mask)
+        out = reused(inp, mask, params=aug._params)
+        for actual, target in zip(out, expected):
+            assert_close(actual, target)
+        for actual, target in zip((inp, mask), refs):
+            assert_close(actual, target, rtol=0, atol=0)
+
     @pytest.mark.slow
     def test_individual_forward_and_inverse(self, device, dtype):
         inp = torch.randn(1, 3, 1000, 500, device=device, dtype=dtype)
@@ -876,6 +986,72 @@ class TestAugmentationSequential:
         assert outputs[3].dtype == dtype, "Output keypoints dtype should match the input dtype"
 
 
+class TestParameterPrefetcher:
+    def _augmentations(self):
+        return [
+            K.RandomResizedCrop((8, 8), p=1.0),
+            K.RandomAffine(10.0, p=0.5),
+            K.ColorJiggle(0.1, 0.1, 0.1, 0.1, p=0.5),
+            K.RandomHorizontalFlip(p=0.5),
+            K.ImageSequential(K.RandomInvert(p=0.5)),
+        ]
+
+    def test_buffer(self, device, dtype):
+        inp = torch.rand(4, 3, 12, 12, device=device, dtype=dtype)
+        aug = K.AugmentationSequential(*self._augmentations())
+        prefetcher = aug.prefetch_parameters(inp.shape, num_batches=3, device=device)
+        assert isinstance(prefetcher, K.container.ParameterPrefetcher)
+        for expected_len in [2, 1, 0, 2]:
+            out = aug(inp)
+            assert out.shape == (4, 3, 8, 8)
+            assert len(prefetcher) == expected_len
+        # other batch shapes are sampled on the fly
+        assert aug(inp[:2]).shape == (2, 3, 8, 8)
+        assert len(prefetcher) == 2
+        aug.stop_prefetching()
+        assert aug._prefetcher is None
+
+    def test_batched_params(self, device):
+        aug = K.ImageSequential(*self._augmentations())
+        batch_shape = torch.Size((4, 3, 12, 12))
+        prefetcher = K.container.ParameterPrefetcher(aug, batch_shape, num_batches=5)
+        batches = prefetcher.sample()
+        assert len(batches) == 5
+        assert prefetcher._batched["RandomAffine_1"]
+        assert not prefetcher._batched["ColorJiggle_2"]
+        reference = aug.forward_parameters(batch_shape)
+        for params in batches:
+            assert [param.name for param in params] == [param.name for param in reference]
+            for param, ref in zip(params, reference):
+                if not isinstance(ref.data, dict):
+                    continue
+                assert param.data.keys() == ref.data.keys()
+                num_applied = int((param.data["batch_prob"] > 0.5).sum())
+                for key, value in param.data.items():
+                    if key == "forward_input_shape":
+                        assert value.tolist() == ref.data[key].tolist()
+                    elif key == "batch_prob":
+                        assert value.shape == (4,)
+                    elif key != "order":
+                        assert value.shape[0] == num_applied, key
+
+    def test_background(self, device, dtype):
+        inp = torch.rand(2, 3, 12, 12, device=device, dtype=dtype)
+        aug = K.ImageSequential(*self._augmentations(), random_apply=2)
+        prefetcher = aug.prefetch_parameters(inp.shape, num_batches=2, background=True)
+        for _ in range(5):
+            assert aug(inp).shape[:2] == (2, 3)
+        aug.stop_prefetching()
+        assert prefetcher._thread is None
+        assert len(prefetcher) == 0
+
+    def test_exception(self):
+        with pytest.raises(ValueError):
+            K.ImageSequential(K.RandomAffine(10.0)).prefetch_parameters((1, 3, 4, 4), num_batches=0)
+        with pytest.raises(NotImplementedError):
+            K.VideoSequential(K.RandomAffine(10.0)).prefetch_parameters((1, 3, 2, 4, 4))
+
+
 class TestPatchSequential:
     @pytest.mark.parametrize(
         "error_param",
@@ -19,6 +19,7 @@ import pytest
 import torch
 
 import kornia
+from kornia.utils._compat import torch_version_lt
 
 from testing.base import BaseTester
 
@@ -106,6 +107,121 @@ class TestConnectedComponents(BaseTester):
         self.assert_close(op(img), op_jit(img))
 
 
+@pytest.mark.skipif(not torch_version_lt(1, 12, 0), reason="Tensor.scatter_reduce is available")
+def test_label_connected_components_old_torch(device):
+    img = torch.ones(1, 1, 3, 4, device=device)
+    with pytest.raises(Exception, match=r"requires torch >= 1\.12"):
+        kornia.contrib.label_connected_components(img)
+
+
+@pytest.mark.skipif(torch_version_lt(1, 12, 0), reason="requires Tensor.scatter_reduce")
+class TestLabelConnectedComponents(BaseTester):
+    @pytest.mark.parametrize("shape", [(1, 3, 4), (2, 1, 3, 4), (2, 3, 1, 5, 6)])
+    def test_cardinality(self, device, dtype, shape):
+        img = (torch.rand(shape, device=device) > 0.5).to(dtype)
+        out = kornia.contrib.label_connected_components(img)
+        assert out.labels.shape == shape
+        assert out.num_components.shape == (img.numel() // (shape[-1] * shape[-2]),)
+        K = out.areas.shape[1]
+        assert out.boxes.shape == (*out.areas.shape, 4)
+        assert out.centroids.shape == (*out.areas.shape, 2)
+        assert K == out.num_components.max()
+
+    def test_exception(self, device, dtype):
+        img = torch.rand(1, 1, 3, 4, device=device, dtype=dtype)
+
+        with pytest.raises(TypeError) as errinf:
+            kornia.contrib.label_connected_components("not a tensor")
+        assert "Input imagetype is not a Tensor. Got:" in str(errinf)
+
+        with pytest.raises(ValueError) as errinf:
+            kornia.contrib.label_connected_components(torch.rand(1, 2, 3, 4, device=device, dtype=dtype))
+        assert "Input image shape must be (*,1,H,W). Got:" in str(errinf)
+
+        with pytest.raises(Exception) as errinf:
+            kornia.contrib.label_connected_components(img, connectivity=6)
+        assert "connectivity must be either 4 or 8" in str(errinf)
+
+    @pytest.mark.parametrize("connectivity", [4, 8])
+    def test_value(self, device, dtype, connectivity):
+        img = torch.tensor(
+            [
+                [
+                    [
+                        [1.0, 1.0, 0.0, 0.0, 0.0, 1.0],
+                        [0.0, 1.0, 0.0, 0.0, 1.0, 0.0],
+                        [0.0, 0.0, 1.0, 0.0, 0.0, 0.0],
+                        [1.0, 0.0, 0.0, 0.0, 1.0, 1.0],
+                        [1.0, 0.0, 0.0, 1.0, 1.0, 0.0],
+                    ]
+                ]
+            ],
+            device=device,
+            dtype=dtype,
+        )
+        if connectivity == 4:
+            expected = torch.tensor(
+                [
+                    [1, 1, 0, 0, 0, 2],
+                    [0, 1, 0, 0, 3, 0],
+                    [0, 0, 4, 0, 0, 0],
+                    [5, 0, 0, 0, 6, 6],
+                    [5, 0, 0, 6, 6, 0],
+                ],
+                device=device,
+            )
+            areas = torch.tensor([[3, 1, 1, 1, 2, 4]], device=device)
+        else:
+            expected = torch.tensor(
+                [
+                    [1, 1, 0, 0, 0, 2],
+                    [0, 1, 0, 0, 2, 0],
+                    [0, 0, 1, 0, 0, 0],
+                    [3, 0, 0, 0, 4, 4],
+                    [3, 0, 0, 4, 4, 0],
+                ],
+                device=device,
+            )
+            areas = torch.tensor([[4, 2, 2, 4]], device=device)
+
+        out = kornia.contrib.label_connected_components(img, connectivity=connectivity)
+        self.assert_close(out.labels[0, 0], expected)
+        self.assert_close(out.areas, areas)
+        self.assert_close(out.num_components, torch.tensor([areas.shape[1]], device=device))
+
+    def test_stats(self, device, dtype):
+        img = torch.zeros(2, 1, 6, 7, device=device, dtype=dtype)
+        img[0, :, 1:3, 2:6] = 1.0
+        img[0, :, 5, 0] = 1.0
+        img[1, :, 0:6, 3] = 1.0
+        out = kornia.contrib.label_connected_components(img)
+        self.assert_close(out.num_components, torch.tensor([2, 1], device=device))
+        self.assert_close(out.areas, torch.tensor([[8, 1], [6, 0]], device=device))
+        expected_boxes = torch.tensor([[[2, 1, 5, 2], [0, 5, 0, 5]], [[3, 0, 3, 5], [0, 0, 0, 0]]], device=device)
+        self.assert_close(out.boxes, expected_boxes)
+        self.assert_close(out.centroids[0], torch.tensor([[3.5, 1.5], [0.0, 5.0]], device=device, dtype=dtype))
+        self.assert_close(out.centroids[1, 0], torch.tensor([3.0, 2.5], device=device, dtype=dtype))
+
+    @pytest.mark.parametrize("check_every", [1, 4])
+    def test_snake(self, device, dtype, check_every):
+        # a single path going back and forth through the whole image
+        H, W = 33, 20
+        img = torch.zeros(1, 1, H, W, device=device, dtype=dtype)
+        img[..., ::2, :] = 1.0
+        img[..., 1::4, -1] = 1.0
+        img[..., 3::4, 0] = 1.0
+        out = kornia.contrib.label_connected_components(img, connectivity=4, check_every=check_every)
+        self.assert_close(out.labels, img.long())
+        self.assert_close(out.areas, img.sum().long().view(1, 1))
+
+    def test_empty(self, device, dtype):
+        img = torch.zeros(2, 1, 4, 5, device=device, dtype=dtype)
+        out = kornia.contrib.label_connected_components(img)
+        self.assert_close(out.labels, torch.zeros_like(img, dtype=torch.long))
+        self.assert_close(out.num_components, torch.zeros(2, device=device, dtype=torch.long))
+        assert out.areas.shape == (2, 0)
+
+
 def test_compute_padding():
     assert kornia.contrib.compute_padding((6, 6), (2, 2)) == (0, 0, 0, 0)
     assert kornia.contrib.compute_padding((7, 7), (2, 2)) == (0, 1, 0, 1)
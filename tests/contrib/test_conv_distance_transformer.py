@@ -19,6 +19,7 @@ import pytest
 import torch
 
 import kornia
+from kornia.utils._compat import torch_version_lt
 
 from testing.base import BaseTester
 
@@ -104,3 +105,94 @@ class TestConvDistanceTransform(BaseTester):
         sample2 = kornia.contrib.distance_transform(sample2)
         loss = torch.nn.functional.mse_loss(sample1, sample2)
         loss.backward()
+
+
+@pytest.mark.skipif(not torch_version_lt(1, 12, 0), reason="Tensor.scatter_reduce is available")
+def test_exact_distance_transform_old_torch(device):
+    img = torch.zeros(1, 1, 3, 4, device=device)
+    img[..., 0, 0] = 1
+    kornia.contrib.exact_distance_transform(img, metric="l1")
+    with pytest.raises(Exception, match=r"requires torch >= 1\.12"):
+        kornia.contrib.exact_distance_transform(img, metric="l2")
+
+
+@pytest.mark.skipif(torch_version_lt(1, 12, 0), reason="requires Tensor.scatter_reduce")
+class TestExactDistanceTransform(BaseTester):
+    @staticmethod
+    def _brute_force(image, metric):
+        B, C, H, W = image.shape
+        ys, xs = torch.meshgrid(torch.arange(H), torch.arange(W), indexing="ij")
+        out = torch.full((B, C, H, W), float("inf"), dtype=torch.float64)
+        for b in range(B):
+            for c in range(C):
+                feats = torch.nonzero(image[b, c].cpu() != 0)
+                if len(feats) == 0:
+                    continue
+                dy = (ys[..., None] - feats[:, 0]).abs().double()
+                dx = (xs[..., None] - feats[:, 1]).abs().double()
+                if metric == "l2":
+                    dist = (dx**2 + dy**2).sqrt()
+                elif metric == "l1":
+                    dist = dx + dy
+                else:
+                    dist = torch.maximum(dx, dy)
+                out[b, c] = dist.min(-1)[0]
+        return out
+
+    @pytest.mark.parametrize("metric", ["l2", "l1", "chessboard"])
+    @pytest.mark.parametrize("shape", [(2, 3, 1, 1), (1, 2, 9, 17), (2, 1, 31, 8)])
+    def test_brute_force(self, device, dtype, metric, shape):
+        torch.manual_seed(0)
+        image = (torch.rand(shape, device=device) < 0.1).to(dtype)
+        image[0, 0, 0, -1] = 1.0
+        out, idx = kornia.contrib.exact_distance_transform(image, metric, return_indices=True)
+        expected = self._brute_force(image, metric)
+        assert out.shape == shape
+        assert idx.shape == (*shape, 2)
+        self.assert_close(out.cpu().double(), expected, atol=1e-2, rtol=1e-3)
+
+        # the indices point to a non-zero pixel at the returned distance
+        valid = torch.isfinite(out)
+        b, c, y, x = torch.nonzero(valid, as_tuple=True)
+        ix, iy = idx[b, c, y, x, 0], idx[b, c, y, x, 1]
+        assert (image[b, c, iy, ix] != 0).all()
+
+    def test_value(self, device, dtype):
+        image = torch.zeros(1, 1, 4, 4, device=device, dtype=dtype)
+        image[:, :, 1, 1] = 1.0
+        expected = torch.tensor(
+            [
+                [1.4142135382, 1.0000000000, 1.4142135382, 2.2360680103],
+                [1.0000000000, 0.0000000000, 1.0000000000, 2.0000000000],
+                [1.4142135382, 1.0000000000, 1.4142135382, 2.2360680103],
+                [2.2360680103, 2.0000000000, 2.2360680103, 2.8284270763],
+            ],
+            device=device,
+            dtype=dtype,
+        )
+        out = kornia.contrib.exact_distance_transform(image)
+        self.assert_close(out[0, 0], expected)
+
+    def test_empty(self, device, dtype):
+        image = torch.zeros(1, 2, 3, 4, device=device, dtype=dtype)
+        image[:, 1, 2, 3] = 1.0
+        out, idx = kornia.contrib.exact_distance_transform(image, return_indices=True)
+        assert torch.isinf(out[:, 0]).all()
+        assert (idx[:, 0] == -1).all()
+        assert torch.isfinite(out[:, 1]).all()
+
+    def test_module(self, device, dtype):
+        image = (torch.rand(2, 3, 10, 12, device=device) < 0.2).to(dtype)
+        op = kornia.contrib.DistanceTransform(method="exact", metric="l1")
+        self.assert_close(op(image), kornia.contrib.exact_distance_transform(image, "l1"))
+
+    def test_exception(self, device, dtype):
+        image = torch.rand(1, 1, 4, 4, device=device, dtype=dtype)
+        with pytest.raises(ValueError):
+            kornia.contrib.exact_distance_transform(image, "l3")
+        with pytest.raises(ValueError):
+            kornia.contrib.exact_distance_transform(image[0])
+        with pytest.raises(TypeError):
+            kornia.contrib.exact_distance_transform(None)
+        with pytest.raises(ValueError):
+            kornia.contrib.DistanceTransform(method="fast")
@@ -126,6 +126,76 @@ class TestKMeans(BaseTester):
         self.assert_close(ordered_centers, expected_centers, atol=2, rtol=0.1)
         assert oredered_prediction == expected_prediction
 
+    @staticmethod
+    def _assert_centers(centers, device, dtype):
+        expected_centers = torch.tensor([[-13, 17], [15, -12], [35, 15]], dtype=dtype, device=device)
+        order = torch.argsort(centers[:, 0])
+        BaseTester.assert_close(centers[order], expected_centers, atol=2, rtol=0.1)
+
+    @pytest.mark.parametrize("init", ["random", "k-means++"])
+    @pytest.mark.parametrize("num_restarts", [4])
+    def test_init_restarts(self, device, dtype, init, num_restarts):
+        x = TestKMeans._create_data(device, dtype)
+
+        kmeans = kornia.contrib.KMeans(3, None, 10e-4, 10000, 2023, init=init, num_restarts=num_restarts)
+        kmeans.fit(x)
+
+        assert kmeans.cluster_centers.shape == (3, 2)
+        assert kmeans.cluster_assignments.shape == (1500,)
+        TestKMeans._assert_centers(kmeans.cluster_centers, device, dtype)
+
+    def test_memory_budget(self, device, dtype):
+        x = TestKMeans._create_data(device, dtype)
+        starting_centers = x[:3].clone()
+
+        kmeans = kornia.contrib.KMeans(None, starting_centers, 10e-4, 100)
+        kmeans.fit(x)
+        kmeans_chunked = kornia.contrib.KMeans(None, starting_centers, 10e-4, 100, memory_budget=64)
+        kmeans_chunked.fit(x)
+
+        self.assert_close(kmeans.cluster_centers, kmeans_chunked.cluster_centers)
+        self.assert_close(kmeans.cluster_assignments, kmeans_chunked.cluster_assignments)
+
+    def test_partial_fit(self, device, dtype):
+        x = TestKMeans._create_data(device, dtype)
+        starting_centers = x[[0, 500, 1000]].clone()
+
+        kmeans = kornia.contrib.KMeans(None, starting_centers.clone(), 10e-4, 10000)
+        kmeans.fit(x)
+
+        kmeans_batched = kornia.contrib.KMeans(None, starting_centers.clone())
+        for _ in range(5):
+            for batch in x[torch.randperm(len(x), device=device)].split(100):
+                kmeans_batched.partial_fit(batch)
+
+        assert kmeans_batched.cluster_assignments.shape == (100,)
+        self.assert_close(kmeans_batched.cluster_centers, kmeans.cluster_centers, atol=1.0, rtol=0.05)
+
+    def test_exception_init(self, device, dtype):
+        with pytest.raises(Exception) as errinfo:
+            kornia.contrib.KMeans(3, None, init="foo")
+        assert "init must be 'random' or 'k-means++'" in str(errinfo)
+
+        with pytest.raises(Exception) as errinfo:
+            kornia.contrib.KMeans(3, None).fit(torch.rand(2, 2, device=device, dtype=dtype))
+        assert "at least the number of clusters" in str(errinfo)
+
+        with pytest.raises(Exception) as errinfo:
+            kornia.contrib.KMeans(None, torch.rand(3, 2, device=device, dtype=dtype), num_restarts=2)
+        assert "num_restarts must be 1" in str(errinfo)
+
+    def test_cluster_sums(self, device, dtype):
+        x = torch.rand(50, 2, device=device, dtype=torch.float64)
+        assignment = torch.randint(0, 4, (3, 50), device=device)
+        kmeans = kornia.contrib.KMeans(4, None)
+        sums, counts = kmeans._cluster_sums(x, assignment, 4)
+
+        for restart in range(3):
+            for cluster in range(4):
+                members = x[assignment[restart] == cluster]
+                self.assert_close(sums[restart, cluster], members.sum(0))
+                assert counts[restart, cluster] == len(members)
+
     def test_dynamo(self, device, dtype, torch_optimizer):
         x = TestKMeans._create_data(device, dtype)
         kmeans_params = (3, None, 10e-4, 10000, 2023)
@@ -1031,6 +1031,19 @@ class TestSharpness(BaseTester):
         self.assert_close(TestSharpness.f(inputs, 0.8), expected_08, low_tolerance=True)
         self.assert_close(TestSharpness.f(inputs, torch.tensor([0.8, 1.3])), expected_08_13, low_tolerance=True)
 
+    def test_value_per_channel(self, device, dtype):
+        inputs = torch.rand(2, 3, 5, 5, device=device, dtype=dtype)
+        factor = torch.tensor([[0.0, 0.8, 1.0], [1.3, 2.0, 0.5]], device=device, dtype=dtype)
+
+        expected = torch.stack(
+            [
+                torch.cat([TestSharpness.f(inputs[i : i + 1, j : j + 1], factor[i, j]) for j in range(3)], 1)[0]
+                for i in range(2)
+            ]
+        )
+
+        self.assert_close(TestSharpness.f(inputs, factor), expected)
+
     @pytest.mark.grad()
     def test_gradcheck(self, device):
         bs, channels, height, width = 2, 3, 4, 5
@@ -1112,6 +1125,31 @@ class TestSolarize(BaseTester):
         # TODO(jian): precision is very bad compared to PIL
         self.assert_close(TestSolarize.f(inputs, 0.5), expected, rtol=1e-2, atol=1e-2)
 
+    def test_value_per_channel(self, device, dtype):
+        inputs = torch.rand(2, 3, 4, 5, device=device, dtype=dtype)
+        thresholds = torch.tensor([[0.2, 0.5, 0.9], [0.4, 0.1, 0.7]], device=device, dtype=dtype)
+        additions = torch.tensor([[0.0, 0.2, -0.3], [0.1, -0.1, 0.4]], device=device, dtype=dtype)
+
+        expected = torch.stack(
+            [
+                torch.stack([TestSolarize.f(inputs[i, j], thresholds[i, j], additions[i, j]) for j in range(3)])
+                for i in range(2)
+            ]
+        )
+
+        self.assert_close(TestSolarize.f(inputs, thresholds, additions), expected)
+
+    def test_uint8(self, device):
+        inputs = torch.arange(256, device=device, dtype=torch.uint8).view(1, 1, 16, 16).repeat(2, 3, 1, 1)
+        thresholds = torch.tensor([0.3, 0.6], device=device)
+        additions = torch.tensor([0.1, -0.2], device=device)
+
+        actual = TestSolarize.f(inputs, thresholds, additions)
+        expected = TestSolarize.f(inputs.float() / 255, thresholds, additions)
+
+        assert actual.dtype == torch.uint8
+        self.assert_close(actual.float() / 255, expected, rtol=0.0, atol=1 / 255)
+
     @pytest.mark.grad()
     def test_gradcheck(self, device):
         bs, channels, height, width = 2, 3, 4, 5
@@ -1183,6 +1221,28 @@ class TestPosterize(BaseTester):
         self.assert_close(TestPosterize.f(inputs, 0), torch.zeros_like(inputs))
         self.assert_close(TestPosterize.f(inputs, 8), inputs)
 
+    @pytest.mark.skipif(kornia.xla_is_available(), reason="issues with xla device")
+    def test_value_per_channel(self, device, dtype):
+        inputs = torch.rand(2, 3, 4, 5, device=device, dtype=dtype)
+        bits = torch.tensor([[0, 3, 8], [1, 5, 7]], device=device)
+
+        expected = torch.stack(
+            [torch.stack([TestPosterize.f(inputs[i, j], bits[i, j]) for j in range(3)]) for i in range(2)]
+        )
+
+        self.assert_close(TestPosterize.f(inputs, bits), expected)
+
+    def test_uint8(self, device):
+        inputs = torch.arange(256, device=device, dtype=torch.uint8).view(1, 1, 16, 16).repeat(3, 2, 1, 1)
+        bits = torch.tensor([0, 4, 8], device=device)
+
+        actual = TestPosterize.f(inputs, bits)
+
+        assert actual.dtype == torch.uint8
+        self.assert_close(actual[0], torch.zeros_like(inputs[0]))
+        self.assert_close(actual[1], inputs[1] & 0xF0)
+        self.assert_close(actual[2], inputs[2])
+
     @pytest.mark.skip(reason="IndexError: tuple index out of range")
     @pytest.mark.grad()
     def test_gradcheck(self, device):
@@ -100,6 +100,24 @@ class TestImageHistogram2d(BaseTester):
         ans = 0.1 * torch.ones_like(hist)
         self.assert_close(ans, pdf)
 
+    @pytest.mark.parametrize("kernel", ["triangular", "uniform", "epanechnikov"])
+    @pytest.mark.parametrize("size", [(5, 7), (3, 5, 7), (2, 3, 5, 7)])
+    def test_equal_width_bins(self, device, dtype, kernel, size):
+        # without centers, the compact kernels only visit the bins around every pixel
+        sample = torch.rand(size, device=device, dtype=dtype) * 1.2 - 0.1
+        centers = (torch.arange(16, device=device, dtype=dtype) + 0.5) / 16
+        hist, pdf = TestImageHistogram2d.fcn(sample, 0.0, 1.0, 16, kernel=kernel, return_pdf=True)
+        hist_dense, pdf_dense = TestImageHistogram2d.fcn(
+            sample, 0.0, 1.0, 16, centers=centers, kernel=kernel, return_pdf=True
+        )
+        self.assert_close(hist, hist_dense)
+        self.assert_close(pdf, pdf_dense)
+
+    @pytest.mark.parametrize("kernel", ["triangular", "epanechnikov"])
+    def test_gradcheck_equal_width_bins(self, device, kernel):
+        sample = torch.rand(2, 3, 4, 4, device=device, dtype=torch.float64)
+        self.gradcheck(TestImageHistogram2d.fcn, (sample, 0.0, 1.0, 8, None, None, True, kernel))
+
 
 class TestHistogram2d(BaseTester):
     fcn = kornia.enhance.histogram2d
@@ -472,6 +472,34 @@ class TestExtractPatchesPyr(BaseTester):
             nondet_tol=1e-8,
         )
 
+    @pytest.mark.parametrize("PS", [8, 13, 32])
+    def test_batched_same_as_loop(self, device, dtype, PS):
+        img = torch.rand(3, 2, 64, 48, device=device, dtype=dtype)
+        xy = torch.rand(3, 20, 2, device=device, dtype=dtype) * torch.tensor([48.0, 64.0], device=device, dtype=dtype)
+        scale = 1.0 + 40.0 * torch.rand(3, 20, 1, 1, device=device, dtype=dtype)
+        ori = 360.0 * torch.rand(3, 20, 1, device=device, dtype=dtype)
+        laf = kornia.feature.laf_from_center_scale_ori(xy, scale, ori)
+        expected = kornia.feature.extract_patches_from_pyramid(img, laf, PS, mode="loop")
+        actual = kornia.feature.extract_patches_from_pyramid(img, laf, PS, mode="batched")
+        self.assert_close(actual, expected, atol=1e-4, rtol=1e-4)
+
+    def test_batched_empty(self, device, dtype):
+        img = torch.rand(2, 1, 32, 32, device=device, dtype=dtype)
+        laf = torch.rand(2, 0, 2, 3, device=device, dtype=dtype)
+        patches = kornia.feature.extract_patches_from_pyramid(img, laf, 8, mode="batched")
+        assert patches.shape == (2, 0, 1, 8, 8)
+
+    def test_batched_gradcheck(self, device):
+        nlaf = torch.tensor([[0.1, 0.001, 0.5], [0, 0.1, 0.5]], device=device, dtype=torch.float64)
+        nlaf = nlaf.view(1, 1, 2, 3)
+        img = torch.rand(1, 3, 20, 30, device=device, dtype=torch.float64)
+        PS = 11
+        self.gradcheck(
+            kornia.feature.extract_patches_from_pyramid,
+            (img, nlaf, PS, False, "batched"),
+            nondet_tol=1e-8,
+        )
+
 
 class TestLAFIsTouchingBoundary(BaseTester):
     def test_shape(self, device):
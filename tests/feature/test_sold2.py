@@ -19,6 +19,7 @@ import pytest
 import torch
 
 from kornia.feature.sold2 import SOLD2, SOLD2_detector
+from kornia.feature.sold2.sold2 import WunschLineMatcher
 
 from testing.base import BaseTester
 
@@ -78,3 +79,26 @@ class TestSOLD2(BaseTester):
         model = SOLD2().to(img.device, img.dtype).eval()
         model_jit = torch.jit.script(model)
         self.assert_close(model(img), model_jit(img))
+
+
+class TestWunschLineMatcher(BaseTester):
+    @staticmethod
+    def _needleman_wunsch_loop(scores):
+        b, n, m = scores.shape
+        nw_scores = scores - 0.1
+        nw_grid = torch.zeros(b, n + 1, m + 1, dtype=torch.float, device=scores.device)
+        for i in range(n):
+            for j in range(m):
+                nw_grid[:, i + 1, j + 1] = torch.maximum(
+                    torch.maximum(nw_grid[:, i + 1, j], nw_grid[:, i, j + 1]), nw_grid[:, i, j] + nw_scores[:, i, j]
+                )
+        return nw_grid[:, -1, -1]
+
+    @pytest.mark.parametrize("shape", [(4, 5, 5), (3, 2, 7), (2, 6, 1), (0, 3, 3), (2, 0, 4)])
+    def test_needleman_wunsch(self, shape, device, dtype):
+        scores = torch.rand(shape, device=device, dtype=dtype)
+        matcher = WunschLineMatcher()
+        expected = self._needleman_wunsch_loop(scores)
+        actual = matcher.needleman_wunsch(scores)
+        assert actual.shape == (shape[0],)
+        self.assert_close(actual, expected, rtol=0, atol=0)
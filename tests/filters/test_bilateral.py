@@ -92,6 +92,59 @@ class TestBilateralBlur(BaseTester):
         op_module = BilateralBlur(*params)
         self.assert_close(op_module(img), op(img, *params))
 
+    @pytest.mark.parametrize("memory_budget", [None, 1])
+    @pytest.mark.parametrize("color_distance_type", ["l1", "l2"])
+    def test_streamed(self, memory_budget, color_distance_type, device, dtype):
+        img = torch.rand(2, 3, 11, 7, device=device, dtype=dtype)
+        sigma_color = torch.rand(2, device=device, dtype=dtype) + 0.1
+        sigma_space = torch.rand(2, 2, device=device, dtype=dtype) + 0.5
+        params = ((5, 3), sigma_color, sigma_space, "reflect", color_distance_type)
+
+        expected = bilateral_blur(img, *params, engine="unfold")
+        actual = bilateral_blur(img, *params, engine="streamed", memory_budget=memory_budget)
+        self.assert_close(actual, expected)
+
+        op_module = BilateralBlur(*params, engine="streamed", memory_budget=memory_budget)
+        self.assert_close(op_module(img), expected)
+
+    def test_grid(self, device, dtype):
+        # noisy step edge, that the filter must preserve
+        torch.manual_seed(0)
+        img = torch.zeros(1, 1, 48, 64, device=device, dtype=dtype)
+        img[..., 32:] = 1.0
+        img = img + 0.05 * torch.randn_like(img)
+
+        expected = bilateral_blur(img, 21, 0.2, (3.0, 3.0), engine="unfold")
+        actual = bilateral_blur(img, 21, 0.2, (3.0, 3.0), engine="grid")
+        assert (actual - expected).abs().mean() < 5e-3
+        assert (actual - expected).abs().max() < 5e-2
+
+    def test_grid_rgb(self, device, dtype):
+        # noisy color step edges, filtered channel by channel
+        torch.manual_seed(0)
+        img = torch.zeros(2, 3, 48, 64, device=device, dtype=dtype)
+        img[..., 32:] = torch.tensor([1.0, 0.6, 0.8], device=device, dtype=dtype).view(3, 1, 1)
+        img = img + 0.05 * torch.randn_like(img)
+        sigma_color = torch.tensor([0.15, 0.2], device=device, dtype=dtype)
+        sigma_space = torch.tensor([[3.0, 3.0], [2.0, 3.0]], device=device, dtype=dtype)
+
+        expected = torch.cat(
+            [bilateral_blur(img[:, c : c + 1], 21, sigma_color, sigma_space, engine="unfold") for c in range(3)], 1
+        )
+        actual = BilateralBlur(21, sigma_color, sigma_space, engine="grid")(img)
+        assert actual.shape == img.shape
+        assert (actual - expected).abs().mean() < 5e-3
+        assert (actual - expected).abs().max() < 5e-2
+
+    def test_exception_engine(self):
+        with pytest.raises(Exception) as errinfo:
+            bilateral_blur(torch.rand(1, 1, 5, 5), 3, 0.1, (1, 1), engine="foo")
+        assert "engine must be one of" in str(errinfo)
+
+        with pytest.raises(Exception) as errinfo:
+            joint_bilateral_blur(torch.rand(1, 3, 5, 5), torch.rand(1, 2, 5, 5), 3, 0.1, (1, 1), engine="grid")
+        assert "The grid engine expects a guidance with one channel or as many channels" in str(errinfo)
+
     @pytest.mark.parametrize("kernel_size", [5, (5, 7)])
     @pytest.mark.parametrize("color_distance_type", ["l1", "l2"])
     def test_dynamo(self, kernel_size, color_distance_type, device, dtype, torch_optimizer):
@@ -238,6 +291,21 @@ class TestJointBilateralBlur(BaseTester):
         guide = torch.rand(1, 2, 5, 4, device=device, dtype=torch.float64)
         self.gradcheck(joint_bilateral_blur, (img, guide, 3, 1, (1, 1)), nondet_tol=1e-4)
 
+    @pytest.mark.parametrize("engine", ["streamed", "grid"])
+    def test_engines(self, engine, device, dtype):
+        torch.manual_seed(0)
+        inp = torch.rand(2, 3, 24, 32, device=device, dtype=dtype)
+        guide = torch.zeros(2, 1, 24, 32, device=device, dtype=dtype)
+        guide[..., 16:] = 1.0
+
+        expected = joint_bilateral_blur(inp, guide, 13, 0.2, (2.0, 2.0), engine="unfold")
+        op_module = JointBilateralBlur(13, 0.2, (2.0, 2.0), engine=engine, memory_budget=1)
+        actual = op_module(inp, guide)
+        if engine == "streamed":
+            self.assert_close(actual, expected)
+        else:
+            assert (actual - expected).abs().mean() < 2e-2
+
     def test_module(self, device, dtype):
         shape = (2, 3, 11, 7)
         kernel_size = 5
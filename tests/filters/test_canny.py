@@ -19,7 +19,7 @@ import pytest
 import torch
 
 from kornia.filters import Canny, canny
-from kornia.utils._compat import torch_version
+from kornia.utils._compat import torch_version, torch_version_lt
 
 from testing.base import BaseTester
 
@@ -312,6 +312,38 @@ class TestCanny(BaseTester):
         self.assert_close(actual_magnitude, expected_magnitude)
         self.assert_close(actual_edges, expected_edges)
 
+    @pytest.mark.skipif(torch_version_lt(1, 12, 0), reason="scatter_reduce is not available")
+    @pytest.mark.parametrize("low_threshold,high_threshold", [(0.02, 0.1), (0.05, 0.3)])
+    def test_hysteresis_engines(self, low_threshold, high_threshold, device, dtype):
+        torch.manual_seed(0)
+        img = torch.nn.functional.avg_pool2d(torch.rand(2, 1, 32, 40, device=device, dtype=dtype), 3, 1, 1)
+        expected_magnitude, expected_edges = canny(img, low_threshold, high_threshold, hysteresis_engine="iterative")
+        actual_magnitude, actual_edges = canny(
+            img, low_threshold, high_threshold, hysteresis_engine="propagation", check_every=1
+        )
+        self.assert_close(actual_magnitude, expected_magnitude)
+        self.assert_close(actual_edges, expected_edges)
+
+    @pytest.mark.skipif(torch_version_lt(1, 12, 0), reason="scatter_reduce is not available")
+    def test_return_labels(self, device, dtype):
+        img = torch.zeros(1, 1, 12, 12, device=device, dtype=dtype)
+        img[..., 2:5, 2:5] = 1.0
+        img[..., 7:10, 6:10] = 1.0
+        _, edges, labels = canny(img, return_labels=True)
+        assert labels.shape == edges.shape
+        assert labels.dtype == torch.long
+        self.assert_close((labels > 0).to(dtype), edges)
+        assert labels.max().item() == 2
+
+    def test_exception_engine(self):
+        with pytest.raises(Exception) as errinfo:
+            Canny(hysteresis_engine="foo")
+        assert "hysteresis_engine must be one of" in str(errinfo)
+
+        with pytest.raises(Exception) as errinfo:
+            canny(torch.rand(1, 1, 4, 4), hysteresis=False, return_labels=True)
+        assert "return_labels requires the hysteresis" in str(errinfo)
+
     @pytest.mark.parametrize("kernel_size", [5, (5, 7)])
     @pytest.mark.parametrize("batch_size", [1, 2])
     @pytest.mark.skipif(torch_version() in {"2.0.0", "2.0.1"}, reason="Not working on 2.0")
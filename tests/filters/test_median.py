@@ -99,6 +99,34 @@ class TestMedianBlur(BaseTester):
         actual = median_blur(inp, kernel_size)
         assert actual.is_contiguous()
 
+    @pytest.mark.parametrize("kernel_size", [(3, 3), (5, 5), (2, 3), (7, 4)])
+    @pytest.mark.parametrize("engine", ["unfold", "sorting_network"])
+    def test_engines(self, kernel_size, engine, device, dtype):
+        img = torch.rand(2, 3, 9, 11, device=device, dtype=dtype)
+        expected = median_blur(img, kernel_size, engine="unfold")
+        self.assert_close(median_blur(img, kernel_size, engine=engine), expected)
+        self.assert_close(median_blur(img, kernel_size, engine=engine, memory_budget=64), expected)
+
+    @pytest.mark.parametrize("kernel_size", [(3, 3), (4, 4), (9, 7), (21, 21)])
+    def test_histogram_uint8(self, kernel_size, device):
+        img = torch.randint(0, 256, (2, 3, 12, 10), device=device, dtype=torch.uint8)
+        expected = median_blur(img.float(), kernel_size, engine="unfold")
+        for engine in ("auto", "sorting_network", "histogram"):
+            actual = median_blur(img, kernel_size, engine=engine)
+            assert actual.dtype == torch.uint8
+            self.assert_close(actual.float(), expected)
+        self.assert_close(median_blur(img, kernel_size, engine="histogram", memory_budget=1).float(), expected)
+
+    def test_engine_exception(self, device, dtype):
+        img = torch.rand(1, 1, 5, 5, device=device, dtype=dtype)
+        with pytest.raises(Exception) as errinfo:
+            median_blur(img, 3, engine="foo")
+        assert "engine must be one of" in str(errinfo)
+
+        with pytest.raises(Exception) as errinfo:
+            median_blur(img, 3, engine="histogram")
+        assert "expects an uint8 input" in str(errinfo)
+
     def test_gradcheck(self, device):
         batch_size, channels, height, width = 1, 2, 5, 4
         img = torch.rand(batch_size, channels, height, width, device=device, dtype=torch.float64)
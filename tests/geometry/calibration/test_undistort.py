@@ -18,7 +18,7 @@
 import pytest
 import torch
 
-from kornia.geometry.calibration.undistort import undistort_image, undistort_points
+from kornia.geometry.calibration.undistort import Undistorter, undistort_image, undistort_points
 
 from testing.base import BaseTester
 
@@ -371,3 +371,74 @@ class TestUndistortImage(BaseTester):
         op = undistort_image
         op_optimized = torch_optimizer(op)
         self.assert_close(op(*inputs), op_optimized(*inputs))
+
+
+class TestUndistorter(BaseTester):
+    @staticmethod
+    def _calibration(device, dtype):
+        K = torch.tensor([[[40.0, 0.0, 16.0], [0.0, 42.0, 12.0], [0.0, 0.0, 1.0]]], device=device, dtype=dtype)
+        dist = torch.tensor([[-0.3, 0.1, 0.001, 0.002, 0.01]], device=device, dtype=dtype)
+        return K.repeat(2, 1, 1), dist.repeat(2, 1)
+
+    def test_undistort_image(self, device, dtype):
+        im = torch.rand(2, 3, 24, 32, device=device, dtype=dtype)
+        K, dist = self._calibration(device, dtype)
+        undistorter = Undistorter()
+        self.assert_close(undistorter(im, K, dist), undistort_image(im, K, dist))
+        # the second call hits the cache
+        self.assert_close(undistorter(im, K, dist), undistort_image(im, K, dist))
+        assert len(undistorter._cache) == 1
+
+    def test_shared_calibration(self, device, dtype):
+        im = torch.rand(3, 1, 24, 32, device=device, dtype=dtype)
+        K, dist = self._calibration(device, dtype)
+        out = Undistorter()(im, K[:1], dist[:1])
+        self.assert_close(out, undistort_image(im, K[:1].expand(3, -1, -1), dist[:1].expand(3, -1)))
+
+    def test_lru(self, device, dtype):
+        K, dist = self._calibration(device, dtype)
+        undistorter = Undistorter(cache_size=2)
+        for size in [(8, 8), (10, 10), (8, 8), (12, 12)]:
+            undistorter(torch.rand(2, 1, *size, device=device, dtype=dtype), K, dist)
+        assert [key[2] for key in undistorter._cache] == [(8, 8), (12, 12)]
+        undistorter.clear_cache()
+        assert len(undistorter._cache) == 0
+
+    @pytest.mark.parametrize("precision", ["half", "fixed"])
+    def test_save_load(self, precision, tmp_path, device, dtype):
+        im = torch.rand(2, 3, 24, 32, device=device, dtype=dtype)
+        K, dist = self._calibration(device, dtype)
+        path = str(tmp_path / "grid.pt")
+        Undistorter().save(path, K, dist, (24, 32), precision=precision)
+
+        undistorter = Undistorter()
+        grid = undistorter.load(path, device, dtype)
+        assert grid.shape == (2, 24, 32, 2)
+        assert len(undistorter._cache) == 1
+        self.assert_close(undistorter(im, K, dist, key=path), undistort_image(im, K, dist), rtol=5e-2, atol=5e-2)
+        # loaded grids are used as cache entries
+        assert len(undistorter._cache) == 1
+
+    def test_cache_key(self, device, dtype):
+        im = torch.rand(2, 3, 24, 32, device=device, dtype=dtype)
+        K, dist = self._calibration(device, dtype)
+        undistorter = Undistorter()
+        undistorter(im, K, dist)
+        # modifying the calibration in place computes a new grid
+        K[:, 0, 0] = 30.0
+        self.assert_close(undistorter(im, K, dist), undistort_image(im, K, dist))
+        assert len(undistorter._cache) == 2
+        # an explicit key is trusted, whatever the calibration tensors
+        undistorter.clear_cache()
+        out = undistorter(im, K, dist, key="camera")
+        self.assert_close(undistorter(im, K.clone(), dist.clone(), key="camera"), out)
+        assert len(undistorter._cache) == 1
+
+    def test_exception(self, device, dtype):
+        K, dist = self._calibration(device, dtype)
+        with pytest.raises(Exception):
+            Undistorter(cache_size=0)
+        with pytest.raises(Exception):
+            Undistorter().save("grid.pt", K, dist, (24, 32), precision="int8")
+        with pytest.raises(ValueError):
+            Undistorter()(torch.rand(1, 1, 24, 32, device=device, dtype=dtype), K, dist[..., :3])
@@ -51,6 +51,15 @@ class TestFindEssential(BaseTester):
         E_mat = epi.essential.find_essential(points1, points2, weights)
         assert E_mat.shape == (B, 10, 3, 3)
 
+    def test_mask(self, device, dtype):
+        points1 = torch.rand(2, 8, 2, device=device, dtype=dtype)
+        points2 = torch.rand(2, 8, 2, device=device, dtype=dtype)
+        weights = torch.rand(2, 8, device=device, dtype=dtype)
+        mask = torch.ones(2, 8, dtype=torch.bool, device=device)
+        mask[1, 6:] = False
+        E_mat = epi.essential.find_essential(points1, points2, weights, mask=mask)
+        self.assert_close(E_mat, epi.essential.find_essential(points1, points2, weights * mask))
+
     def test_epipolar_constraint(self, device, dtype):
         calibrated_x1 = torch.tensor(
             [[[0.0640, 0.7799], [-0.2011, 0.2836], [-0.1355, 0.2907], [0.0520, 1.0086], [-0.0361, 0.6533]]],
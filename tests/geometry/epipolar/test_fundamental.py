@@ -21,6 +21,7 @@ import pytest
 import torch
 
 import kornia.geometry.epipolar as epi
+from kornia.geometry.epipolar.fundamental import run_8point
 
 from testing.base import BaseTester
 from testing.geometry.create import create_random_fundamental_matrix, generate_two_view_random_scene
@@ -51,6 +52,15 @@ class TestNormalizePoints(BaseTester):
         self.assert_close(points_mean, torch.zeros_like(points_mean))
         assert (points_std < 2.0).all()
 
+    def test_mask(self, device, dtype):
+        points = torch.rand(2, 6, 2, device=device, dtype=dtype)
+        mask = torch.tensor([[True] * 6, [True] * 4 + [False] * 2], device=device)
+        points_norm, transform = epi.normalize_points(points, mask=mask)
+        expected_norm, expected_transform = epi.normalize_points(points[1:, :4])
+        self.assert_close(transform[:1], epi.normalize_points(points[:1])[1])
+        self.assert_close(transform[1:], expected_transform)
+        self.assert_close(points_norm[1:, :4], expected_norm)
+
     def test_gradcheck(self, device):
         points = torch.rand(2, 3, 2, device=device, requires_grad=True, dtype=torch.float64)
         self.gradcheck(epi.normalize_points, (points,))
@@ -116,6 +126,19 @@ class TestFindFundamental(BaseTester):
         F_mat = epi.find_fundamental(points1, points2, weights)
         assert F_mat.shape == (B, 3, 3)
 
+    def test_run_8point_mask(self, device):
+        dtype = torch.float64
+        points1 = torch.rand(2, 12, 2, device=device, dtype=dtype)
+        points2 = torch.rand(2, 12, 2, device=device, dtype=dtype)
+        weights = torch.rand(2, 12, device=device, dtype=dtype)
+        mask = torch.ones(2, 12, dtype=torch.bool, device=device)
+        mask[1, 9:] = False
+
+        F_mat = run_8point(points1, points2, weights, mask=mask)
+        expected = run_8point(points1[1:, :9], points2[1:, :9], weights[1:, :9])
+        self.assert_close(F_mat[:1], run_8point(points1[:1], points2[:1], weights[:1]))
+        self.assert_close(F_mat[1:], expected)
+
     @pytest.mark.parametrize("batch_size", [1, 2, 3])
     def test_shape_7point(self, batch_size, device, dtype):
         B = batch_size
@@ -15,10 +15,12 @@
 # limitations under the License.
 #
 
+import pytest
 import torch
 
 import kornia
 from kornia.geometry.bbox import (
+    batched_nms,
     infer_bbox_shape,
     infer_bbox_shape3d,
     nms,
@@ -286,3 +288,99 @@ class TestNMS(BaseTester):
         expected = torch.tensor([0, 3, 1], device=device, dtype=torch.long)
         actual = nms(boxes, scores, iou_threshold=0.8)
         self.assert_close(actual, expected)
+
+
+class TestBatchedNMS(BaseTester):
+    def _random_boxes(self, batch_size, num_boxes, device, dtype):
+        xy = torch.rand(batch_size, num_boxes, 2, device=device, dtype=dtype) * 100
+        wh = torch.rand(batch_size, num_boxes, 2, device=device, dtype=dtype) * 30 + 1
+        scores = torch.rand(batch_size, num_boxes, device=device, dtype=dtype)
+        return torch.cat([xy, xy + wh], -1), scores
+
+    @pytest.mark.parametrize("block_size", [1, 7, 256])
+    def test_same_as_nms(self, block_size, device, dtype):
+        boxes, scores = self._random_boxes(3, 50, device, dtype)
+        keep, kept_scores = batched_nms(boxes, scores, 0.3, block_size=block_size)
+        assert keep.shape == (3, 50)
+        for i in range(3):
+            expected = nms(boxes[i], scores[i], 0.3)
+            actual = keep[i][keep[i] >= 0]
+            self.assert_close(actual, expected)
+            self.assert_close(kept_scores[i][: len(expected)], scores[i][expected])
+            assert (kept_scores[i][len(expected) :] == 0).all()
+
+    def test_unbatched(self, device, dtype):
+        boxes = torch.tensor(
+            [
+                [10.0, 10.0, 20.0, 20.0],
+                [15.0, 5.0, 15.0, 25.0],
+                [100.0, 100.0, 200.0, 200.0],
+                [100.0, 100.0, 200.0, 200.0],
+            ],
+            device=device,
+            dtype=dtype,
+        )
+        scores = torch.tensor([0.9, 0.8, 0.7, 0.9], device=device, dtype=dtype)
+        keep, _ = batched_nms(boxes, scores, iou_threshold=0.8)
+        self.assert_close(keep, torch.tensor([0, 3, 1, -1], device=device))
+
+    def test_class_aware(self, device, dtype):
+        boxes, scores = self._random_boxes(2, 40, device, dtype)
+        idxs = torch.randint(0, 3, (2, 40), device=device)
+        keep, _ = batched_nms(boxes, scores, 0.3, idxs=idxs, block_size=16)
+        for i in range(2):
+            expected = []
+            for c in range(3):
+                (members,) = torch.where(idxs[i] == c)
+                expected.append(members[nms(boxes[i, members], scores[i, members], 0.3)])
+            expected = torch.cat(expected)
+            expected = expected[scores[i, expected].argsort(descending=True)]
+            self.assert_close(keep[i][keep[i] >= 0], expected)
+
+    def test_num_valid_top_k(self, device, dtype):
+        boxes, scores = self._random_boxes(3, 30, device, dtype)
+        num_valid = torch.tensor([30, 12, 0], device=device)
+        keep, _ = batched_nms(boxes, scores, 0.3, num_valid=num_valid, top_k=5, block_size=8)
+        assert keep.shape == (3, 5)
+        for i in range(3):
+            n = int(num_valid[i])
+            expected = nms(boxes[i, :n], scores[i, :n], 0.3)[:5] if n > 0 else keep.new_zeros(0)
+            self.assert_close(keep[i][keep[i] >= 0], expected)
+
+    def test_soft_nms(self, device, dtype):
+        boxes = torch.tensor(
+            [[[0.0, 0.0, 10.0, 10.0], [1.0, 1.0, 11.0, 11.0], [50.0, 50.0, 60.0, 60.0]]], device=device, dtype=dtype
+        )
+        scores = torch.tensor([[0.9, 0.8, 0.7]], device=device, dtype=dtype)
+        keep, kept_scores = batched_nms(boxes, scores, 0.5, soft_nms_sigma=0.5, score_threshold=0.01)
+        # the overlapping box is decayed below the isolated one, but not discarded
+        self.assert_close(keep, torch.tensor([[0, 2, 1]], device=device))
+        iou = torch.tensor(81.0 / 119.0, device=device, dtype=dtype)
+        expected = torch.stack([scores[0, 0], scores[0, 2], scores[0, 1] * torch.exp(-(iou**2) / 0.5)])
+        self.assert_close(kept_scores[0], expected)
+
+        keep, _ = batched_nms(boxes, scores, 0.5, soft_nms_sigma=0.5, score_threshold=0.5)
+        self.assert_close(keep, torch.tensor([[0, 2, -1]], device=device))
+
+    @pytest.mark.parametrize("soft_nms_sigma", [None, 0.5])
+    def test_infinite_scores(self, soft_nms_sigma, device, dtype):
+        boxes = torch.tensor(
+            [[[0.0, 0.0, 10.0, 10.0], [1.0, 1.0, 11.0, 11.0], [50.0, 50.0, 60.0, 60.0], [0.0, 0.0, 5.0, 5.0]]],
+            device=device,
+            dtype=dtype,
+        )
+        scores = torch.tensor([[0.9, float("inf"), float("nan"), -float("inf")]], device=device, dtype=dtype)
+        keep, kept_scores = batched_nms(boxes, scores, 0.5, soft_nms_sigma=soft_nms_sigma, score_threshold=0.01)
+        # the +inf score is kept first and the NaN one is ignored
+        assert keep[0, 0] == 1
+        assert kept_scores[0, 0] == float("inf")
+        assert not (keep == 2).any()
+
+    def test_exception(self, device, dtype):
+        boxes, scores = self._random_boxes(2, 5, device, dtype)
+        with pytest.raises(ValueError):
+            batched_nms(boxes[..., :3], scores, 0.5)
+        with pytest.raises(ValueError):
+            batched_nms(boxes, scores[:, :4], 0.5)
+        with pytest.raises(ValueError):
+            batched_nms(boxes, scores, 0.5, num_valid=torch.tensor([1], device=device))
@@ -265,6 +265,28 @@ class TestBoxes2D(BaseTester):
         assert batched_masks.shape == expected_batched_masks.shape
         self.assert_close(batched_masks, expected_batched_masks)
 
+    @pytest.mark.parametrize("batched", [False, True])
+    def test_boxes_to_mask_modes(self, batched, device, dtype):
+        shape = (3, 6) if batched else (6,)
+        xy = torch.rand(*shape, 2, device=device, dtype=dtype) * 12 - 3
+        wh = torch.rand(*shape, 2, device=device, dtype=dtype) * 8 + 1
+        boxes = Boxes.from_tensor(torch.cat([xy, wh], -1), mode="xywh")
+        height, width = 9, 11
+
+        dense = boxes.to_mask(height, width)
+        assert dense.shape == (*shape, height, width)
+
+        sparse = boxes.to_mask(height, width, mode="sparse")
+        assert sparse.is_sparse
+        self.assert_close(sparse.to_dense(), dense)
+
+        union = boxes.to_mask(height, width, mode="union")
+        assert union.shape == (*shape[:-1], height, width)
+        self.assert_close(union, (dense.sum(-3) > 0).to(dtype))
+
+        with pytest.raises(ValueError):
+            boxes.to_mask(height, width, mode="rle")
+
     def test_to(self, device, dtype):
         boxes = Boxes.from_tensor(torch.as_tensor([[1, 2, 3, 4]], device="cpu", dtype=torch.float32))
         assert boxes.to(device=device).data.device == device
@@ -765,6 +787,17 @@ class TestBbox3D(BaseTester):
         assert batched_masks.shape == expected_batched_masks.shape
         self.assert_close(batched_masks, expected_batched_masks)
 
+    def test_boxes_to_mask_modes(self, device, dtype):
+        xyz = torch.rand(2, 4, 3, device=device, dtype=dtype) * 8 - 2
+        whd = torch.rand(2, 4, 3, device=device, dtype=dtype) * 5 + 1
+        boxes = Boxes3D.from_tensor(torch.cat([xyz, whd], -1), mode="xyzwhd")
+        depth, height, width = 5, 7, 6
+
+        dense = boxes.to_mask(depth, height, width)
+        assert dense.shape == (2, 4, depth, height, width)
+        self.assert_close(boxes.to_mask(depth, height, width, mode="sparse").to_dense(), dense)
+        self.assert_close(boxes.to_mask(depth, height, width, mode="union"), (dense.sum(1) > 0).to(dtype))
+
     def test_to(self, device, dtype):
         boxes = Boxes3D.from_tensor(torch.as_tensor([[1, 2, 3, 4, 5, 6]], device="cpu", dtype=torch.float32))
         assert boxes.to(device=device).data.device == device
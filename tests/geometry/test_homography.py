@@ -248,6 +248,21 @@ class TestFindHomographyDLT(BaseTester):
             atol = 1e-3
         self.assert_close(kornia.geometry.transform_points(dst_homo_src, points_src), points_dst, rtol=rtol, atol=atol)
 
+    @pytest.mark.parametrize("solver", ["svd", "lu"])
+    def test_mask(self, solver, device):
+        # two problems with 10 and 6 correspondences, padded with random points
+        dtype = torch.float64
+        points_src = torch.rand(2, 10, 2, device=device, dtype=dtype)
+        points_dst = torch.rand(2, 10, 2, device=device, dtype=dtype)
+        weights = torch.rand(2, 10, device=device, dtype=dtype)
+        mask = torch.ones(2, 10, dtype=torch.bool, device=device)
+        mask[1, 6:] = False
+
+        H = find_homography_dlt(points_src, points_dst, weights, solver, mask=mask)
+        expected = find_homography_dlt(points_src[1:, :6], points_dst[1:, :6], weights[1:, :6], solver)
+        self.assert_close(H[:1], find_homography_dlt(points_src[:1], points_dst[:1], weights[:1], solver))
+        self.assert_close(H[1:], expected)
+
     @pytest.mark.grad()
     def test_gradcheck(self, device):
         points_src = torch.rand(1, 10, 2, device=device, dtype=torch.float64, requires_grad=True)
@@ -365,6 +380,22 @@ class TestFindHomographyFromLinesDLT(BaseTester):
             kornia.geometry.transform_points(dst_homo_src, points_src_st), points_dst_st, rtol=rtol, atol=atol
         )
 
+    def test_mask(self, device):
+        # two problems with 8 and 6 clean line correspondences, padded with random lines
+        dtype = torch.float64
+        ls1 = torch.rand(2, 8, 2, 2, device=device, dtype=dtype)
+        H = kornia.eye_like(3, ls1)
+        H = H * 0.3 * torch.rand_like(H)
+        H = H / H[:, 2:3, 2:3]
+        ls2 = kornia.geometry.transform_points(H[:, None], ls1)
+        ls2[1, 6:] = torch.rand_like(ls2[1, 6:])
+        mask = torch.ones(2, 8, dtype=torch.bool, device=device)
+        mask[1, 6:] = False
+
+        dst_homo_src = find_homography_lines_dlt(ls1, ls2, mask=mask)
+        self.assert_close(dst_homo_src, H, rtol=1e-6, atol=1e-6)
+        self.assert_close(dst_homo_src[:1], find_homography_lines_dlt(ls1[:1], ls2[:1]))
+
     @pytest.mark.parametrize("batch_size", [1, 2, 5])
     def test_clean_points_iter(self, batch_size, device, dtype):
         # generate input data
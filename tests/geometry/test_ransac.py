@@ -262,6 +262,72 @@ class TestRANSACFundamental(BaseTester):
         self.gradcheck(gradfun, (points1, points2), fast_mode=False, requires_grad=(True, False, False))
 
 
+class TestRANSACBatched(BaseTester):
+    @pytest.mark.parametrize("model_type", ["homography", "fundamental", "fundamental_7pt", "essential"])
+    def test_smoke(self, device, dtype, model_type):
+        torch.random.manual_seed(0)
+        points1 = torch.rand(3, 10, 2, device=device, dtype=dtype)
+        points2 = torch.rand(3, 10, 2, device=device, dtype=dtype)
+        ransac = RANSAC(model_type, batch_size=16, max_iter=2).to(device=device, dtype=dtype)
+        models, inliers = ransac.forward_batched(points1, points2)
+        assert models.shape == (3, 3, 3)
+        assert inliers.shape == (3, 10)
+
+    def test_smoke_linesegments(self, device, dtype):
+        torch.random.manual_seed(0)
+        ls1 = torch.rand(2, 10, 2, 2, device=device, dtype=dtype)
+        ls2 = torch.rand(2, 10, 2, 2, device=device, dtype=dtype)
+        ransac = RANSAC("homography_from_linesegments", batch_size=16, max_iter=2).to(device=device, dtype=dtype)
+        models, inliers = ransac.forward_batched(ls1, ls2)
+        assert models.shape == (2, 3, 3)
+        assert inliers.shape == (2, 10)
+
+    def test_dirty_points_padded(self, device):
+        torch.random.manual_seed(0)
+        dtype = torch.float64
+        B, N = 4, 40
+        H = torch.eye(3, dtype=dtype, device=device).repeat(B, 1, 1)
+        H[:, :2] = H[:, :2] + 0.1 * torch.rand_like(H[:, :2])
+        H[:, 2:, :2] = H[:, 2:, :2] + 0.001 * torch.rand_like(H[:, 2:, :2])
+
+        points_src = 100.0 * torch.rand(B, N, 2, device=device, dtype=dtype)
+        points_dst = transform_points(H, points_src)
+        # outliers
+        points_dst[:, :5] += 200.0
+        # padding with garbage, which must not be used
+        mask = torch.ones(B, N, dtype=torch.bool, device=device)
+        mask[1, 30:] = False
+        mask[3, 20:] = False
+        points_dst[~mask] = -1000.0
+
+        ransac = RANSAC("homography", inl_th=0.5, batch_size=64, max_iter=5).to(device=device, dtype=dtype)
+        models, inliers = ransac.forward_batched(points_src, points_dst, mask)
+
+        expected_inliers = mask.clone()
+        expected_inliers[:, :5] = False
+        self.assert_close(inliers, expected_inliers)
+        self.assert_close(transform_points(models, points_src), transform_points(H, points_src), rtol=1e-3, atol=1e-3)
+
+    def test_not_enough_points(self, device, dtype):
+        points1 = torch.rand(2, 10, 2, device=device, dtype=dtype)
+        mask = torch.ones(2, 10, dtype=torch.bool, device=device)
+        mask[1, 3:] = False
+        ransac = RANSAC("homography", batch_size=8, max_iter=2).to(device=device, dtype=dtype)
+        models, inliers = ransac.forward_batched(points1, points1, mask)
+        self.assert_close(models[1], torch.zeros_like(models[1]))
+        assert not inliers[1].any()
+
+    def test_sample_batched_without_replacement(self, device):
+        torch.random.manual_seed(0)
+        ransac = RANSAC("fundamental")
+        num_valid = torch.tensor([8, 20, 100], device=device)
+        order = torch.arange(100, device=device).repeat(3, 1)
+        idxs = ransac.sample_batched(8, num_valid, order, 64)
+        assert idxs.shape == (3, 64, 8)
+        assert (idxs < num_valid[:, None, None]).all()
+        assert (idxs.sort(dim=-1)[0].diff(dim=-1) > 0).all()
+
+
 class TestRansacMethods:
     def test_max_samples_by_conf(self):
         conf = 0.99
@@ -274,3 +340,11 @@ class TestRansacMethods:
         x = RANSAC.max_samples_by_conf(n_inl=999999999, num_tc=1000000000, sample_size=1, conf=conf)
         assert x > 0.0
         assert x == math.log(1.0 - conf) / math.log(eps)
+
+    def test_max_samples_by_conf_batched(self):
+        conf = 0.99
+        n_inl = torch.tensor([1, 10, 500, 1000, 5])
+        num_tc = torch.tensor([1000, 1000, 1000, 1000, 7])
+        x = RANSAC.max_samples_by_conf_batched(n_inl, num_tc, 7, conf)
+        expected = [RANSAC.max_samples_by_conf(int(n), int(t), 7, conf) for n, t in zip(n_inl, num_tc)]
+        assert torch.allclose(x, torch.tensor(expected, dtype=x.dtype), rtol=1e-6)
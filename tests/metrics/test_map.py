@@ -47,3 +47,85 @@ class TestMeanAveragePrecision(BaseTester):
 
         with pytest.raises(AssertionError):
             _ = kornia.metrics.mean_average_precision(boxes[0], [labels], [scores], [gt_boxes], [gt_labels], 2)
+
+    def test_duplicates_and_other_images(self, device, dtype):
+        # the second detection of the same object is a false positive, the third detection has no object of its
+        # class in its image
+        boxes = [
+            torch.tensor([[0, 0, 10, 10.0], [0, 0, 10, 11.0]], device=device, dtype=dtype),
+            torch.tensor([[20, 20, 30, 30.0]], device=device, dtype=dtype),
+        ]
+        labels = [torch.tensor([1, 1], device=device), torch.tensor([1], device=device)]
+        scores = [torch.tensor([0.6, 0.9], device=device, dtype=dtype), torch.tensor([0.8], device=device, dtype=dtype)]
+        gt_boxes = [
+            torch.tensor([[0, 0, 10, 10.0]], device=device, dtype=dtype),
+            torch.tensor([[20, 20, 30, 30.0]], device=device, dtype=dtype),
+        ]
+        gt_labels = [torch.tensor([1], device=device), torch.tensor([2], device=device)]
+
+        mean_ap, ap = kornia.metrics.mean_average_precision(boxes, labels, scores, gt_boxes, gt_labels, 3)
+
+        # precisions 1, 1/2, 1/3 at recall 1/2, no recall above 1/2 and no detection of class 2
+        self.assert_close(ap[1], 6.0 / 11.0)
+        self.assert_close(ap[2], 0.0)
+        self.assert_close(mean_ap, torch.tensor(3.0 / 11.0, device=device, dtype=dtype))
+
+
+class TestMeanAveragePrecisionAccumulator(BaseTester):
+    @staticmethod
+    def _random_batch(num_images, n_classes, device, dtype):
+        pred_boxes, pred_labels, pred_scores, gt_boxes, gt_labels = [], [], [], [], []
+        for num_preds, num_gt in zip(torch.randint(0, 8, (num_images,)), torch.randint(1, 4, (num_images,))):
+            xy = torch.rand(int(num_gt), 2, device=device, dtype=dtype) * 50
+            objects = torch.cat([xy, xy + 10], 1)
+            boxes = objects[torch.randint(0, int(num_gt), (int(num_preds),))]
+            pred_boxes.append(boxes + torch.rand_like(boxes) * 4)
+            pred_labels.append(torch.randint(1, n_classes, (int(num_preds),), device=device))
+            pred_scores.append(torch.rand(int(num_preds), device=device, dtype=dtype))
+            gt_boxes.append(objects)
+            gt_labels.append(torch.randint(1, n_classes, (int(num_gt),), device=device))
+        return pred_boxes, pred_labels, pred_scores, gt_boxes, gt_labels
+
+    def test_smoke(self, device, dtype):
+        boxes = torch.tensor([[100, 50, 150, 100.0]], device=device, dtype=dtype)
+        labels = torch.tensor([1], device=device, dtype=torch.long)
+        scores = torch.tensor([0.7], device=device, dtype=dtype)
+        gt_boxes = torch.tensor([[100, 50, 150, 80.0]], device=device, dtype=dtype)
+        gt_labels = torch.tensor([1], device=device, dtype=torch.long)
+
+        metric = kornia.metrics.MeanAveragePrecision(2, thresholds=[0.5, 0.75])
+        metric.update([boxes], [labels], [scores], [gt_boxes], [gt_labels])
+
+        expected = torch.tensor([[1.0], [0.0]], device=device, dtype=dtype)
+        self.assert_close(metric.average_precisions(), expected)
+        mean_ap, ap = metric.compute()
+        self.assert_close(mean_ap, torch.tensor(0.5, device=device, dtype=dtype))
+        self.assert_close(ap[1], 0.5)
+
+        metric.reset()
+        assert metric.average_precisions().shape == (2, 1)
+        assert (metric.average_precisions() == 0).all()
+
+    def test_accumulate(self, device, dtype):
+        torch.manual_seed(0)
+        n_classes, thresholds = 4, [0.3, 0.5, 0.7]
+        batches = [self._random_batch(3, n_classes, device, dtype) for _ in range(3)]
+        images = [[item for batch in batches for item in batch[i]] for i in range(5)]
+
+        metric = kornia.metrics.MeanAveragePrecision(n_classes, thresholds)
+        for batch in batches:
+            metric.update(*batch)
+        average_precisions = metric.average_precisions()
+
+        self.assert_close(metric.compute()[0], average_precisions.mean())
+        for threshold, expected in zip(thresholds, average_precisions):
+            mean_ap, ap = kornia.metrics.mean_average_precision(*images, n_classes, threshold=threshold)
+            self.assert_close(mean_ap, expected.mean())
+            self.assert_close(torch.tensor(list(ap.values()), device=device, dtype=dtype), expected)
+
+    def test_raise(self, device, dtype):
+        boxes = torch.tensor([[100, 50, 150, 100.0]], device=device, dtype=dtype)
+        labels = torch.tensor([1], device=device, dtype=torch.long)
+        metric = kornia.metrics.MeanAveragePrecision(2)
+        with pytest.raises(AssertionError):
+            metric.update([boxes], [labels], [], [boxes], [labels])
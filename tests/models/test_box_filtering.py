@@ -115,3 +115,20 @@ class TestBoxFiltering:
         assert len(filtered_boxes[0]) == 4  # All boxes in the first batch should be kept
         assert len(filtered_boxes[1]) == 4  # All boxes in the second batch should be kept
         assert len(filtered_boxes[2]) == 4  # All boxes in the third batch should be kept
+
+    def test_nms(self):
+        """Test the class-aware non-maxima suppression of the filtered boxes."""
+        boxes = tensor(
+            [
+                [
+                    [1, 0.9, 10, 10, 20, 20],
+                    [1, 0.8, 11, 11, 20, 20],  # Overlaps the first box of the same class
+                    [2, 0.7, 11, 11, 20, 20],  # Overlaps the first box of another class
+                    [1, 0.6, 50, 50, 20, 20],
+                ],
+            ]
+        )
+        filter = BoxFiltering(confidence_threshold=0.5, nms_threshold=0.5)
+        filtered_boxes = filter(boxes)
+        assert len(filtered_boxes[0]) == 3
+        assert_almost_equal(filtered_boxes[0][:, 1].tolist(), [0.9, 0.7, 0.6])
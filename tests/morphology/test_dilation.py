@@ -105,6 +105,29 @@ class TestDilate:
             test = torch.ones(2, 3, 4, device=device, dtype=dtype)
             assert dilation(tensor, test)
 
+    @pytest.mark.parametrize("border_type", ["geodesic", "constant", "reflect"])
+    @pytest.mark.parametrize(
+        "kernel",
+        [
+            [[1.0, 1.0, 1.0], [1.0, 1.0, 1.0], [1.0, 1.0, 1.0]],
+            [[0.0, 1.0, 0.0], [1.0, 1.0, 1.0], [0.0, 1.0, 0.0]],
+            [[0.0, 1.0, 1.0, 1.0], [1.0, 1.0, 0.0, 1.0]],
+        ],
+    )
+    def test_vhgw(self, device, dtype, kernel, border_type):
+        tensor = torch.rand(2, 3, 7, 9, device=device, dtype=dtype)
+        kernel = torch.tensor(kernel, device=device, dtype=dtype)
+        expected = dilation(tensor, kernel, border_type=border_type, engine="unfold")
+        assert_close(dilation(tensor, kernel, border_type=border_type, engine="vhgw"), expected)
+
+        structural_element = torch.full_like(kernel, 0.25)
+        expected = dilation(tensor, kernel, structuring_element=structural_element, engine="unfold")
+        assert_close(dilation(tensor, kernel, structuring_element=structural_element, engine="vhgw"), expected)
+
+        with pytest.raises(ValueError):
+            structural_element = torch.rand_like(kernel) + 0.1
+            assert dilation(tensor, kernel, structuring_element=structural_element, engine="vhgw")
+
     @pytest.mark.grad()
     def test_gradcheck(self, device, dtype):
         tensor = torch.rand(2, 3, 4, 4, requires_grad=True, device=device, dtype=torch.float64)
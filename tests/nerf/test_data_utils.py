@@ -73,3 +73,18 @@ class TestDataset:
         assert_close(
             d[2][9].cpu().to(dtype), (imgs[0][:, 1, 0] / 255.0).to(dtype)
         )  # Second row, first column in the image (9 sample point index)
+
+    def test_random_ray_dataset_rgbs(self, device, dtype):
+        cameras = create_four_cameras(device, dtype)
+        imgs = create_random_images_for_cameras(cameras)
+        dataset = RayDataset(cameras, 1, 2, False, device=device, dtype=dtype)
+        dataset.init_ray_dataset(torch.tensor([10, 15, 20, 25], device=device))
+        dataset.init_images_for_training(imgs)
+
+        idxs = torch.randperm(len(dataset))[:32].tolist()
+        _, _, rgbs = dataset[idxs]
+
+        camera_ids = dataset._ray_sampler.camera_ids[idxs].tolist()
+        points_2d = dataset._ray_sampler.points_2d[idxs].tolist()
+        expected = torch.stack([imgs[i][:, y, x] for i, (x, y) in zip(camera_ids, points_2d)]) / 255.0
+        assert_close(rgbs.cpu(), expected.to(dtype))
@@ -74,3 +74,44 @@ class TestNerfModel:
         camera: PinholeCamera = create_default_pinhole_camera(height, width, device, dtype)
         image = renderer.render_view(camera)
         assert image.shape == (height, width, 3)
+
+    def test_nerf_hierarchical(self, device, dtype):
+        nerf_model = NerfModel(num_ray_points=11, num_hidden=32, num_fine_ray_points=7).to(device=device, dtype=dtype)
+        num_rays = 15
+        origins = torch.rand(num_rays, 3, device=device, dtype=dtype)
+        directions = torch.rand(num_rays, 3, device=device, dtype=dtype)
+        rgbs = nerf_model(origins, directions)
+        assert rgbs.shape == (num_rays, 3)
+        rgbs.sum().backward()
+        assert nerf_model._sigma.weight.grad is not None
+
+    def test_nerf_early_ray_termination(self, device, dtype):
+        nerf_model = NerfModel(num_ray_points=11, num_hidden=32, num_fine_ray_points=7, min_transmittance=2.0)
+        nerf_model = nerf_model.to(device=device, dtype=dtype)
+        num_rays = 15
+        points_3d = torch.rand(num_rays, 11, 3, device=device, dtype=dtype)
+        directions_encoded = torch.rand(num_rays, 11, nerf_model._dir_encoder.num_encoded_dims, device=device)
+        mask = torch.zeros(num_rays, 11, device=device, dtype=torch.bool)
+        mask[:, :3] = True
+        rgbs, densities = nerf_model._evaluate(points_3d, directions_encoded.to(dtype), mask)
+        assert rgbs.shape == (num_rays, 11, 3)
+        assert densities.shape == (num_rays, 11, 1)
+        assert (rgbs[:, 3:] == 0).all()
+        assert (densities[:, 3:] == 0).all()
+        assert (rgbs[:, :3] > 0).all()
+
+        # every ray is terminated at its first point, only the coarse points are rendered
+        origins = torch.rand(num_rays, 3, device=device, dtype=dtype)
+        directions = torch.rand(num_rays, 3, device=device, dtype=dtype)
+        assert nerf_model(origins, directions).shape == (num_rays, 3)
+
+    def test_render_view_chunks(self, device, dtype, nerf_model):
+        nerf_model = nerf_model.to(device=device, dtype=dtype)
+        height, width = 5, 6
+        renderer = NerfModelRenderer(nerf_model, image_size=(height, width), device=device, dtype=dtype, chunk_size=7)
+        camera: PinholeCamera = create_default_pinhole_camera(height, width, device, dtype)
+        image = renderer.render_view(camera)
+        assert image.shape == (height, width, 3)
+
+        with pytest.raises(ValueError):
+            NerfModelRenderer(nerf_model, image_size=(height, width), device=device, dtype=dtype, chunk_size=0)
@@ -17,6 +17,7 @@
 
 import math
 
+import pytest
 import torch
 
 from kornia.core import Device
@@ -28,6 +29,7 @@ from kornia.nerf.samplers import (
     calc_ray_t_vals,
     cameras_for_ids,
     sample_lengths,
+    sample_lengths_from_weights,
     sample_ray_points,
 )
 
@@ -217,6 +219,22 @@ class TestRaySampler_3DPoints:
         )
         assert points_3d.shape == (3 * 28 + 45, 10, 3)
 
+    def test_sample_lengths_from_weights(self, device, dtype):
+        lengths = sample_lengths(5, 11, device=device, dtype=dtype, irregular=False)
+        weights = torch.zeros_like(lengths)
+        weights[:, 4] = 1.0  # all the density around the length 0.4
+        for irregular in (False, True):
+            fine_lengths = sample_lengths_from_weights(lengths, weights, 64, irregular=irregular)
+            assert fine_lengths.shape == (5, 64)
+            assert (fine_lengths >= 0.35).float().mean() > 0.95
+            assert (fine_lengths <= 0.45).float().mean() > 0.95
+
+        fine_lengths = sample_lengths_from_weights(lengths, torch.zeros_like(lengths), 21, irregular=False)
+        assert_close(fine_lengths, torch.linspace(0.05, 0.95, 21, device=device, dtype=dtype).expand(5, -1))
+
+        with pytest.raises(ValueError):
+            sample_lengths_from_weights(lengths[:, :2], weights[:, :2], 64)
+
     def test_t_vals(self, device, dtype):
         cameras = create_four_cameras(device, dtype)
         uniform_sampler_four_cameras = UniformRaySampler(2, 3.0, False, device=device, dtype=dtype)
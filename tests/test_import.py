@@ -0,0 +1,70 @@
+# LICENSE HEADER MANAGED BY add-license-header
+#
+# Copyright 2018 Kornia Team
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import subprocess
+import sys
+
+import pytest
+
+import kornia
+
+# the subpackages which are imported on first access only
+LAZY_SUBMODULES = ["augmentation", "contrib", "feature", "models", "onnx", "tracking", "transpiler", "x"]
+
+# an upper bound of the time spent importing kornia, torch excluded, well above what a CI machine needs
+IMPORT_TIME_BUDGET = 1.5
+
+
+def _run(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout  # noqa: S603
+
+
+class TestLazyImport:
+    def test_lazy_submodules_not_imported(self):
+        out = _run("import sys, kornia; print(' '.join(sorted(m for m in sys.modules if m.startswith('kornia.'))))")
+        loaded = out.split()
+        for name in LAZY_SUBMODULES:
+            assert f"kornia.{name}" not in loaded
+
+    def test_filters_do_not_import_lazy_submodules(self):
+        code = (
+            "import sys, torch, kornia; kornia.filters.canny(torch.rand(1, 1, 32, 32)); "
+            "print(' '.join(sorted(m for m in sys.modules if m.startswith('kornia.'))))"
+        )
+        loaded = _run(code).split()
+        for name in LAZY_SUBMODULES:
+            assert f"kornia.{name}" not in loaded
+
+    def test_import_time_budget(self):
+        code = "import time, torch; t = time.perf_counter(); import kornia; print(time.perf_counter() - t)"
+        elapsed = float(_run(code))
+        assert elapsed < IMPORT_TIME_BUDGET
+
+    @pytest.mark.parametrize("name", LAZY_SUBMODULES)
+    def test_attribute_access(self, name):
+        module = getattr(kornia, name)
+        assert module is sys.modules[f"kornia.{name}"]
+        assert name in dir(kornia)
+
+    def test_lazy_attributes(self):
+        from kornia.transpiler import to_jax  # noqa: PLC0415
+
+        assert kornia.to_jax is to_jax
+
+    def test_missing_attribute(self):
+        with pytest.raises(AttributeError):
+            kornia.not_a_submodule  # noqa: B018
@@ -20,6 +20,8 @@ import torch
 
 from kornia.utils import _extract_device_dtype
 from kornia.utils.helpers import (
+    _scatter_histogram,
+    _torch_histc_batched,
     _torch_histc_cast,
     _torch_inverse_cast,
     _torch_solve_cast,
@@ -116,6 +118,30 @@ class TestHistcCast:
         assert_close(y, y_expected)
 
 
+class TestHistcBatched:
+    @pytest.mark.parametrize("num_elements", [100, 3000])
+    def test_histc(self, device, dtype, num_elements):
+        x = torch.rand(2, 3, num_elements, device=device, dtype=dtype) * 1.2 - 0.1
+        x[0, 0, :2] = torch.tensor([0.0, 1.0])
+        y_expected = torch.stack([_torch_histc_cast(row, bins=16, min=0, max=1) for row in x.view(-1, num_elements)])
+
+        y = _torch_histc_batched(x, bins=16, min=0.0, max=1.0)
+
+        assert y.shape == (2, 3, 16)
+        assert_close(y, y_expected.view(2, 3, 16))
+
+    def test_scatter(self, device, dtype):
+        bin_idx = torch.tensor([[0, 2, 2, -1], [1, 1, 1, 3]], device=device)
+        weights = torch.tensor([[1.0, 0.5, 0.25, 8.0], [1.0, 2.0, 3.0, 4.0]], device=device, dtype=dtype)
+
+        counts = _scatter_histogram(bin_idx, 4)
+        hist = _scatter_histogram(bin_idx, 4, weights)
+
+        assert_close(counts, torch.tensor([[1, 0, 2, 0], [0, 3, 0, 1]], device=device))
+        expected = torch.tensor([[1.0, 0.0, 0.75, 0.0], [0.0, 6.0, 0.0, 4.0]], device=device, dtype=dtype)
+        assert_close(hist, expected)
+
+
 class TestSvdCast:
     def test_smoke(self, device, dtype):
         a = torch.randn(5, 3, 3, device=device, dtype=dtype)
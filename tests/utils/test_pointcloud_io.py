@@ -16,7 +16,9 @@
 #
 
 import os
+import struct
 
+import pytest
 import torch
 
 import kornia
@@ -68,3 +70,89 @@ class TestSaveLoadPointCloud:
 
         if os.path.exists(filename):
             os.remove(filename)
+
+    @pytest.mark.parametrize("binary", [False, True])
+    @pytest.mark.parametrize("dtype", [torch.float32, torch.float64])
+    def test_attributes_roundtrip(self, tmp_path, binary, dtype):
+        xyz_save = torch.rand(10, 8, 3, dtype=dtype)
+        xyz_save[0, 0, :] = float("inf")
+        xyz_save[0, 1, 0] = float("inf")
+        colors = torch.randint(0, 256, (10, 8, 3), dtype=torch.uint8)
+        normals = torch.randn(10, 8, 3, dtype=dtype)
+
+        filename = str(tmp_path / "pointcloud.ply")
+        kornia.utils.save_pointcloud_ply(filename, xyz_save, colors=colors, normals=normals, binary=binary)
+        xyz_load, colors_load, normals_load = kornia.utils.load_pointcloud_ply(
+            filename, return_attributes=True, dtype=None if binary else dtype
+        )
+
+        assert xyz_load.dtype == dtype
+        assert_close(xyz_save.reshape(-1, 3)[1:], xyz_load)
+        assert_close(colors.reshape(-1, 3)[1:], colors_load)
+        assert_close(normals.reshape(-1, 3)[1:], normals_load)
+
+    def test_float_colors(self, tmp_path):
+        xyz_save = torch.rand(5, 3)
+        colors = torch.tensor([[0.0, 0.5, 1.0]]).repeat(5, 1)
+
+        filename = str(tmp_path / "pointcloud.ply")
+        kornia.utils.save_pointcloud_ply(filename, xyz_save, colors=colors, binary=True)
+        _, colors_load, normals_load = kornia.utils.load_pointcloud_ply(filename, return_attributes=True)
+
+        assert normals_load is None
+        assert_close(colors_load, torch.tensor([[0, 128, 255]], dtype=torch.uint8).repeat(5, 1))
+
+    def test_load_legacy_ascii(self, tmp_path):
+        # the previous versions saved every pointcloud with double properties, which were loaded as float32
+        filename = str(tmp_path / "pointcloud.ply")
+        with open(filename, "w") as f:
+            f.write("ply\nformat ascii 1.0\ncomment arraiy generated\nelement vertex 2\nproperty double x\n")
+            f.write("property double y\nproperty double z\nend_header\n0.5 1.0 2.0\n3.0 4.0 5.0\n")
+        xyz_load = kornia.utils.load_pointcloud_ply(filename)
+        assert xyz_load.dtype == torch.float32
+        assert_close(xyz_load, torch.tensor([[0.5, 1.0, 2.0], [3.0, 4.0, 5.0]]))
+        assert kornia.utils.load_pointcloud_ply(filename, dtype=torch.float64).dtype == torch.float64
+
+    def test_load_binary_view(self, tmp_path):
+        xyz_save = torch.rand(6, 3)
+        normals = torch.randn(6, 3)
+        filename = str(tmp_path / "pointcloud.ply")
+        kornia.utils.save_pointcloud_ply(filename, xyz_save, normals=normals, binary=True)
+        xyz_load, _, normals_load = kornia.utils.load_pointcloud_ply(filename, return_attributes=True)
+        # the points and normals are strided views of the 24 bytes records
+        assert xyz_load.stride() == normals_load.stride() == (6, 1)
+        assert_close(xyz_load, xyz_save)
+        assert_close(normals_load, normals)
+
+        # with colors the 27 bytes records are not aligned for float32, the points are copied
+        colors = torch.randint(0, 256, (6, 3), dtype=torch.uint8)
+        kornia.utils.save_pointcloud_ply(filename, xyz_save, colors=colors, binary=True)
+        xyz_load, colors_load, _ = kornia.utils.load_pointcloud_ply(filename, return_attributes=True)
+        assert xyz_load.is_contiguous()
+        assert_close(xyz_load, xyz_save)
+        assert_close(colors_load, colors)
+
+    def test_load_header(self, tmp_path):
+        filename = str(tmp_path / "pointcloud.ply")
+        with open(filename, "wb") as f:
+            f.write(
+                b"ply\nformat binary_big_endian 1.0\ncomment test\nelement vertex 2\nproperty float x\n"
+                b"property float y\nproperty float z\nproperty uchar alpha\nelement face 0\n"
+                b"property list uchar int vertex_indices\nend_header\n"
+            )
+            points = torch.tensor([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+            for point in points.tolist():
+                f.write(struct.pack(">fffB", *point, 7))
+
+        assert_close(kornia.utils.load_pointcloud_ply(filename), points)
+        with pytest.warns(DeprecationWarning, match="header_size"):
+            assert_close(kornia.utils.load_pointcloud_ply(filename, header_size=8), points)
+
+    def test_exception(self, tmp_path):
+        filename = str(tmp_path / "pointcloud.ply")
+        with open(filename, "wb") as f:
+            f.write(b"ply\nformat ascii 1.0\nelement face 1\nproperty list uchar int vertex_indices\nend_header\n")
+        with pytest.raises(ValueError):
+            kornia.utils.load_pointcloud_ply(filename)
+        with pytest.raises(TypeError):
+            kornia.utils.save_pointcloud_ply(filename, torch.rand(5, 3), colors=torch.rand(4, 3))